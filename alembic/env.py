@@ -7,6 +7,8 @@ from alembic import context
 from src import models
 from src.books import model
 from src.achievements import model
+from src.apis import model
+from src.genai import model
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
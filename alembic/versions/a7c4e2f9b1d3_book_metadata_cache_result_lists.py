@@ -0,0 +1,34 @@
+"""book metadata cache result lists
+
+Revision ID: a7c4e2f9b1d3
+Revises: e81f4a6c2d57
+Create Date: 2026-10-19 18:02:14.517203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c4e2f9b1d3'
+down_revision: Union[str, Sequence[str], None] = 'e81f4a6c2d57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The payload was a single book or NULL, now it is a list of results.
+    # It is only a cache, so the old entries are dropped and fetched again.
+    op.execute("DELETE FROM book_metadata_cache")
+    with op.batch_alter_table('book_metadata_cache') as batch_op:
+        batch_op.alter_column('payload', existing_type=sa.JSON(), nullable=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DELETE FROM book_metadata_cache")
+    with op.batch_alter_table('book_metadata_cache') as batch_op:
+        batch_op.alter_column('payload', existing_type=sa.JSON(), nullable=True)
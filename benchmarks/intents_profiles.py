@@ -0,0 +1,195 @@
+"""Compare startup cost and memory of the gateway intents profiles.
+
+No connection to Discord is made. For every profile we build the GUILD_CREATE
+payloads Discord would send for that profile (plus the member chunks when
+the profile chunks guilds at startup) and feed them through discord.py's
+connection state, measuring wall time, traced allocations and peak RSS.
+Each profile runs in its own process so the RSS numbers do not overlap.
+
+    python -m benchmarks.intents_profiles --guilds 50 --members 2000
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import discord
+
+from src import gateway
+
+BOT_ID = 1
+
+
+def _user(user_id: int) -> dict:
+    return {
+        "id": str(user_id),
+        "username": f"reader{user_id}",
+        "discriminator": "0",
+        "global_name": None,
+        "avatar": None,
+    }
+
+
+def _member(user_id: int) -> dict:
+    return {
+        "user": _user(user_id),
+        "roles": [],
+        "joined_at": "2025-01-01T00:00:00+00:00",
+        "deaf": False,
+        "mute": False,
+        "flags": 0,
+    }
+
+
+def _presence(user_id: int) -> dict:
+    return {
+        "user": {"id": str(user_id)},
+        "status": "online",
+        "activities": [{"name": "Reading", "type": 0}],
+        "client_status": {"desktop": "online"},
+    }
+
+
+def guild_payload(
+    guild_id: int, members: int, online: float, profile: gateway.GatewayProfile
+) -> dict:
+    """The GUILD_CREATE payload Discord sends for a guild under `profile`."""
+    intents = profile.intents
+    user_ids = range(guild_id * 1_000_000, guild_id * 1_000_000 + members)
+    online_ids = user_ids[: int(members * online)]
+    # Without presences Discord only sends the bot's own member.
+    member_data = [_member(BOT_ID)]
+    presences = []
+    if intents.presences:
+        member_data += [_member(u) for u in online_ids]
+        presences = [_presence(u) for u in online_ids]
+    return {
+        "id": str(guild_id),
+        "name": f"guild {guild_id}",
+        "owner_id": str(BOT_ID),
+        "member_count": members,
+        "large": members > 250,
+        "roles": [
+            {
+                "id": str(guild_id),
+                "name": "@everyone",
+                "permissions": "0",
+                "position": 0,
+                "color": 0,
+                "hoist": False,
+                "managed": False,
+                "mentionable": False,
+            }
+        ],
+        "channels": [
+            {
+                "id": str(guild_id + 1),
+                "type": 0,
+                "name": "bokcirkel",
+                "position": 0,
+                "permission_overwrites": [],
+            }
+        ],
+        "members": member_data,
+        "presences": presences,
+        "emojis": [],
+        "stickers": [],
+        "features": [],
+    }
+
+
+def run_profile(name: str, guilds: int, members: int, online: float) -> dict:
+    profile = gateway.profile(name)
+    asyncio.set_event_loop(asyncio.new_event_loop())
+    client = discord.Client(**profile.client_options())
+    state = client._connection
+    state.user = discord.ClientUser(state=state, data=_user(BOT_ID))
+
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    for g in range(1, guilds + 1):
+        guild = state._add_guild_from_data(
+            guild_payload(g * 10, members, online, profile)
+        )
+        if state._guild_needs_chunking(guild):
+            # What chunk_guild() ends up caching, one member at a time.
+            for user_id in range(g * 10_000_000, g * 10_000_000 + members):
+                guild._add_member(
+                    discord.Member(data=_member(user_id), guild=guild, state=state)
+                )
+    elapsed = time.perf_counter() - start
+    traced, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "profile": name,
+        "guilds": guilds,
+        "members_per_guild": members,
+        "cached_members": sum(len(g._members) for g in state._guilds.values()),
+        "seconds": round(elapsed, 4),
+        "traced_mib": round(traced / 2**20, 2),
+        "max_rss_mib": round(
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 2**10, 2
+        ),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--guilds", type=int, default=20)
+    parser.add_argument("--members", type=int, default=1000)
+    parser.add_argument(
+        "--online", type=float, default=0.2, help="fraction of members online"
+    )
+    parser.add_argument("--profile", choices=sorted(gateway.PROFILES), action="append")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        (name,) = args.profile
+        print(json.dumps(run_profile(name, args.guilds, args.members, args.online)))
+        return
+
+    results = []
+    for name in args.profile or list(gateway.PROFILES):
+        out = subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "benchmarks.intents_profiles",
+                "--child",
+                "--profile",
+                name,
+                "--guilds",
+                str(args.guilds),
+                "--members",
+                str(args.members),
+                "--online",
+                str(args.online),
+            ],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        results.append(json.loads(out.stdout))
+
+    header = (
+        f"{'profile':<10}{'cached':>10}{'seconds':>10}{'traced MiB':>12}{'RSS MiB':>10}"
+    )
+    print(header)
+    for r in results:
+        print(
+            f"{r['profile']:<10}{r['cached_members']:>10}{r['seconds']:>10}"
+            f"{r['traced_mib']:>12}{r['max_rss_mib']:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
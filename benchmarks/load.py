@@ -0,0 +1,345 @@
+"""Drive the cogs end to end with fake Discord objects and measure them.
+
+Commands are called the way discord.py calls them after parsing, on the
+BookCircle, Achievements and GenAI cogs, so signals, listeners, the status
+board and digests all run as in the bot. Discord itself is replaced by
+in-process fakes that can add a fixed latency to each API call, the GenAI
+model by a FakeModel and Hardcover by a FixtureProvider.
+
+The database is seeded once and shared by all --processes, the way shard
+processes share app.db, so running several shows SQLite lock contention.
+
+    python -m benchmarks.load --requests 2000 --concurrency 20
+    python -m benchmarks.load --mix read=50,note=30,summary=20 --processes 4
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+from types import SimpleNamespace
+
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+
+import src.bot  # noqa: F401, SQLite pragmas as the bot sets them
+from src.achievements.cog import Achievements
+from src.achievements.service import load_achievements_from_json
+from src.apis.library import Book
+from src.apis.provider import FixtureProvider
+from src.books.cog import BookCircle
+from src.genai.cog import GenAI
+from src.genai.llm import FakeModel
+from src.metrics import Metrics
+
+from .seed import Scale, layout, seed
+
+# Share of each command in the load, by command name.
+MIX = "read=70,note=10,quote=5,caughtup=4,notes=3,quotes=2,achievements=2,suggest=2,summary=1,info=1"
+
+
+def parse_mix(value: str) -> dict[str, float]:
+    """Parse a mix like ``"read=70,note=30"`` into weights."""
+    mix = {}
+    for part in filter(None, (p.strip() for p in value.split(","))):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+class Message:
+    def __init__(self, channel: "Channel", embed=None):
+        self.channel = channel
+        self.id = random.getrandbits(48)
+        self.embeds = [embed]
+
+    async def edit(self, embed=None, **kwargs):
+        await self.channel.api()
+
+    async def add_reaction(self, emoji):
+        await self.channel.api()
+
+    async def delete(self):
+        await self.channel.api()
+
+    async def pin(self):
+        await self.channel.api()
+
+    async def unpin(self):
+        await self.channel.api()
+
+
+class Channel:
+    def __init__(self, channel_id: int, guild, latency: float):
+        self.id = channel_id
+        self.guild = guild
+        self.latency = latency
+        self.sent = 0
+
+    async def api(self) -> None:
+        """One Discord API round trip."""
+        await asyncio.sleep(self.latency)
+
+    async def send(self, content=None, embed=None, **kwargs) -> Message:
+        await self.api()
+        self.sent += 1
+        return Message(self, embed)
+
+    def get_partial_message(self, message_id: int) -> Message:
+        return Message(self)
+
+
+class Context:
+    """What the cogs use of `commands.Context`."""
+
+    def __init__(self, channel: Channel, author):
+        self.channel = channel
+        self.guild = channel.guild
+        self.author = author
+        self.message = Message(channel)
+
+    async def send(self, content=None, embed=None, **kwargs) -> Message:
+        return await self.channel.send(content, embed=embed, **kwargs)
+
+
+class Bot:
+    def __init__(self, channels: dict[int, Channel]):
+        self.channels = channels
+        self.guilds = []
+
+    def get_channel(self, channel_id: int):
+        return self.channels.get(channel_id)
+
+
+def member(user_id: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=user_id,
+        name=f"user{user_id}",
+        roles=[],
+        guild_permissions=SimpleNamespace(administrator=False),
+    )
+
+
+def commands_for(cogs: dict[str, object]) -> dict:
+    """Command name to the cog, the command and its arguments for request `i`."""
+    books, achievements, genai = cogs["books"], cogs["achievements"], cogs["genai"]
+    return {
+        "read": (books, books.read, lambda i: {"progress": f"page {i}"}),
+        "note": (books, books.note, lambda i: {"text": f"Note {i}"}),
+        "quote": (books, books.quote, lambda i: {"text": f"Quote {i}"}),
+        "review": (books, books.review, lambda i: {"rating": 4, "text": f"Review {i}"}),
+        "caughtup": (books, books.caughtup, lambda i: {}),
+        "notes": (books, books.notes, lambda i: {}),
+        "quotes": (books, books.quotes, lambda i: {}),
+        "reviews": (books, books.reviews, lambda i: {}),
+        "roles": (books, books.roles_command, lambda i: {}),
+        "info": (books, books.info, lambda i: {}),
+        "books": (books, books.books, lambda i: {}),
+        "suggest": (books, books.suggest, lambda i: {"title": f"Dune {i}"}),
+        "suggested": (books, books.suggested, lambda i: {}),
+        "achievements": (achievements, achievements.achievements, lambda i: {}),
+        "summary": (genai, genai.summary, lambda i: {}),
+    }
+
+
+class LockErrors(logging.Handler):
+    """Counts logged SQLite lock errors, the services log and swallow them."""
+
+    def __init__(self):
+        super().__init__(logging.ERROR)
+        self.count = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if record.exc_info and is_lock_error(record.exc_info[1]):
+            self.count += 1
+
+
+def is_lock_error(error: BaseException) -> bool:
+    return isinstance(
+        error, (OperationalError, sqlite3.OperationalError)
+    ) and "locked" in str(error)
+
+
+async def drive(args, database: str, process: int) -> dict:
+    engine = create_engine(f"sqlite:///{database}")
+    metrics = Metrics()
+    metrics.instrument_engine(engine)
+    scale = Scale(**json.loads(args.scale))
+    seeded = layout(scale)
+    guild = SimpleNamespace(id=1, shard_id=0)
+    channels = {c: Channel(c, guild, args.discord_latency) for c in seeded.club_ids}
+    bot = Bot(channels)
+    metadata = FixtureProvider(
+        [Book(f"Dune {i}", "Frank Herbert", 1965, 412, 4.3, None) for i in range(100)],
+        latency=args.discord_latency,
+    )
+    cogs = {
+        "books": BookCircle(bot, engine, metadata),
+        "achievements": Achievements(bot, engine),
+        "genai": GenAI(bot, engine, FakeModel(["Summary ", "text."], delay=0.01)),
+    }
+    available = commands_for(cogs)
+    mix = parse_mix(args.mix)
+    unknown = set(mix) - set(available)
+    if unknown:
+        raise SystemExit(f"Unknown commands in the mix: {', '.join(sorted(unknown))}")
+    names, weights = list(mix), list(mix.values())
+
+    rng = random.Random(args.seed + process)
+    latencies: dict[str, list[float]] = defaultdict(list)
+    errors: dict[str, int] = defaultdict(int)
+    lock_errors = 0
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def request(i: int) -> None:
+        nonlocal lock_errors
+        name = rng.choices(names, weights)[0]
+        cog, command, arguments = available[name]
+        club_id, user_id = rng.choice(seeded.readers)
+        ctx = Context(channels[club_id], member(user_id))
+        async with semaphore:
+            with metrics.command(name):
+                started = time.perf_counter()
+                try:
+                    await command.callback(cog, ctx, **arguments(i))
+                except Exception as e:
+                    errors[name] += 1
+                    lock_errors += is_lock_error(e)
+                latencies[name].append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(request(i) for i in range(args.requests)))
+    elapsed = time.perf_counter() - started
+    return {
+        "elapsed": elapsed,
+        "latencies": latencies,
+        "errors": errors,
+        "lock_errors": lock_errors,
+        "queries": {
+            name: stats.queries.sum for name, stats in metrics.commands.items()
+        },
+    }
+
+
+def child(args) -> None:
+    handler = LockErrors()
+    logging.basicConfig(handlers=[handler], level=logging.ERROR, force=True)
+    result = asyncio.run(drive(args, args.database, args.process))
+    result["lock_errors"] += handler.count
+    print(json.dumps(result))
+
+
+def percentile(values: list[float], q: float) -> float:
+    values = sorted(values)
+    return values[min(int(len(values) * q), len(values) - 1)] if values else 0.0
+
+
+def report(results: list[dict]) -> None:
+    latencies: dict[str, list[float]] = defaultdict(list)
+    errors: dict[str, int] = defaultdict(int)
+    queries: dict[str, float] = defaultdict(float)
+    for result in results:
+        for name, values in result["latencies"].items():
+            latencies[name].extend(values)
+        for name, count in result["errors"].items():
+            errors[name] += count
+        for name, count in result["queries"].items():
+            queries[name] += count
+    total = sum(len(values) for values in latencies.values())
+    elapsed = max(result["elapsed"] for result in results)
+    lock_errors = sum(result["lock_errors"] for result in results)
+
+    print(
+        f"{'command':<14}{'count':>8}{'p50 ms':>10}{'p99 ms':>10}"
+        f"{'queries':>10}{'errors':>8}"
+    )
+    everything = []
+    for name, values in sorted(latencies.items(), key=lambda item: -len(item[1])):
+        everything.extend(values)
+        print(
+            f"{name:<14}{len(values):>8}{percentile(values, 0.5) * 1000:>10.1f}"
+            f"{percentile(values, 0.99) * 1000:>10.1f}"
+            f"{queries[name] / len(values):>10.1f}{errors[name]:>8}"
+        )
+    print(
+        f"\n{total} requests in {elapsed:.2f}s, {total / elapsed:.1f} requests/s, "
+        f"p50 {percentile(everything, 0.5) * 1000:.1f} ms, "
+        f"p99 {percentile(everything, 0.99) * 1000:.1f} ms, "
+        f"{lock_errors} SQLite lock errors"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    for name, default in Scale().to_dict().items():
+        parser.add_argument(f"--{name.replace('_', '-')}", type=int, default=default)
+    parser.add_argument("--requests", type=int, default=1000, help="per process")
+    parser.add_argument("--concurrency", type=int, default=10, help="per process")
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument("--mix", default=MIX, help="e.g. read=70,note=30")
+    parser.add_argument(
+        "--discord-latency", type=float, default=0.0, help="seconds per API call"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--database", help=argparse.SUPPRESS)
+    parser.add_argument("--process", type=int, default=0, help=argparse.SUPPRESS)
+    parser.add_argument("--scale", help=argparse.SUPPRESS)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args)
+        return
+
+    scale = Scale(**{name: getattr(args, name) for name in Scale().to_dict()})
+    with tempfile.TemporaryDirectory() as tmp:
+        database = str(Path(tmp) / "load.db")
+        engine = create_engine(f"sqlite:///{database}")
+        seed(engine, scale)
+        load_achievements_from_json(engine)
+        engine.dispose()
+        options = [
+            "--requests",
+            str(args.requests),
+            "--concurrency",
+            str(args.concurrency),
+            "--mix",
+            args.mix,
+            "--discord-latency",
+            str(args.discord_latency),
+            "--seed",
+            str(args.seed),
+            "--database",
+            database,
+            "--scale",
+            json.dumps(scale.to_dict()),
+        ]
+        children = [
+            subprocess.Popen(
+                [sys.executable, "-m", "benchmarks.load", "--child"]
+                + options
+                + ["--process", str(process)],
+                stdout=subprocess.PIPE,
+                text=True,
+            )
+            for process in range(args.processes)
+        ]
+        results = []
+        for process in children:
+            out, _ = process.communicate()
+            if process.returncode:
+                raise SystemExit(f"Load process failed with {process.returncode}")
+            results.append(json.loads(out))
+    report(results)
+
+
+if __name__ == "__main__":
+    main()
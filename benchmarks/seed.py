@@ -0,0 +1,152 @@
+"""Seed an SQLite database with synthetic book clubs for the benchmarks."""
+
+import itertools
+from dataclasses import asdict, dataclass, field
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from src import models
+from src.achievements.model import Counter
+from src.books.model import (
+    Book,
+    BookClub,
+    BookClubReader,
+    BookClubReaderRole,
+    BookState,
+    Note,
+    Quote,
+    Review,
+    SuggestedBook,
+    User,
+)
+
+# Counter names the achievement listeners maintain.
+COUNTERS = ("caught_up", "shame", "notes", "quotes", "reviews", "read", "shamee")
+ROLES = [r for r in BookClubReaderRole if r != BookClubReaderRole.NONE]
+# Rows inserted per statement.
+INSERT_BATCH = 5000
+
+
+@dataclass(frozen=True)
+class Scale:
+    guilds: int = 5
+    clubs_per_guild: int = 4
+    # Members of a club, drawn from the guild's users.
+    readers_per_club: int = 8
+    users_per_guild: int = 20
+    # Of each kind, per reader.
+    notes_per_reader: int = 5
+    quotes_per_reader: int = 5
+    reviews_per_reader: int = 1
+    counters_per_user: int = len(COUNTERS)
+    suggestions: int = 20
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+@dataclass
+class Seeded:
+    """Ids of the seeded rows, to pick arguments from."""
+
+    club_ids: list[int] = field(default_factory=list)
+    user_ids: list[int] = field(default_factory=list)
+    # (club id, user id) of every reader.
+    readers: list[tuple[int, int]] = field(default_factory=list)
+    suggestion_ids: list[int] = field(default_factory=list)
+
+
+def _insert(session: Session, model, rows) -> None:
+    rows = iter(rows)
+    while batch := list(itertools.islice(rows, INSERT_BATCH)):
+        session.execute(insert(model), batch)
+
+
+def layout(scale: Scale) -> Seeded:
+    """The ids `seed` creates at `scale`, without touching a database."""
+    seeded = Seeded()
+    for guild in range(1, scale.guilds + 1):
+        users = [guild * 10_000 + u for u in range(scale.users_per_guild)]
+        seeded.user_ids.extend(users)
+        for c in range(scale.clubs_per_guild):
+            club_id = guild * 10_000 + 5_000 + c
+            seeded.club_ids.append(club_id)
+            seeded.readers.extend(
+                (club_id, users[(c + r) % len(users)])
+                for r in range(scale.readers_per_club)
+            )
+    seeded.suggestion_ids = list(range(1, scale.suggestions + 1))
+    return seeded
+
+
+def seed(engine, scale: Scale) -> Seeded:
+    """Create the schema in an empty database and fill it with clubs at `scale`."""
+    models.Base.metadata.create_all(engine)
+    seeded = layout(scale)
+    clubs = [
+        {
+            "id": club_id,
+            "book_id": club_id,
+            "state": BookState.READING,
+            "target": "Chapter 1",
+        }
+        for club_id in seeded.club_ids
+    ]
+    books = [
+        {"id": club_id, "title": f"Book {club_id}", "author": "A"}
+        for club_id in seeded.club_ids
+    ]
+    readers = [
+        {
+            "book_club_id": club_id,
+            "user_id": user_id,
+            "role": ROLES[r % scale.readers_per_club % len(ROLES)],
+            "progress": "page 1",
+        }
+        for r, (club_id, user_id) in enumerate(seeded.readers)
+    ]
+
+    with Session(engine) as session:
+        _insert(session, User, ({"id": u, "name": f"user{u}"} for u in seeded.user_ids))
+        _insert(session, Book, books)
+        _insert(session, BookClub, clubs)
+        _insert(session, BookClubReader, readers)
+        reader_ids = range(1, len(readers) + 1)
+        for model, per_reader in [
+            (Note, scale.notes_per_reader),
+            (Quote, scale.quotes_per_reader),
+            (Review, scale.reviews_per_reader),
+        ]:
+            _insert(
+                session,
+                model,
+                (
+                    {"book_club_reader_id": r, "text": f"{model.__name__} {n} of {r}"}
+                    for r in reader_ids
+                    for n in range(per_reader)
+                ),
+            )
+        _insert(
+            session,
+            Counter,
+            (
+                {"user_id": u, "name": name, "value": 3}
+                for u in seeded.user_ids
+                for name in COUNTERS[: scale.counters_per_user]
+            ),
+        )
+        _insert(
+            session,
+            SuggestedBook,
+            (
+                {
+                    "id": s,
+                    "title": f"Suggestion {s}",
+                    "suggester_id": seeded.user_ids[s % len(seeded.user_ids)],
+                }
+                for s in seeded.suggestion_ids
+            ),
+        )
+        session.commit()
+    return seeded
@@ -0,0 +1,235 @@
+"""Time the service layer and achievement code on synthetic club data.
+
+Every case runs against a freshly seeded SQLite file and is repeated
+--repeat times, cycling through the seeded clubs and readers. Cases that
+change data (joining, kicking, popping suggestions) use up different rows on
+each run, so they may end in an Err once those run out; that is still timed
+and counted under errors. Logging is off while the cases run.
+
+    python -m benchmarks.service --guilds 20 --output results.json
+    python -m benchmarks.service --baseline results.json
+
+With --baseline the run is compared to a stored result and the exit status
+is 1 if any case got slower than --threshold or runs more SQL statements.
+"""
+
+import argparse
+import asyncio
+import contextvars
+import json
+import logging
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Callable
+
+from sqlalchemy import create_engine
+
+import src.bot  # noqa: F401, SQLite pragmas as the bot sets them
+from src.achievements.listener import BooksFinished, Listener, StreakListener
+from src.achievements.service import load_achievements_from_json
+from src.books.digest import DigestSettings
+from src.books.model import BookClubReaderRole, BookState
+from src.books.rotate_roles import rotate_roles
+from src.books.service import BookCircleService
+from src.metrics import Metrics
+from src.result_types import Err
+
+from .seed import Scale, Seeded, seed
+
+# Slowdown relative to the baseline reported as a regression.
+THRESHOLD = 0.2
+
+
+class Context:
+    """Stands in for `commands.Context` where listeners announce achievements."""
+
+    async def send(self, embed=None):
+        pass
+
+
+def member(user_id: int) -> SimpleNamespace:
+    return SimpleNamespace(id=user_id, name=f"user{user_id}")
+
+
+def cases(
+    engine, seeded: Seeded, runner: asyncio.Runner
+) -> dict[str, Callable[[int], object]]:
+    """Each case is called with the repetition number."""
+    service = BookCircleService(engine)
+    clubs, readers = seeded.club_ids, seeded.readers
+
+    def club(i: int) -> int:
+        return clubs[i % len(clubs)]
+
+    def reader(i: int) -> tuple[int, int]:
+        return readers[i % len(readers)]
+
+    def suggestion(i: int) -> int:
+        return seeded.suggestion_ids[i % len(seeded.suggestion_ids)]
+
+    def wait(coro):
+        # In this context, where the running case's timing is set.
+        return runner.run(coro, context=contextvars.copy_context())
+
+    ctx = Context()
+    counter = Listener(engine, "notes")
+    streak = StreakListener(engine, "read")
+    finished = BooksFinished(engine)
+    # Newcomers, not members of any club.
+    newcomer = 1_000_000
+
+    return {
+        "caught_up": lambda i: service.caught_up(*reader(i)),
+        "set_progress": lambda i: service.set_progress(*reader(i), f"page {i}"),
+        "suggest_book": lambda i: service.suggest_book(reader(i)[1], f"Title {i}"),
+        "get_suggested_books": lambda i: service.get_suggested_books(),
+        "remove_suggested_book": lambda i: service.remove_suggested_book(
+            suggestion(2 * i)
+        ),
+        "pop_suggested_book": lambda i: service.pop_suggested_book(
+            club(i), suggestion(2 * i + 1)
+        ),
+        "shuffle_roles": lambda i: service.shuffle_roles(club(i)),
+        "list_roles": lambda i: service.list_roles(club(i)),
+        "get_books_for_user": lambda i: service.get_books_for_user(
+            member(reader(i)[1])
+        ),
+        "get_reviews": lambda i: service.get_reviews(club(i)),
+        "get_notes": lambda i: service.get_notes(club(i)),
+        "get_quotes": lambda i: service.get_quotes(club(i)),
+        "join_club": lambda i: service.join_club(club(i), member(newcomer + i)),
+        "leave_club": lambda i: service.leave_club(club(i), member(newcomer + i)),
+        # From the end, so the other cases keep their readers.
+        "kick_member": lambda i: service.kick_member(
+            reader(-i - 1)[0], member(reader(-i - 1)[1])
+        ),
+        "create_club": lambda i: service.create_club(2_000_000 + i),
+        "create_or_update_book": lambda i: service.create_or_update_book(
+            club(i), f"Book {i}", "Author"
+        ),
+        "set_target": lambda i: service.set_target(
+            club(i), BookState.READING, f"Chapter {i}"
+        ),
+        "add_review": lambda i: service.add_review(
+            reader(i)[0], member(reader(i)[1]), "Good", 4
+        ),
+        "add_quote": lambda i: service.add_quote(*reader(i), "A quote"),
+        "add_note": lambda i: service.add_note(
+            reader(i)[0], member(reader(i)[1]), "A note"
+        ),
+        "set_reader_role": lambda i: service.set_reader_role(
+            reader(i)[0], member(reader(i)[1]), BookClubReaderRole.SUMMARIZER
+        ),
+        "get_club_status": lambda i: service.get_club_status(club(i)),
+        "get_status": lambda i: service.get_status(club(i)),
+        "get_digest_settings": lambda i: service.get_digest_settings(club(i)),
+        "set_digest_settings": lambda i: service.set_digest_settings(
+            club(i), DigestSettings()
+        ),
+        "set_status_message": lambda i: service.set_status_message(club(i), i),
+        "rotate_roles": lambda i: rotate_roles(engine, club(i)),
+        "listener_counter": lambda i: wait(
+            counter.action(None, ctx=ctx, user_id=reader(i)[1])
+        ),
+        "listener_streak": lambda i: wait(
+            streak.action(None, ctx=ctx, user_id=reader(i)[1])
+        ),
+        "listener_books_finished": lambda i: wait(
+            finished.action(None, ctx=ctx, book_club_id=club(i))
+        ),
+        "load_achievements_from_json": lambda i: load_achievements_from_json(engine),
+    }
+
+
+def run(scale: Scale, repeat: int, only: list[str]) -> dict:
+    with tempfile.TemporaryDirectory() as tmp, asyncio.Runner() as runner:
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'bench.db'}")
+        seeded = seed(engine, scale)
+        load_achievements_from_json(engine)
+        metrics = Metrics()
+        metrics.instrument_engine(engine)
+        results = {}
+        for name, case in cases(engine, seeded, runner).items():
+            if only and name not in only:
+                continue
+            times = []
+            errors = 0
+            for i in range(repeat):
+                with metrics.command(name):
+                    started = time.perf_counter()
+                    errors += isinstance(case(i), Err)
+                    times.append(time.perf_counter() - started)
+            times.sort()
+            results[name] = {
+                "mean_ms": round(statistics.fmean(times) * 1000, 3),
+                "p50_ms": round(times[len(times) // 2] * 1000, 3),
+                "p95_ms": round(times[int(len(times) * 0.95)] * 1000, 3),
+                "queries": round(metrics.commands[name].queries.mean, 2),
+                "errors": errors,
+            }
+        engine.dispose()
+    return {"scale": scale.to_dict(), "repeat": repeat, "results": results}
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """The cases that got slower or run more queries than in the baseline."""
+    regressions = []
+    for name, now in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        if now["mean_ms"] > before["mean_ms"] * (1 + threshold):
+            regressions.append(
+                f"{name}: {before['mean_ms']} ms -> {now['mean_ms']} ms mean"
+            )
+        if now["queries"] > before["queries"]:
+            regressions.append(
+                f"{name}: {before['queries']} -> {now['queries']} queries"
+            )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    for name, default in Scale().to_dict().items():
+        parser.add_argument(f"--{name.replace('_', '-')}", type=int, default=default)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--case", action="append", default=[], help="only run these")
+    parser.add_argument("--output", type=Path, help="write the results as JSON")
+    parser.add_argument("--baseline", type=Path, help="compare to a stored result")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD)
+    args = parser.parse_args()
+
+    scale = Scale(**{name: getattr(args, name) for name in Scale().to_dict()})
+    logging.disable()
+    current = run(scale, args.repeat, args.case)
+    if args.output:
+        args.output.write_text(json.dumps(current, indent=2) + "\n")
+
+    print(
+        f"{'case':<30}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}"
+        f"{'queries':>10}{'errors':>8}"
+    )
+    for name, r in current["results"].items():
+        print(
+            f"{name:<30}{r['mean_ms']:>10}{r['p50_ms']:>10}"
+            f"{r['p95_ms']:>10}{r['queries']:>10}{r['errors']:>8}"
+        )
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        if baseline["scale"] != current["scale"]:
+            print("warning: the baseline was run at a different scale")
+        regressions = compare(current, baseline, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
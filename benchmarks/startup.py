@@ -0,0 +1,150 @@
+"""Time the bot's cold start, from the first import to the loaded Cogs.
+
+Every run is a new process under `-X importtime`, in a temporary directory
+with its own app.db. The first run creates and stamps the schema, the rest
+start from a database already at the head revision, like a restart. No
+connection to Discord is made: a run imports src.bot, builds the bot with
+create_bot and runs its setup_hook, which loads the enabled extensions.
+The import time of the last run is broken down by top-level package.
+
+    python -m benchmarks.startup --runs 5
+    python -m benchmarks.startup --cogs books,achievements
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+STAGES = ("import", "create", "setup")
+
+
+def run_child(cogs: list[str]) -> dict:
+    """Runs in the benchmark process, in the temporary directory."""
+    started = time.perf_counter()
+    import asyncio
+
+    from src import gateway
+    from src.bot import create_bot
+    from src.config import Config
+
+    imported = time.perf_counter()
+    config = Config(cogs=tuple(cogs)) if cogs else Config()
+    bot = create_bot(config, gateway.profile(config.intents))
+    created = time.perf_counter()
+
+    async def setup() -> list[str]:
+        await bot.setup_hook()
+        loaded = sorted(bot.cogs)
+        await bot.close()
+        return loaded
+
+    loaded = asyncio.run(setup())
+    done = time.perf_counter()
+    return {
+        "import": imported - started,
+        "create": created - imported,
+        "setup": done - created,
+        "cogs": loaded,
+        "modules": len(sys.modules),
+        "google_genai": "google.genai" in sys.modules,
+    }
+
+
+def parse_importtime(stderr: str) -> list[tuple[str, int, int]]:
+    """(module, self µs, cumulative µs) from the `-X importtime` output."""
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        own, cumulative, module = line[len("import time:") :].split("|")
+        imports.append((module.strip(), int(own), int(cumulative)))
+    return imports
+
+
+def by_package(imports: list[tuple[str, int, int]]) -> list[tuple[str, int]]:
+    """Self time summed by top-level package, slowest first."""
+    totals: dict[str, int] = defaultdict(int)
+    for module, own, _ in imports:
+        package = module.split(".")[0]
+        # The bot's own modules are shown per subpackage.
+        if package == "src":
+            package = ".".join(module.split(".")[:2])
+        totals[package] += own
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+
+def run(directory: Path, cogs: list[str]) -> tuple[dict, str]:
+    env = dict(os.environ, PYTHONPATH=str(ROOT))
+    command = [sys.executable, "-X", "importtime", "-m", "benchmarks.startup"]
+    command += ["--child", "--cogs", ",".join(cogs)]
+    out = subprocess.run(
+        command, cwd=directory, env=env, check=True, capture_output=True, text=True
+    )
+    return json.loads(out.stdout), out.stderr
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--cogs", default="", help="comma separated, the configured default if empty"
+    )
+    parser.add_argument("--top", type=int, default=15, help="packages listed")
+    parser.add_argument(
+        "--no-gemini-key",
+        action="store_true",
+        help="leave out the Gemini key file, which turns the GenAI Cog off",
+    )
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    cogs = [name for name in args.cogs.split(",") if name]
+
+    if args.child:
+        print(json.dumps(run_child(cogs)))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        if not args.no_gemini_key:
+            (directory / ".gemini-api-key").write_text("benchmark")
+        first, _ = run(directory, cogs)
+        results = []
+        for _ in range(args.runs):
+            result, stderr = run(directory, cogs)
+            results.append(result)
+
+    print(f"Cogs: {', '.join(results[-1]['cogs'])}")
+    print(
+        f"Modules imported: {results[-1]['modules']}, "
+        f"google.genai imported: {results[-1]['google_genai']}"
+    )
+    print(f"\n{'stage':<10}{'first boot':>12}{'median':>10}{'min':>10}  (ms)")
+    for stage in (*STAGES, "total"):
+        values = [
+            sum(r[s] for s in STAGES) if stage == "total" else r[stage] for r in results
+        ]
+        first_value = (
+            sum(first[s] for s in STAGES) if stage == "total" else first[stage]
+        )
+        print(
+            f"{stage:<10}{first_value * 1000:>12.0f}"
+            f"{statistics.median(values) * 1000:>10.0f}{min(values) * 1000:>10.0f}"
+        )
+
+    imports = parse_importtime(stderr)
+    total = sum(own for _, own, _ in imports)
+    print(f"\nImport time by package, {total / 1000:.0f} ms in total (last run):")
+    for package, own in by_package(imports)[: args.top]:
+        print(f"{package:<30}{own / 1000:>8.1f} ms{own / total:>7.1%}")
+
+
+if __name__ == "__main__":
+    main()
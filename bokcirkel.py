@@ -1,39 +1,40 @@
 #!/usr/bin/python3
 
 import logging
-import discord
-import sys
-
-from src.bot import Bot
-
-LOG_FILE = "/var/log/bokcirkel.log"
-logging.basicConfig(
-    filename=LOG_FILE,
-    level=logging.INFO,
-    format='%(asctime)s [%(levelname)s] %(message)s',
-    datefmt='%Y-%m-%d %H:%M:%S'
-)
-
-# Nice for local debugging
-# logging.basicConfig(
-#     stream=sys.stdout,
-#     level=logging.INFO,
-#     format='%(asctime)s [%(levelname)s] %(message)s',
-#     datefmt='%Y-%m-%d %H:%M:%S'
-# )
+
+from sqlalchemy import create_engine
+
+from src import gateway, logs, schema, sharding
+from src.bot import DATABASE_URL, create_bot
+from src.config import Config
+
 
 def main():
+    config = Config.from_env()
+    # BOKCIRKEL_LOG_FILE=- logs to stdout, nice for local debugging.
+    listener = logs.setup(
+        config.log_file, logs.level(config.log_level), config.log_max_bytes
+    )
     try:
         with open('.token', 'r') as f:
             token = f.read().strip()
         logging.info("Starting bot...")
 
-        intents = discord.Intents.all()
-        bot = Bot(intents=intents)
-        bot.run(token)
+        if config.shard_processes > 1:
+            # Checked once here, or every process would create a new database.
+            schema.check(create_engine(DATABASE_URL))
+            sharding.launch_processes(config)
+            return
+        profile = gateway.profile(config.intents)
+        logging.info("Using intents profile: %s", profile.name)
+        bot = create_bot(config, profile)
+        # Without discord.py's own handler its logs go through the queue too.
+        bot.run(token, log_handler=None)
 
     except Exception:
         logging.exception("Bot error")
+    finally:
+        listener.stop()
 
 if __name__ == "__main__":
     main()
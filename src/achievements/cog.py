@@ -42,3 +42,7 @@ class Achievements(commands.Cog):
         for ach in achievements:
             embed.add_field(name=ach.name, value=ach.description, inline=False)
         await ctx.send(embed=embed)
+
+
+async def setup(bot: commands.Bot) -> None:
+    await bot.add_cog(Achievements(bot, bot.engine))
@@ -1,4 +1,5 @@
 import logging
+from collections import defaultdict
 from datetime import datetime, timedelta, UTC
 from typing import List
 
@@ -10,6 +11,17 @@ from sqlalchemy.orm import Session
 from ..books.model import BookClub, User
 from .model import Achievement, Counter, UserAchievement
 
+achievement_unlocked = signal("achievement_unlocked")
+
+
+async def announce(ctx, user_id: int, embed: discord.Embed) -> None:
+    """Send an unlocked achievement, unless a receiver (e.g. a digest) took it."""
+    results = await achievement_unlocked.send_async(
+        None, ctx=ctx, user_id=user_id, embed=embed
+    )
+    if not any(handled for _, handled in results):
+        await ctx.send(embed=embed)
+
 
 class Listener:
     signal_name: str
@@ -17,7 +29,7 @@ class Listener:
     def __init__(self, engine, signal_name=None):
         if signal_name:
             self.signal_name = signal_name
-        logging.info(f"Initializing listener for signal: {self.signal_name}")
+        logging.info("Initializing listener for signal: %s", self.signal_name)
         self.engine = engine
         self.signal = signal(self.signal_name)
         self.signal.connect(self.action)
@@ -36,7 +48,7 @@ class Listener:
 
     async def action(self, sender, **kwargs):
         logging.info(
-            f"Action triggered for signal: {self.signal_name} with kwargs: {kwargs}"
+            "Action triggered for signal: %s with kwargs: %s", self.signal_name, kwargs
         )
         try:
             user_id = kwargs.get("user_id")
@@ -50,46 +62,56 @@ class Listener:
                 embeds.extend(self.check_achievements(session, user_id))
                 session.commit()
             for embed in embeds:
-                await ctx.send(embed=embed)
+                await announce(ctx, user_id, embed)
         except Exception:
-            logging.exception(f"Error in {self.signal_name} listener action")
+            logging.exception("Error in %s listener action", self.signal_name)
 
     def check_achievements(self, session: Session, user_id: int) -> List[discord.Embed]:
-        # Fetch all counters for the user
-        counters = {
-            c.name: c.value
-            for c in session.scalars(
-                select(Counter).where(Counter.user_id == user_id)
-            ).all()
-        }
+        return [embed for _, embed in self.check_many(session, [user_id])]
+
+    def check_many(
+        self, session: Session, user_ids: List[int]
+    ) -> List[tuple[int, discord.Embed]]:
+        """Grant the achievements several users reached, with the same queries as one."""
+        # Fetch all counters of the users
+        counters: dict[int, dict[str, int]] = defaultdict(dict)
+        for c in session.scalars(select(Counter).where(Counter.user_id.in_(user_ids))):
+            counters[c.user_id][c.name] = c.value
         # Fetch all achievements
         achievements = session.scalars(select(Achievement)).all()
         # Fetch already granted achievement ids
         granted_ids = set(
-            ua.achievement_id
+            (ua.user_id, ua.achievement_id)
             for ua in session.scalars(
-                select(UserAchievement).where(UserAchievement.user_id == user_id)
+                select(UserAchievement).where(UserAchievement.user_id.in_(user_ids))
             ).all()
         )
-        user = session.get(User, user_id)
+        users = {
+            user.id: user
+            for user in session.scalars(select(User).where(User.id.in_(user_ids)))
+        }
         granted_embeds = []
-        for ach in achievements:
-            rule = ach.rule_json
-            counter_name = rule.get("counter")
-            required_value = rule.get("value")
-            if counter_name is None or required_value is None:
-                continue
-            if (
-                counters.get(counter_name, 0) >= required_value
-                and ach.id not in granted_ids
-            ):
-                session.merge(UserAchievement(user_id=user_id, achievement_id=ach.id))
-                embed = discord.Embed(
-                    title=f"{user.name if user else 'Unknown'} unlocks achievement: {ach.name} {ach.icon or ''}",
-                    description=ach.description,
-                    color=discord.Color.gold(),
-                )
-                granted_embeds.append(embed)
+        for user_id in user_ids:
+            user = users.get(user_id)
+            for ach in achievements:
+                rule = ach.rule_json
+                counter_name = rule.get("counter")
+                required_value = rule.get("value")
+                if counter_name is None or required_value is None:
+                    continue
+                if (
+                    counters[user_id].get(counter_name, 0) >= required_value
+                    and (user_id, ach.id) not in granted_ids
+                ):
+                    session.merge(
+                        UserAchievement(user_id=user_id, achievement_id=ach.id)
+                    )
+                    embed = discord.Embed(
+                        title=f"{user.name if user else 'Unknown'} unlocks achievement: {ach.name} {ach.icon or ''}",
+                        description=ach.description,
+                        color=discord.Color.gold(),
+                    )
+                    granted_embeds.append((user_id, embed))
         return granted_embeds
 
 
@@ -133,7 +155,7 @@ class StreakListener(Listener):
                 embeds.extend(self.check_achievements(session, user_id))
                 session.commit()
             for embed in embeds:
-                await ctx.send(embed=embed)
+                await announce(ctx, user_id, embed)
         except Exception:
             logging.exception("Error in ReadStreak listener action")
 
@@ -141,9 +163,26 @@ class StreakListener(Listener):
 class BooksFinished(Listener):
     signal_name = "books_finished"
 
+    def increment_many(self, session, user_ids: List[int], amount: int):
+        counters = {
+            counter.user_id: counter
+            for counter in session.scalars(
+                select(Counter).where(
+                    Counter.user_id.in_(user_ids), Counter.name == self.signal_name
+                )
+            )
+        }
+        for user_id in user_ids:
+            if user_id in counters:
+                counters[user_id].value += amount
+            else:
+                session.add(
+                    Counter(user_id=user_id, name=self.signal_name, value=amount)
+                )
+
     async def action(self, sender, **kwargs):
         logging.info(
-            f"Action triggered for signal: {self.signal_name} with kwargs: {kwargs}"
+            "Action triggered for signal: %s with kwargs: %s", self.signal_name, kwargs
         )
         try:
             book_club_id = kwargs.get("book_club_id")
@@ -154,16 +193,13 @@ class BooksFinished(Listener):
                 bk = session.get(BookClub, book_club_id)
                 if bk is None:
                     return
-                for reader in bk.readers:
-                    self.increment(session, reader.user_id, 1)
+                user_ids = [reader.user_id for reader in bk.readers]
+                self.increment_many(session, user_ids, 1)
                 session.flush()
-
-                embeds = []
-                for reader in bk.readers:
-                    embeds.extend(self.check_achievements(session, reader.user_id))
+                embeds = self.check_many(session, user_ids)
                 session.commit()
-            for embed in embeds:
-                await ctx.send(embed=embed)
+            for user_id, embed in embeds:
+                await announce(ctx, user_id, embed)
         except Exception:
             logging.exception("Error in BooksFinished listener action")
 
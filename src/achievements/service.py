@@ -86,6 +86,6 @@ def load_achievements_from_json(engine, achievements_dir=None):
                                 rule_json=ach["rule"],
                             )
                         )
-        logging.info(f"Loaded {count} achievements from JSON.")
+        logging.info("Loaded %d achievements from JSON.", count)
 
         session.commit()
@@ -0,0 +1,165 @@
+import asyncio
+import dataclasses
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Optional
+
+from sqlalchemy.orm import Session
+
+from .library import Book
+from .model import BookMetadataCache
+
+# Entries kept in memory, the rest is only in SQLite.
+MAX_SIZE = 512
+# Seconds before a lookup is fetched again.
+TTL = 7 * 24 * 60 * 60
+# Seconds before a lookup without hits is tried again.
+NEGATIVE_TTL = 24 * 60 * 60
+# Seconds an expired entry may still be served while it is refreshed.
+STALE_TTL = 30 * 24 * 60 * 60
+
+
+def normalize(query: str) -> str:
+    return " ".join(query.casefold().split())
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    negative_hits: int = 0
+    stale_hits: int = 0
+    misses: int = 0
+    refreshes: int = 0
+    errors: int = 0
+    # Expired entries served because the lookup failed.
+    fallbacks: int = 0
+
+
+@dataclass
+class _Entry:
+    books: list[Book]
+    fetched_at: datetime
+
+
+class BookCache:
+    """
+    Book searches cached in memory (LRU) and in SQLite, so they survive
+    restarts. Searches without hits are cached as well, for a shorter time.
+    Expired entries are served while a refresh runs in the background, and
+    as a fallback when Hardcover cannot be reached.
+    """
+
+    def __init__(
+        self,
+        engine,
+        fetch: Callable[[str], Awaitable[list[Book]]],
+        max_size: int = MAX_SIZE,
+        ttl: float = TTL,
+        negative_ttl: float = NEGATIVE_TTL,
+        stale_ttl: float = STALE_TTL,
+        clock: Callable[[], datetime] = _utcnow,
+    ):
+        self.engine = engine
+        self.fetch = fetch
+        self.max_size = max_size
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.stale_ttl = stale_ttl
+        self.clock = clock
+        self.stats = CacheStats()
+        self._memory: OrderedDict[str, _Entry] = OrderedDict()
+        self._inflight: dict[str, asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    async def get(self, query: str) -> list[Book]:
+        """Search results for a query, best match first."""
+        key = normalize(query)
+        entry = self._memory_get(key) or self._load(key)
+        if entry is not None:
+            age = (self.clock() - entry.fetched_at).total_seconds()
+            if not entry.books and age < self.negative_ttl:
+                self.stats.negative_hits += 1
+                return []
+            if entry.books and age < self.ttl:
+                self.stats.hits += 1
+                return entry.books
+            if entry.books and age < self.stale_ttl:
+                self.stats.stale_hits += 1
+                self._refresh(key, query)
+                return entry.books
+        self.stats.misses += 1
+        try:
+            # One requester giving up does not cancel the others.
+            return await asyncio.shield(self._refresh(key, query))
+        except Exception:
+            if entry is None or not entry.books:
+                raise
+            logging.warning("Serving expired book lookup for %r", key)
+            self.stats.fallbacks += 1
+            return entry.books
+
+    def _memory_get(self, key: str) -> Optional[_Entry]:
+        entry = self._memory.get(key)
+        if entry is not None:
+            self._memory.move_to_end(key)
+        return entry
+
+    def _memory_put(self, key: str, entry: _Entry) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_size:
+            self._memory.popitem(last=False)
+
+    def _load(self, key: str) -> Optional[_Entry]:
+        with Session(self.engine) as session:
+            row = session.get(BookMetadataCache, key)
+            if row is None:
+                return None
+            entry = _Entry(
+                books=[Book(**book) for book in row.payload],
+                fetched_at=row.fetched_at,
+            )
+        self._memory_put(key, entry)
+        return entry
+
+    def _store(self, key: str, books: list[Book]) -> None:
+        entry = _Entry(books=books, fetched_at=self.clock())
+        self._memory_put(key, entry)
+        with Session(self.engine) as session:
+            session.merge(
+                BookMetadataCache(
+                    query=key,
+                    payload=[dataclasses.asdict(book) for book in books],
+                    fetched_at=entry.fetched_at,
+                )
+            )
+            session.commit()
+
+    def _refresh(self, key: str, query: str) -> asyncio.Task:
+        """Fetch a query, sharing the request with concurrent lookups."""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fetch(key, query))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._done(key, t))
+        return task
+
+    async def _fetch(self, key: str, query: str) -> list[Book]:
+        self.stats.refreshes += 1
+        books = await self.fetch(query)
+        self._store(key, books)
+        return books
+
+    def _done(self, key: str, task: asyncio.Task) -> None:
+        self._inflight.pop(key, None)
+        if not task.cancelled() and task.exception() is not None:
+            self.stats.errors += 1
+            logging.warning("Book lookup failed for %r: %r", key, task.exception())
@@ -1,24 +1,45 @@
 import json
-import requests
 import logging
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Optional
 
-# Load Hardcover API key from file
-API_KEY_FILE = Path(".hardcover-api-key")
-if not API_KEY_FILE.exists():
-    raise FileNotFoundError(
-        "Missing .hardcover-api-key file with your Hardcover API token."
-    )
+import aiohttp
 
-with API_KEY_FILE.open("r", encoding="utf-8") as f:
-    API_KEY = f.read().strip()
+from .resilience import Resilience, UpstreamError
 
+API_KEY_FILE = Path(".hardcover-api-key")
 API_URL = "https://api.hardcover.app/v1/graphql"
-HEADERS = {
-    "authorization": API_KEY,
-    "content-type": "application/json",
+
+# Hardcover usually answers in well under a second, don't let a slow
+# response hold up a command for long.
+DEFAULT_TIMEOUT = aiohttp.ClientTimeout(total=10, sock_connect=3, sock_read=7)
+# Connections kept open to Hardcover.
+POOL_SIZE = 10
+# Search results fetched per lookup, offered as alternatives to the first.
+SEARCH_LIMIT = 5
+
+SEARCH_QUERY = """
+query SearchBook($query: String!, $per_page: Int!) {
+  search(query: $query, query_type: "Book", per_page: $per_page, page: 1) {
+    results
+  }
 }
+"""
+
+
+def load_api_key() -> str:
+    """Load the Hardcover API key from file."""
+    if not API_KEY_FILE.exists():
+        raise FileNotFoundError(
+            "Missing .hardcover-api-key file with your Hardcover API token."
+        )
+    with API_KEY_FILE.open("r", encoding="utf-8") as f:
+        return f.read().strip()
+
+
+class HardcoverError(UpstreamError, LookupError):
+    """Hardcover answered with GraphQL errors instead of results."""
 
 
 @dataclass
@@ -33,46 +54,8 @@ class Book:
     img_url: str | None
 
 
-def fetch_book(query: str):
-    """Fetch book information from Hardcover API by title."""
-    logging.info(f"Fetching book for query: {query}")
-
-    gql_query = """
-    query SearchBook($query: String!) {
-      search(query: $query, query_type: "Book", per_page: 1, page: 1) {
-        results
-      }
-    }
-    """
-
-    variables = {"query": query}
-    logging.debug(f"Sending search query:\n{gql_query}\nWith variables: {variables}")
-
-    response = requests.post(
-        API_URL, headers=HEADERS, json={"query": gql_query, "variables": variables}
-    )
-    logging.debug(f"Search HTTP status: {response.status_code}")
-    response.raise_for_status()
-
-    data = response.json()
-    logging.debug(f"Search response data: {json.dumps(data, indent=2)}")
-
-    if "errors" in data:
-        logging.error(f"Hardcover API returned errors: {data['errors']}")
-        return None
-
-    results = data.get("data", {}).get("search", {}).get("results", {})
-    hits = results.get("hits", [])
-
-    if not hits:
-        logging.info(f"No search hits found for query: {query}")
-        return None
-
-    book_doc = hits[0].get("document", {})
-    if not book_doc:
-        logging.error(f"No book document found in first hit for query: {query}")
-        return None
-
+def parse_book(book_doc: dict) -> Book:
+    """Build a Book from a Hardcover search document."""
     title = book_doc.get("title", "Unknown")
     author = "Unknown"
     contributions = book_doc.get("contributions", [])
@@ -83,20 +66,130 @@ def fetch_book(query: str):
     ):
         author = contributions[0]["author"]["name"]
 
-    year = book_doc.get("release_year")
-    pages = book_doc.get("pages")
-    rating = book_doc.get("rating")
-
     img_url = None
     if book_doc.get("image"):
         img_url = book_doc.get("image").get("url")
 
-    logging.info(f"Found book: {title} by {author} ({year})")
     return Book(
         title=title,
         author=author,
-        year=year,
-        pages=pages,
-        rating=rating,
+        year=book_doc.get("release_year"),
+        pages=book_doc.get("pages"),
+        rating=book_doc.get("rating"),
         img_url=img_url,
     )
+
+
+def parse_hits(search: Optional[dict]) -> list[Book]:
+    """Books from the hits of a `search` field, best match first."""
+    hits = ((search or {}).get("results") or {}).get("hits", [])
+    return [parse_book(doc) for hit in hits if (doc := hit.get("document"))]
+
+
+def batch_search_query(count: int, limit: int) -> str:
+    """A query running `count` searches at once, aliased b0, b1, ..."""
+    params = ", ".join(f"$q{i}: String!" for i in range(count))
+    fields = "\n".join(
+        f'  b{i}: search(query: $q{i}, query_type: "Book", per_page: {limit}, page: 1) {{\n'
+        "    results\n"
+        "  }"
+        for i in range(count)
+    )
+    return f"query SearchBooks({params}) {{\n{fields}\n}}"
+
+
+class HardcoverClient:
+    """Async client for the Hardcover GraphQL API sharing one connection pool."""
+
+    def __init__(
+        self,
+        api_key: str,
+        url: str = API_URL,
+        timeout: aiohttp.ClientTimeout = DEFAULT_TIMEOUT,
+        pool_size: int = POOL_SIZE,
+        resilience: Optional[Resilience] = None,
+    ):
+        self.api_key = api_key
+        self.url = url
+        self.timeout = timeout
+        self.pool_size = pool_size
+        # Shared by everything using this client.
+        self.resilience = resilience or Resilience()
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                headers={
+                    "authorization": self.api_key,
+                    "content-type": "application/json",
+                },
+                timeout=self.timeout,
+                connector=aiohttp.TCPConnector(limit=self.pool_size, ttl_dns_cache=300),
+            )
+        return self._session
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def query(
+        self, gql_query: str, variables: dict, partial: bool = False
+    ) -> dict:
+        """
+        Send a GraphQL query, rate limited and retried on 429, 5xx, timeouts
+        and GraphQL errors. Raises HardcoverError for errors, unless `partial`
+        and some data came back, and CircuitOpenError while Hardcover keeps
+        failing.
+        """
+        return await self.resilience.call(
+            lambda: self._post(gql_query, variables, partial)
+        )
+
+    async def _post(self, gql_query: str, variables: dict, partial: bool) -> dict:
+        async with self.session().post(
+            self.url, json={"query": gql_query, "variables": variables}
+        ) as response:
+            logging.debug("Hardcover HTTP status: %s", response.status)
+            response.raise_for_status()
+            data = await response.json()
+        if "errors" in data:
+            logging.error("Hardcover API returned errors: %s", data["errors"])
+            if not (partial and data.get("data")):
+                raise HardcoverError(f"Hardcover API returned errors: {data['errors']}")
+        return data
+
+    async def search_books(self, query: str, limit: int = SEARCH_LIMIT) -> list[Book]:
+        """Search Hardcover for books, best match first, in a single request."""
+        logging.info("Searching books for query: %s", query)
+        data = await self.query(SEARCH_QUERY, {"query": query, "per_page": limit})
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug("Search response data: %s", json.dumps(data, indent=2))
+
+        books = parse_hits(data.get("data", {}).get("search"))
+        if not books:
+            logging.info("No search hits found for query: %s", query)
+            return []
+
+        logging.info("Found %d books for query: %s", len(books), query)
+        return books
+
+    async def search_many(self, queries: list[str], limit: int = 1) -> list[list[Book]]:
+        """Run several searches in a single request, results in query order."""
+        if not queries:
+            return []
+        logging.info("Searching books for %d queries", len(queries))
+        data = await self.query(
+            batch_search_query(len(queries), limit),
+            {f"q{i}": query for i, query in enumerate(queries)},
+            # The searches without errors still have their results.
+            partial=True,
+        )
+        results = data.get("data") or {}
+        return [parse_hits(results.get(f"b{i}")) for i in range(len(queries))]
+
+    async def fetch_book(self, query: str) -> Optional[Book]:
+        """Fetch book information from Hardcover API by title."""
+        books = await self.search_books(query, limit=1)
+        return books[0] if books else None
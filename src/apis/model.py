@@ -0,0 +1,15 @@
+from datetime import datetime
+
+from sqlalchemy import JSON, DateTime, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ..models import Base
+
+
+class BookMetadataCache(Base):
+    __tablename__ = "book_metadata_cache"
+    # Normalized search query.
+    query: Mapped[str] = mapped_column(String, primary_key=True)
+    # Search results as a list of library.Book fields, empty without hits.
+    payload: Mapped[list] = mapped_column(JSON, nullable=False)
+    fetched_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
@@ -0,0 +1,86 @@
+import asyncio
+from abc import ABC, abstractmethod
+from typing import Callable, Iterable, Optional
+
+from .library import SEARCH_LIMIT, Book, HardcoverClient, load_api_key
+from .resilience import ResilienceStats
+
+
+class MetadataProvider(ABC):
+    """Where book metadata comes from, injected into the cogs that need it."""
+
+    @abstractmethod
+    async def search_books(self, query: str, limit: int = SEARCH_LIMIT) -> list[Book]:
+        """Books matching a query, best match first."""
+
+    @abstractmethod
+    async def search_many(self, queries: list[str], limit: int = 1) -> list[list[Book]]:
+        """Results of several queries, in query order."""
+
+    def stats(self) -> Optional[ResilienceStats]:
+        """Breaker and rate limit state, if the provider has any."""
+        return None
+
+    async def close(self) -> None:
+        pass
+
+
+class HardcoverProvider(MetadataProvider):
+    """
+    Hardcover GraphQL API. The API key is read and the client created on the
+    first lookup, so the bot starts without the key file.
+    """
+
+    def __init__(self, load_key: Callable[[], str] = load_api_key, **client_options):
+        self.load_key = load_key
+        self.client_options = client_options
+        self._client: Optional[HardcoverClient] = None
+
+    def client(self) -> HardcoverClient:
+        if self._client is None:
+            self._client = HardcoverClient(self.load_key(), **self.client_options)
+        return self._client
+
+    async def search_books(self, query: str, limit: int = SEARCH_LIMIT) -> list[Book]:
+        return await self.client().search_books(query, limit)
+
+    async def search_many(self, queries: list[str], limit: int = 1) -> list[list[Book]]:
+        return await self.client().search_many(queries, limit)
+
+    def stats(self) -> Optional[ResilienceStats]:
+        return self._client.resilience.stats() if self._client is not None else None
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.close()
+
+
+class FixtureProvider(MetadataProvider):
+    """
+    Offline provider for tests and benchmarks. A book matches a query when
+    every word of the query is in its title or author.
+    """
+
+    def __init__(self, books: Iterable[Book] = (), latency: float = 0):
+        self.books = list(books)
+        # Seconds each lookup takes, to stand in for the network.
+        self.latency = latency
+        self.queries: list[str] = []
+
+    def _matches(self, query: str, limit: int) -> list[Book]:
+        words = query.casefold().split()
+        return [
+            book
+            for book in self.books
+            if all(word in f"{book.title} {book.author}".casefold() for word in words)
+        ][:limit]
+
+    async def search_books(self, query: str, limit: int = SEARCH_LIMIT) -> list[Book]:
+        self.queries.append(query)
+        await asyncio.sleep(self.latency)
+        return self._matches(query, limit)
+
+    async def search_many(self, queries: list[str], limit: int = 1) -> list[list[Book]]:
+        self.queries.extend(queries)
+        await asyncio.sleep(self.latency)
+        return [self._matches(query, limit) for query in queries]
@@ -0,0 +1,219 @@
+import asyncio
+import enum
+import logging
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+import aiohttp
+from tenacity import (
+    AsyncRetrying,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_random_exponential,
+)
+
+# Attempts per request, including the first one.
+RETRY_ATTEMPTS = 3
+# Upper bound in seconds of the randomized exponential backoff.
+RETRY_MAX_WAIT = 8
+# Hardcover allows 60 requests per minute.
+RATE_LIMIT = 1.0
+RATE_BURST = 5
+# Failed requests in a row before the breaker opens.
+FAILURE_THRESHOLD = 5
+# Seconds the breaker stays open before a trial request is let through.
+RESET_TIMEOUT = 30
+
+
+class UpstreamError(Exception):
+    """The upstream answered, but with errors of its own instead of data."""
+
+
+def retryable(error: BaseException) -> bool:
+    """
+    Errors that may go away by themselves: rate limits, 5xx, timeouts and
+    errors reported by the upstream.
+    """
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status == 429 or error.status >= 500
+    return isinstance(
+        error, (aiohttp.ClientConnectionError, asyncio.TimeoutError, UpstreamError)
+    )
+
+
+class TokenBucket:
+    """Allows `rate` acquisitions per second on average, bursts of `capacity`."""
+
+    def __init__(
+        self,
+        rate: float = RATE_LIMIT,
+        capacity: int = RATE_BURST,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.tokens = float(capacity)
+        self.updated = clock()
+        self.throttled = 0
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self) -> None:
+        # The lock keeps waiters in order, so none of them starves.
+        async with self._lock:
+            self._refill()
+            if self.tokens < 1:
+                self.throttled += 1
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= 1
+
+
+class BreakerState(enum.Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request while the upstream is failing."""
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` failures in a row and rejects requests
+    for `reset_timeout` seconds. Then a single trial request decides whether
+    it closes again.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = FAILURE_THRESHOLD,
+        reset_timeout: float = RESET_TIMEOUT,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = BreakerState.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.rejected = 0
+        self.trips = 0
+
+    def check(self) -> None:
+        """Raises CircuitOpenError if a request should not be sent now."""
+        if self.state == BreakerState.CLOSED:
+            return
+        if (
+            self.state == BreakerState.OPEN
+            and self.clock() - self.opened_at >= self.reset_timeout
+        ):
+            self.state = BreakerState.HALF_OPEN
+            return
+        self.rejected += 1
+        raise CircuitOpenError("Hardcover is unavailable, try again later.")
+
+    def success(self) -> None:
+        if self.state != BreakerState.CLOSED:
+            logging.info("Hardcover circuit breaker closed")
+        self.state = BreakerState.CLOSED
+        self.failures = 0
+
+    def abandon(self) -> None:
+        """
+        The request ended without an answer, like when it was cancelled. A
+        trial request is let through again with the next one.
+        """
+        if self.state == BreakerState.HALF_OPEN:
+            self.state = BreakerState.OPEN
+
+    def failure(self) -> None:
+        self.failures += 1
+        if self.state == BreakerState.HALF_OPEN or (
+            self.state == BreakerState.CLOSED
+            and self.failures >= self.failure_threshold
+        ):
+            logging.warning(
+                "Hardcover circuit breaker opened after %d failures", self.failures
+            )
+            self.state = BreakerState.OPEN
+            self.opened_at = self.clock()
+            self.trips += 1
+
+
+@dataclass
+class ResilienceStats:
+    state: BreakerState
+    failures: int
+    trips: int
+    rejected: int
+    retries: int
+    throttled: int
+
+
+class Resilience:
+    """Rate limiting, retries and circuit breaking around upstream requests."""
+
+    def __init__(
+        self,
+        limiter: TokenBucket | None = None,
+        breaker: CircuitBreaker | None = None,
+        attempts: int = RETRY_ATTEMPTS,
+        max_wait: float = RETRY_MAX_WAIT,
+    ):
+        self.limiter = limiter or TokenBucket()
+        self.breaker = breaker or CircuitBreaker()
+        self.attempts = attempts
+        self.max_wait = max_wait
+        self.retries = 0
+
+    def stats(self) -> ResilienceStats:
+        return ResilienceStats(
+            state=self.breaker.state,
+            failures=self.breaker.failures,
+            trips=self.breaker.trips,
+            rejected=self.breaker.rejected,
+            retries=self.retries,
+            throttled=self.limiter.throttled,
+        )
+
+    def _before_sleep(self, retry_state) -> None:
+        self.retries += 1
+        logging.info(
+            "Retrying Hardcover request after %r", retry_state.outcome.exception()
+        )
+
+    async def call(self, request: Callable):
+        """Await `request()` with retries, raises CircuitOpenError when open."""
+        self.breaker.check()
+        try:
+            async for attempt in AsyncRetrying(
+                retry=retry_if_exception(retryable),
+                wait=wait_random_exponential(multiplier=0.5, max=self.max_wait),
+                stop=stop_after_attempt(self.attempts),
+                before_sleep=self._before_sleep,
+                reraise=True,
+            ):
+                with attempt:
+                    await self.limiter.acquire()
+                    result = await request()
+        except Exception as e:
+            # Other errors mean Hardcover answered, so it is up.
+            if retryable(e):
+                self.breaker.failure()
+            else:
+                self.breaker.success()
+            raise
+        except BaseException:
+            # Cancelled, Hardcover may or may not be up.
+            self.breaker.abandon()
+            raise
+        self.breaker.success()
+        return result
@@ -3,17 +3,27 @@ import logging
 from functools import wraps
 from typing import Optional
 
+import aiohttp
 import discord
 from blinker import signal
 from discord.ext import commands
-from sqlalchemy.orm import Session
 
-from ..apis import library
+from .. import metrics
+from ..apis.cache import BookCache
+from ..apis.provider import HardcoverProvider, MetadataProvider
+from ..apis.resilience import CircuitOpenError
+from ..gateway import resolve_member
 from ..result_types import *
+from ..sharding import shard_ids
 from . import discordviews
-from .model import BookClub, BookClubReaderRole, BookClubReaderState, BookState
+from .digest import DEFAULT_INTERVAL, DEFAULT_MAX_EVENTS, Digest, DigestSettings
+from .enrichment import REPORT_INTERVAL, Enrichment
+from .guild_roles import GuildRoles
+from .model import BookClubReaderRole, BookState
+from .read_model import ReadModel
 from .rotate_roles import rotate_roles
 from .service import BookCircleService
+from .status import StatusBoard
 
 
 def send_embed(func):
@@ -23,6 +33,7 @@ def send_embed(func):
             case Ok(embed):
                 await ctx.send(embed=embed)
             case Err(msg):
+                metrics.error("reply")
                 await ctx.send(
                     embed=discord.Embed(
                         title="Error", description=f"{msg}", color=discord.Color.red()
@@ -52,10 +63,12 @@ class BookCircle(commands.Cog):
     #         color=discord.Color.green()
     #     ))
 
-    def __init__(self, bot: commands.Bot, engine):
+    def __init__(self, bot: commands.Bot, engine, metadata: MetadataProvider):
         self.bot = bot
         self.engine = engine
+        self.metadata = metadata
         self.service = BookCircleService(engine)
+        self.read_model = ReadModel(engine)
         self.books_finished = signal("books_finished")
         self.caught_up = signal("caught_up")
         self.read_signal = signal("read")
@@ -64,112 +77,157 @@ class BookCircle(commands.Cog):
         self.note_signal = signal("notes")
         self.quote_signal = signal("quotes")
         self.review_signal = signal("reviews")
+        self.target_signal = signal("target")
+        self.membership_signal = signal("membership")
+        self.book_signal = signal("book")
         self.roles = {
             r.name for r in BookClubReaderRole if r != BookClubReaderRole.NONE
         }
+        self.guild_roles = GuildRoles(self.roles)
+        self.roles_reconciled = False
+        self.shame_tasks: dict[int, asyncio.Task] = {}
+        self.status_board = StatusBoard(bot, self.service)
+        self.digests = Digest(bot, self.service)
+        self.book_cache = BookCache(engine, metadata.search_books)
+        self.enrichment = Enrichment(engine, metadata.search_many)
         super().__init__()
 
+    def samples(self) -> list[metrics.Sample]:
+        samples = metrics.stats_samples("bookcache", self.book_cache.stats)
+        if (upstream := self.metadata.stats()) is not None:
+            samples += metrics.stats_samples("hardcover", upstream)
+        return samples
+
+    async def cog_unload(self) -> None:
+        self.status_board.close()
+        await self.digests.flush_all()
+        await self.metadata.close()
+
     @commands.command()
     @send_embed
     async def read(self, ctx: commands.Context, *, progress: str):
         """Set your reading progress (e.g., page, chapter, percent)."""
         match r := self.service.set_progress(ctx.channel.id, ctx.author.id, progress):
             case Ok():
-                await self.read_signal.send_async(None, ctx=ctx, user_id=ctx.author.id)
+                await self.read_signal.send_async(
+                    None, ctx=ctx, user_id=ctx.author.id, progress=progress
+                )
+                if self.digests.enabled(ctx.channel.id):
+                    await ctx.message.add_reaction("✅")
+                    return None
         return r
 
-    async def background_shame_task(self):
+    async def background_shame_task(self, shard_id: int):
         await self.bot.wait_until_ready()
         while not self.bot.is_closed():
             await asyncio.sleep(6 * 24 * 60 * 100 * 60)  # 600 days
-            for guild in self.bot.guilds:
-                for channel in guild.text_channels:
-                    try:
-                        with Session(self.engine) as session:
-                            club = session.get(BookClub, channel.id)
-                            if not club:
-                                continue
-                            not_caught_up = [
-                                r
-                                for r in club.readers
-                                if r.state != BookClubReaderState.CAUGHT_UP
-                                and r.state != BookClubReaderState.COMPLETED
-                            ]
-                            if not not_caught_up:
-                                continue
-                            mentions = [f"<@{r.user.id}>" for r in not_caught_up]
-                            await channel.send(
-                                embed=discord.Embed(
-                                    title="⏰ Shame!",
-                                    description=f"The following readers have not caught up: {', '.join(mentions)}",
-                                    color=discord.Color.red(),
-                                )
-                            )
-                    except Exception:
-                        logging.exception(
-                            f"Error in shame background task for channel {channel.id}"
+            await self.shame_shard(shard_id)
+
+    async def shame_shard(self, shard_id: int):
+        """Shame the readers behind in the guilds of one shard."""
+        for guild in self.bot.guilds:
+            if guild.shard_id != shard_id:
+                continue
+            try:
+                clubs = self.read_model.clubs(c.id for c in guild.text_channels)
+            except Exception:
+                logging.exception("Error loading book clubs of guild %s", guild.id)
+                continue
+            for club in clubs:
+                channel = guild.get_channel(club.id)
+                behind = club.behind()
+                if channel is None or not behind:
+                    continue
+                try:
+                    mentions = [f"<@{r.user_id}>" for r in behind]
+                    await channel.send(
+                        embed=discord.Embed(
+                            title="⏰ Shame!",
+                            description=f"The following readers have not caught up: {', '.join(mentions)}",
+                            color=discord.Color.red(),
                         )
+                    )
+                except Exception:
+                    logging.exception(
+                        "Error in shame background task for channel %s", club.id
+                    )
 
     @commands.command()
     async def shame(self, ctx: commands.Context):
         """Mention everyone who has not caught up to the current target."""
-        with Session(self.engine) as session:
-            club = session.get(BookClub, ctx.channel.id)
-            if not club:
-                await ctx.send(
-                    embed=discord.Embed(
-                        title="Error",
-                        description="Book club not found.",
-                        color=discord.Color.red(),
-                    )
-                )
-                return
-            not_caught_up = [
-                r
-                for r in club.readers
-                if r.state != BookClubReaderState.CAUGHT_UP
-                and r.state != BookClubReaderState.COMPLETED
-            ]
-            if not not_caught_up:
-                await ctx.send(
-                    embed=discord.Embed(
-                        title="🎉 Everyone is caught up!",
-                        description="Great job, everyone!",
-                        color=discord.Color.green(),
-                    )
-                )
-                return
-            await self.shame_signal.send_async(None, ctx=ctx, user_id=ctx.author.id)
-            mentions = []
-            for reader in not_caught_up:
-                user = reader.user
-                mentions.append(f"<@{user.id}>")
-                await self.shamee_signal.send_async(None, ctx=ctx, user_id=user.id)
+        club = self.read_model.club(ctx.channel.id)
+        if not club:
             await ctx.send(
                 embed=discord.Embed(
-                    title="⏰ Shame!",
-                    description=f"The following readers have not caught up: {', '.join(mentions)}",
+                    title="Error",
+                    description="Book club not found.",
                     color=discord.Color.red(),
                 )
             )
+            return
+        not_caught_up = club.behind()
+        if not not_caught_up:
+            await ctx.send(
+                embed=discord.Embed(
+                    title="🎉 Everyone is caught up!",
+                    description="Great job, everyone!",
+                    color=discord.Color.green(),
+                )
+            )
+            return
+        await self.shame_signal.send_async(None, ctx=ctx, user_id=ctx.author.id)
+        mentions = []
+        for reader in not_caught_up:
+            mentions.append(f"<@{reader.user_id}>")
+            await self.shamee_signal.send_async(None, ctx=ctx, user_id=reader.user_id)
+        await ctx.send(
+            embed=discord.Embed(
+                title="⏰ Shame!",
+                description=f"The following readers have not caught up: {', '.join(mentions)}",
+                color=discord.Color.red(),
+            )
+        )
 
     @commands.Cog.listener()
     async def on_ready(self) -> None:
         """Event handler for when the bot is ready."""
         logging.info("BookCircle Cog is ready.")
 
-        self.bot.loop.create_task(self.background_shame_task())
-
-        for guild in self.bot.guilds:
-            existing = {role.name for role in guild.roles}
-            for role in self.roles - existing:
-                await guild.create_role(
-                    name=role, hoist=True, color=discord.Color.random()
+        # One shame task per shard, each only sweeping its own guilds. on_ready
+        # fires again after reconnects so skip the ones already running.
+        for shard_id in shard_ids(self.bot):
+            task = self.shame_tasks.get(shard_id)
+            if task is None or task.done():
+                self.shame_tasks[shard_id] = self.bot.loop.create_task(
+                    self.background_shame_task(shard_id)
                 )
 
-    def __roles_from_guild(self, guild: discord.Guild) -> dict[str, discord.Role]:
-        """Create a mapping from name to guild role."""
-        return {role.name: role for role in guild.roles if role.name in self.roles}
+        # Create missing reader roles once per process, new guilds are handled
+        # by on_guild_join.
+        if not self.roles_reconciled:
+            self.roles_reconciled = True
+            self.bot.loop.create_task(self.guild_roles.reconcile(self.bot.guilds))
+
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild: discord.Guild) -> None:
+        await self.guild_roles.provision(guild)
+
+    @commands.Cog.listener()
+    async def on_guild_role_create(self, role: discord.Role) -> None:
+        if role.name in self.roles:
+            self.guild_roles.invalidate(role.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role: discord.Role) -> None:
+        if role.name in self.roles:
+            self.guild_roles.invalidate(role.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_role_update(
+        self, before: discord.Role, after: discord.Role
+    ) -> None:
+        if before.name in self.roles or after.name in self.roles:
+            self.guild_roles.invalidate(after.guild.id)
 
     @commands.command()
     @send_embed
@@ -201,35 +259,40 @@ class BookCircle(commands.Cog):
             return
 
         # Map role names to discord.Role objects
-        role_objs = self.__roles_from_guild(guild)
+        role_objs = self.guild_roles.get(guild)
 
         # Get all BookClubReader roles from the database for this club
         club_id = ctx.channel.id
-        with Session(self.engine) as session:
-            club = session.get(BookClub, club_id)
-            if not club:
-                await ctx.send("Book club not found.")
-                return
-            user_roles = {r.user_id: r.role.value.upper() for r in club.readers}
+        club = self.read_model.club(club_id)
+        if not club:
+            await ctx.send("Book club not found.")
+            return
+        user_roles = {r.user_id: r.role.value.upper() for r in club.readers}
 
         logging.info(
-            f"Synchronizing roles for book club {club_id} with {len(ctx.channel.members)} members."
+            "Synchronizing roles for book club %s with %d readers.",
+            club_id,
+            len(user_roles),
         )
         try:
-            for member in ctx.channel.members:
-                if member.bot:
+            # Iterate the readers rather than channel.members, the member cache
+            # may be empty depending on the intents profile.
+            for user_id, role_name in user_roles.items():
+                member = await resolve_member(guild, user_id)
+                if member is None or member.bot:
                     continue
                 # Remove all book club roles
-                to_remove = [role_objs[name] for name in self.roles]
+                to_remove = [
+                    role_objs[name] for name in self.roles if name in role_objs
+                ]
                 # Add the correct role if assigned
-                role_name = user_roles.get(member.id)
-                if role_name and role_name in role_objs:
+                if role_name in role_objs:
                     await member.edit(
                         roles=[role for role in member.roles if role not in to_remove]
                         + [role_objs[role_name]]
                     )
         except Exception as e:
-            logging.error(f"Error synchronizing roles: {e}")
+            logging.error("Error synchronizing roles: %s", e)
 
     @commands.command()
     @send_embed
@@ -245,7 +308,7 @@ class BookCircle(commands.Cog):
         """Randomly assign roles to all readers in this book club (admin only)."""
         match r := self.service.shuffle_roles(ctx.channel.id):
             case Ok():
-                logging.info(f"Roles shuffled in channel {ctx.channel.id}")
+                logging.info("Roles shuffled in channel %s", ctx.channel.id)
                 await self.__synchronize_roles(ctx)
         return r
 
@@ -286,19 +349,39 @@ class BookCircle(commands.Cog):
         """Add a member to the book club in this channel (admin only)."""
         if not ctx.message.mentions:
             return Err("You must mention a user to add them.")
-        return self.service.join_club(ctx.channel.id, ctx.message.mentions[0])
+        member = ctx.message.mentions[0]
+        match r := self.service.join_club(ctx.channel.id, member):
+            case Ok():
+                await self.membership_signal.send_async(
+                    None, ctx=ctx, user_id=member.id, name=member.name, joined=True
+                )
+        return r
 
     @commands.command()
     @send_embed
     async def join(self, ctx: commands.Context):
         """Join the book club in this channel."""
-        return self.service.join_club(ctx.channel.id, ctx.author)
+        match r := self.service.join_club(ctx.channel.id, ctx.author):
+            case Ok():
+                await self.membership_signal.send_async(
+                    None,
+                    ctx=ctx,
+                    user_id=ctx.author.id,
+                    name=ctx.author.name,
+                    joined=True,
+                )
+        return r
 
     @commands.command()
     @send_embed
     async def leave(self, ctx: commands.Context):
         """Leave the book club in this channel."""
-        return self.service.leave_club(ctx.channel.id, ctx.author)
+        match r := self.service.leave_club(ctx.channel.id, ctx.author):
+            case Ok():
+                await self.membership_signal.send_async(
+                    None, ctx=ctx, user_id=ctx.author.id, joined=False
+                )
+        return r
 
     @commands.command()
     @send_embed
@@ -307,7 +390,13 @@ class BookCircle(commands.Cog):
         """Kick a member from the book club in this channel (admin only)."""
         if not ctx.message.mentions:
             return Err("You must mention a user to kick them.")
-        return self.service.kick_member(ctx.channel.id, ctx.message.mentions[0])
+        member = ctx.message.mentions[0]
+        match r := self.service.kick_member(ctx.channel.id, member):
+            case Ok():
+                await self.membership_signal.send_async(
+                    None, ctx=ctx, user_id=member.id, joined=False
+                )
+        return r
 
     _book_club_message_embed = discord.Embed(
         title="🎉 Book Club Created",
@@ -340,6 +429,7 @@ class BookCircle(commands.Cog):
         """Update book information (title/author) by book ID."""
         match r := self.service.create_or_update_book(ctx.channel.id, title, author):
             case Ok(embed):
+                await self.book_signal.send_async(None, ctx=ctx)
                 await ctx.send(
                     embed=embed,
                     view=discordviews.RenameChannelView(ctx, title or "bokcirkel"),
@@ -354,12 +444,29 @@ class BookCircle(commands.Cog):
         # Use channel ID as book club ID
         return self.service.get_status(ctx.channel.id)
 
+    @commands.command()
+    @send_embed
+    @commands.has_permissions(administrator=True)
+    async def pinstatus(self, ctx: commands.Context):
+        """Pin a status message that is kept up to date (admin only)."""
+        return await self.status_board.enable(ctx.channel)
+
+    @commands.command()
+    @send_embed
+    @commands.has_permissions(administrator=True)
+    async def unpinstatus(self, ctx: commands.Context):
+        """Stop updating the pinned status message (admin only)."""
+        return await self.status_board.disable(ctx.channel)
+
     @commands.command()
     @send_embed
     async def target(self, ctx: commands.Context, *, target: Optional[str]):
         """Set the target for the current book club."""
         match self.service.set_target(ctx.channel.id, BookState.READING, target):
             case Ok():
+                await self.target_signal.send_async(
+                    None, ctx=ctx, target=target, state=BookState.READING
+                )
                 embed = discord.Embed(
                     title="🎯 Target Set",
                     description=f"New target set to: {target}. Type !caughtup when you have reached the target.",
@@ -396,9 +503,11 @@ class BookCircle(commands.Cog):
         match r := self.service.add_review(ctx.channel.id, ctx.author, text, rating):
             case Ok():
                 await self.review_signal.send_async(
-                    None, ctx=ctx, user_id=ctx.author.id
+                    None, ctx=ctx, user_id=ctx.author.id, rating=rating
                 )
                 await ctx.message.delete()
+                if self.digests.enabled(ctx.channel.id):
+                    return None
         return r
 
     @commands.command()
@@ -410,6 +519,8 @@ class BookCircle(commands.Cog):
             case Ok():
                 await self.quote_signal.send_async(None, ctx=ctx, user_id=user_id)
                 await ctx.message.delete()
+                if self.digests.enabled(ctx.channel.id):
+                    return None
         return r
 
     @commands.command()
@@ -421,6 +532,8 @@ class BookCircle(commands.Cog):
             case Ok():
                 await self.note_signal.send_async(None, ctx=ctx, user_id=ctx.author.id)
                 await ctx.message.delete()
+                if self.digests.enabled(ctx.channel.id):
+                    return None
         return r
 
     @commands.command()
@@ -430,6 +543,44 @@ class BookCircle(commands.Cog):
         match r := self.service.caught_up(ctx.channel.id, ctx.author.id):
             case Ok():
                 await self.caught_up.send_async(None, ctx=ctx, user_id=ctx.author.id)
+                if self.digests.enabled(ctx.channel.id):
+                    await ctx.message.add_reaction("✅")
+                    return None
+        return r
+
+    @commands.command()
+    @send_embed
+    @commands.has_permissions(administrator=True)
+    async def digest(
+        self,
+        ctx: commands.Context,
+        minutes: str = str(DEFAULT_INTERVAL // 60),
+        max_events: int = DEFAULT_MAX_EVENTS,
+    ):
+        """Collect progress, notes and achievements into a periodic digest. `!digest <minutes|off> [max events]` (admin only)."""
+        if minutes.lower() == "off":
+            match r := await self.digests.configure(ctx.channel.id, None):
+                case Ok():
+                    return Ok(
+                        discord.Embed(
+                            title="📰 Digest Off",
+                            description="Events are posted as they happen again.",
+                            color=discord.Color.orange(),
+                        )
+                    )
+            return r
+        if not minutes.isdigit() or int(minutes) < 1 or max_events < 1:
+            return Err("Usage: `!digest <minutes|off> [max events]`")
+        settings = DigestSettings(interval=int(minutes) * 60, max_events=max_events)
+        match r := await self.digests.configure(ctx.channel.id, settings):
+            case Ok():
+                return Ok(
+                    discord.Embed(
+                        title="📰 Digest On",
+                        description=f"Events will be summarized every {minutes} minutes or every {max_events} events.",
+                        color=discord.Color.green(),
+                    )
+                )
         return r
 
     @commands.command()
@@ -447,7 +598,7 @@ class BookCircle(commands.Cog):
             case Ok():
                 if ctx.guild is None or not isinstance(ctx.author, discord.Member):
                     return r
-                guild_roles = self.__roles_from_guild(ctx.guild)
+                guild_roles = self.guild_roles.get(ctx.guild)
                 await ctx.author.edit(
                     roles=[
                         role for role in ctx.author.roles if role.name not in self.roles
@@ -462,7 +613,9 @@ class BookCircle(commands.Cog):
         self, ctx: commands.Context, title: str, author: Optional[str] = None
     ):
         """Suggest a book for the club."""
-        return self.service.suggest_book(ctx.author.id, title, author)
+        return self.service.suggest_book(
+            ctx.author.id, title, author, prefetch=self.enrichment.prefetch
+        )
 
     @commands.command()
     @send_embed
@@ -474,7 +627,7 @@ class BookCircle(commands.Cog):
                 for suggestion in suggestions:
                     embed.add_field(
                         name=suggestion.title,
-                        value=f"by {suggestion.author or 'Unknown'}",
+                        value=f"by {suggestion.author or 'Unknown'}{discordviews.book_details(suggestion)}",
                         inline=False,
                     )
                 return Ok(embed)
@@ -484,22 +637,79 @@ class BookCircle(commands.Cog):
     @send_embed
     async def book(self, ctx: commands.Context, *, query: str):
         """Show information about a specific book."""
-        book_info = library.fetch_book(query)
-        if book_info is None:
+        try:
+            books = await self.book_cache.get(query)
+        except CircuitOpenError as e:
+            return Err(f"{e} Use !setbook to manually pick the book")
+        except FileNotFoundError:
+            logging.warning("Book lookups are not configured: %s", query, exc_info=True)
+            return Err(
+                "Book lookups are not configured. Use !setbook to manually pick the book"
+            )
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            logging.exception("Failed to fetch book for query: %s", query)
+            books = []
+        if not books:
             return Err(
                 "Failed to fetch book information. Use !setbook to manually pick the book"
             )
 
-        embed = discord.Embed(
-            title=f"{book_info.title}",
-            description=f"by {book_info.author or 'Unknown'}\nYear: {book_info.year or 'N/A'}\nPages: {book_info.pages or 'N/A'}\nRating: {f'{book_info.rating:.2f}' or 'N/A'}",
-            color=discord.Color.blue(),
-        )
-        if book_info.img_url:
-            embed.set_thumbnail(url=book_info.img_url)
         await ctx.send(
-            embed=embed, view=discordviews.ApplyView(self.service, book_info, ctx)
+            embed=discordviews.book_embed(books[0]),
+            view=discordviews.ApplyView(self.service, books, ctx),
+        )
+
+    @commands.command()
+    @commands.has_permissions(administrator=True)
+    async def bookcache(self, ctx: commands.Context):
+        """Show book metadata cache statistics (admin only)."""
+        stats = self.book_cache.stats
+        lookups = stats.hits + stats.negative_hits + stats.stale_hits + stats.misses
+        hit_rate = (lookups - stats.misses) / lookups if lookups else 0
+        embed = discord.Embed(title="🗃️ Book Cache", color=discord.Color.blue())
+        embed.add_field(name="Hit Rate", value=f"{hit_rate:.0%} of {lookups}")
+        embed.add_field(name="In Memory", value=f"{len(self.book_cache)}")
+        embed.add_field(
+            name="Lookups",
+            value=(
+                f"✅ {stats.hits} hits\n"
+                f"🚫 {stats.negative_hits} cached misses\n"
+                f"⌛ {stats.stale_hits} stale\n"
+                f"🌐 {stats.misses} fetched\n"
+                f"🛟 {stats.fallbacks} expired served on errors"
+            ),
+            inline=False,
         )
+        embed.add_field(
+            name="Upstream",
+            value=f"🔄 {stats.refreshes} requests\n❌ {stats.errors} errors",
+            inline=False,
+        )
+        if (upstream := self.metadata.stats()) is not None:
+            embed.add_field(
+                name="Hardcover",
+                value=(
+                    f"🔌 Circuit {upstream.state.value} "
+                    f"({upstream.failures} failures, {upstream.trips} trips, "
+                    f"{upstream.rejected} rejected)\n"
+                    f"🔁 {upstream.retries} retries\n"
+                    f"🚦 {upstream.throttled} throttled"
+                ),
+                inline=False,
+            )
+        await ctx.send(embed=embed)
+
+    @commands.command()
+    @commands.has_permissions(administrator=True)
+    async def enrich(self, ctx: commands.Context):
+        """Fill in missing metadata of books and suggestions (admin only)."""
+        if not self.enrichment.start():
+            await ctx.send(embed=self.enrichment.progress.to_embed())
+            return
+        message = await ctx.send(embed=self.enrichment.progress.to_embed())
+        while self.enrichment.running():
+            await asyncio.sleep(REPORT_INTERVAL)
+            await message.edit(embed=self.enrichment.progress.to_embed())
 
     @commands.command()
     async def poll(self, ctx: commands.Context, seconds: int = 30):
@@ -524,7 +734,7 @@ class BookCircle(commands.Cog):
                     emoji = emoji_list[i % len(emoji_list)]
                     embed.add_field(
                         name=f"{emoji} {suggestion.title}",
-                        value=f"by {suggestion.author or 'Unknown'} (suggested by <@{suggestion.suggester_id}>)",
+                        value=f"by {suggestion.author or 'Unknown'}{discordviews.book_details(suggestion)} (suggested by <@{suggestion.suggester_id}>)",
                         inline=False,
                     )
                     book_map[emoji] = suggestion.id
@@ -547,6 +757,7 @@ class BookCircle(commands.Cog):
                 if winner:
                     match self.service.pop_suggested_book(ctx.channel.id, winner.id):
                         case Ok(BookCircleService.BookAppliedToClub()):
+                            await self.book_signal.send_async(None, ctx=ctx)
                             await ctx.send(
                                 f"🏆 The winner is '{winner.title}' by {winner.author or 'Unknown'}!",
                                 view=discordviews.RenameChannelView(ctx, winner.title),
@@ -555,3 +766,7 @@ class BookCircle(commands.Cog):
                     await ctx.send("No winner could be determined.")
             case Err(msg):
                 await ctx.send(f"Error: {msg}")
+
+
+async def setup(bot: commands.Bot) -> None:
+    await bot.add_cog(BookCircle(bot, bot.engine, bot.metadata or HardcoverProvider()))
@@ -0,0 +1,211 @@
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Optional
+
+import discord
+from blinker import signal
+
+from ..result_types import Ok
+
+DEFAULT_INTERVAL = 60 * 60
+DEFAULT_MAX_EVENTS = 25
+
+
+@dataclass(frozen=True)
+class DigestSettings:
+    # Seconds between digests.
+    interval: int = DEFAULT_INTERVAL
+    # Post early once this many events have been collected.
+    max_events: int = DEFAULT_MAX_EVENTS
+
+
+@dataclass
+class ClubDigest:
+    progress: dict[int, str] = field(default_factory=dict)
+    caught_up: list[int] = field(default_factory=list)
+    notes: int = 0
+    quotes: int = 0
+    reviews: dict[int, Optional[int]] = field(default_factory=dict)
+    achievements: list[str] = field(default_factory=list)
+    events: int = 0
+
+    def to_embed(self) -> discord.Embed:
+        embed = discord.Embed(title="📰 Book Club Digest", color=discord.Color.blue())
+        if self.progress:
+            embed.add_field(
+                name="📈 Progress",
+                value=_lines(f"<@{u}>: {p}" for u, p in self.progress.items()),
+                inline=False,
+            )
+        if self.caught_up:
+            embed.add_field(
+                name="🎉 Caught Up",
+                value=_lines(f"<@{u}>" for u in self.caught_up),
+                inline=False,
+            )
+        if self.reviews:
+            embed.add_field(
+                name="⭐ Reviews",
+                value=_lines(
+                    f"<@{u}>: {r if r is not None else 'N/A'}/5"
+                    for u, r in self.reviews.items()
+                ),
+                inline=False,
+            )
+        if self.notes:
+            embed.add_field(name="🗒️ Notes", value=f"{self.notes} new", inline=True)
+        if self.quotes:
+            embed.add_field(name="💬 Quotes", value=f"{self.quotes} new", inline=True)
+        if self.achievements:
+            embed.add_field(
+                name="🏆 Achievements", value=_lines(self.achievements), inline=False
+            )
+        return embed
+
+
+def _lines(lines, limit: int = 1024) -> str:
+    """Join lines, dropping the ones that do not fit in an embed field."""
+    out = ""
+    for line in lines:
+        if len(out) + len(line) + 1 > limit - 4:
+            return out + "\n..."
+        out = f"{out}\n{line}" if out else line
+    return out
+
+
+def _club_id(kwargs) -> Optional[int]:
+    ctx = kwargs.get("ctx")
+    return ctx.channel.id if ctx is not None else None
+
+
+class Digest:
+    """
+    Collects the book and achievement events of clubs in digest mode and posts
+    them as a single summary embed per interval.
+    """
+
+    def __init__(self, bot, service):
+        self.bot = bot
+        self.service = service
+        # None for clubs that are not in digest mode.
+        self.settings: dict[int, Optional[DigestSettings]] = {}
+        self.digests: dict[int, ClubDigest] = {}
+        self._timers: dict[int, asyncio.Task] = {}
+        receivers = {
+            "read": self.on_read,
+            "caught_up": self.on_caught_up,
+            "notes": self.on_note,
+            "quotes": self.on_quote,
+            "reviews": self.on_review,
+            "achievement_unlocked": self.on_achievement,
+        }
+        for name, receiver in receivers.items():
+            signal(name).connect(receiver)
+
+    def enabled(self, club_id: int) -> bool:
+        return self._settings(club_id) is not None
+
+    def _settings(self, club_id: int) -> Optional[DigestSettings]:
+        if club_id not in self.settings:
+            match self.service.get_digest_settings(club_id):
+                case Ok(settings):
+                    self.settings[club_id] = settings
+                case _:
+                    return None
+        return self.settings[club_id]
+
+    async def configure(self, club_id: int, settings: Optional[DigestSettings]):
+        match r := self.service.set_digest_settings(club_id, settings):
+            case Ok():
+                if settings is None:
+                    await self.flush(club_id)
+                self.settings[club_id] = settings
+        return r
+
+    def _add(self, club_id: int) -> Optional[ClubDigest]:
+        settings = self._settings(club_id)
+        if settings is None:
+            return None
+        digest = self.digests.setdefault(club_id, ClubDigest())
+        digest.events += 1
+        return digest
+
+    def _added(self, club_id: int) -> None:
+        settings = self._settings(club_id)
+        digest = self.digests.get(club_id)
+        if settings is None or digest is None:
+            return
+        if digest.events >= settings.max_events:
+            asyncio.create_task(self.flush(club_id))
+        elif club_id not in self._timers:
+            self._timers[club_id] = asyncio.create_task(
+                self._flush_later(club_id, settings.interval)
+            )
+
+    async def _flush_later(self, club_id: int, delay: int) -> None:
+        await asyncio.sleep(delay)
+        self._timers.pop(club_id, None)
+        await self.flush(club_id)
+
+    async def flush(self, club_id: int) -> None:
+        """Post the collected events of a club, if there are any."""
+        if (timer := self._timers.pop(club_id, None)) is not None:
+            if timer is not asyncio.current_task():
+                timer.cancel()
+        digest = self.digests.pop(club_id, None)
+        channel = self.bot.get_channel(club_id)
+        if digest is None or channel is None:
+            return
+        try:
+            await channel.send(embed=digest.to_embed())
+        except Exception:
+            logging.exception("Failed to post digest in %s", club_id)
+
+    async def flush_all(self) -> None:
+        await asyncio.gather(*(self.flush(club_id) for club_id in list(self.digests)))
+
+    async def on_read(self, sender, **kwargs):
+        club_id = _club_id(kwargs)
+        if club_id is None or (digest := self._add(club_id)) is None:
+            return
+        digest.progress[kwargs["user_id"]] = kwargs.get("progress", "")
+        self._added(club_id)
+
+    async def on_caught_up(self, sender, **kwargs):
+        club_id = _club_id(kwargs)
+        if club_id is None or (digest := self._add(club_id)) is None:
+            return
+        if kwargs["user_id"] not in digest.caught_up:
+            digest.caught_up.append(kwargs["user_id"])
+        self._added(club_id)
+
+    async def on_note(self, sender, **kwargs):
+        club_id = _club_id(kwargs)
+        if club_id is None or (digest := self._add(club_id)) is None:
+            return
+        digest.notes += 1
+        self._added(club_id)
+
+    async def on_quote(self, sender, **kwargs):
+        club_id = _club_id(kwargs)
+        if club_id is None or (digest := self._add(club_id)) is None:
+            return
+        digest.quotes += 1
+        self._added(club_id)
+
+    async def on_review(self, sender, **kwargs):
+        club_id = _club_id(kwargs)
+        if club_id is None or (digest := self._add(club_id)) is None:
+            return
+        digest.reviews[kwargs["user_id"]] = kwargs.get("rating")
+        self._added(club_id)
+
+    async def on_achievement(self, sender, **kwargs) -> bool:
+        """Returns True when the achievement goes into the digest."""
+        club_id = _club_id(kwargs)
+        if club_id is None or (digest := self._add(club_id)) is None:
+            return False
+        digest.achievements.append(kwargs["embed"].title)
+        self._added(club_id)
+        return True
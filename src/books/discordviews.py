@@ -1,4 +1,6 @@
 import discord
+from blinker import signal
+
 from ..result_types import Ok, Err
 
 
@@ -8,19 +10,70 @@ class BaseView(discord.ui.View):
 
     async def disable_buttons(self, interaction):
         for b in self.children:
-            if isinstance(b, discord.ui.Button):
+            if isinstance(b, (discord.ui.Button, discord.ui.Select)):
                 b.disabled = True
         await interaction.response.edit_message(view=self)
 
 
+def book_embed(book_info) -> discord.Embed:
+    embed = discord.Embed(
+        title=f"{book_info.title}",
+        description=f"by {book_info.author or 'Unknown'}\nYear: {book_info.year or 'N/A'}\nPages: {book_info.pages or 'N/A'}\nRating: {f'{book_info.rating:.2f}' if book_info.rating else 'N/A'}",
+        color=discord.Color.blue(),
+    )
+    if book_info.img_url:
+        embed.set_thumbnail(url=book_info.img_url)
+    return embed
+
+
+def book_details(book_info) -> str:
+    """Short metadata suffix for lists of books, empty when there is none."""
+    details = []
+    if book_info.year:
+        details.append(f"📅 {book_info.year}")
+    if book_info.pages:
+        details.append(f"📄 {book_info.pages} pages")
+    if book_info.rating:
+        details.append(f"⭐ {book_info.rating:.2f}")
+    return f" · {' · '.join(details)}" if details else ""
+
+
 class ApplyView(
     BaseView
 ):  # Create a class called MyView that subclasses discord.ui.View
-    def __init__(self, service, book_info, ctx):
+    """Preview search results, pick one and apply it to the club."""
+
+    def __init__(self, service, books, ctx):
         self.service = service
-        self.book_info = book_info
+        self.books = books
+        self.book_info = books[0]
         self.ctx = ctx
         super().__init__()
+        if len(books) > 1:
+            self.choose.options = [
+                discord.SelectOption(
+                    label=f"{book.title} ({book.year or 'N/A'})"[:100],
+                    description=f"by {book.author or 'Unknown'}"[:100],
+                    value=str(i),
+                    default=i == 0,
+                )
+                for i, book in enumerate(books)
+            ]
+        else:
+            self.remove_item(self.choose)
+
+    @discord.ui.select(placeholder="Not the right book? Pick another result")
+    async def choose(self, interaction, select):
+        if self.ctx.author != interaction.user:
+            return
+        # The results were fetched with the search, no new request needed.
+        index = int(select.values[0])
+        self.book_info = self.books[index]
+        for option in select.options:
+            option.default = option.value == select.values[0]
+        await interaction.response.edit_message(
+            embed=book_embed(self.book_info), view=self
+        )
 
     @discord.ui.button(
         label="Read this book", style=discord.ButtonStyle.primary, emoji="📖"
@@ -38,6 +91,7 @@ class ApplyView(
             self.book_info.img_url,
         ):
             case Ok(embed):
+                await signal("book").send_async(None, ctx=self.ctx)
                 await self.ctx.send(
                     embed=embed, view=RenameChannelView(self.ctx, self.book_info.title)
                 )
@@ -0,0 +1,223 @@
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Optional
+
+import discord
+from sqlalchemy import or_, select, update
+from sqlalchemy.orm import Session
+
+from ..apis.library import Book as BookInfo
+from .model import Book, SuggestedBook
+
+# Titles looked up per GraphQL request.
+BATCH_SIZE = 10
+# Requests in flight at once.
+CONCURRENCY = 3
+# Seconds between progress reports.
+REPORT_INTERVAL = 5
+# Failures kept for the progress report.
+MAX_ERRORS = 5
+# Placeholder title of clubs that have no book yet, nothing to look up.
+PLACEHOLDER_TITLE = "Update me"
+UNKNOWN_AUTHOR = "Unknown"
+
+METADATA_FIELDS = ("year", "pages", "rating", "img_url")
+
+
+@dataclass(frozen=True)
+class _Item:
+    model: type
+    id: int
+    query: str
+    # Fields that are empty, only these are filled in.
+    missing: tuple[str, ...]
+
+
+@dataclass
+class EnrichmentProgress:
+    total: int = 0
+    done: int = 0
+    updated: int = 0
+    not_found: int = 0
+    failed: int = 0
+    errors: list[str] = field(default_factory=list)
+    running: bool = False
+
+    def to_embed(self) -> discord.Embed:
+        if self.running:
+            title, color = "🔄 Enriching Books", discord.Color.blue()
+        else:
+            title, color = "📚 Book Enrichment Done", discord.Color.green()
+        embed = discord.Embed(title=title, color=color)
+        embed.add_field(name="Progress", value=f"{self.done}/{self.total}")
+        embed.add_field(name="Updated", value=str(self.updated))
+        embed.add_field(name="Not Found", value=str(self.not_found))
+        embed.add_field(name="Failed", value=str(self.failed))
+        if self.errors:
+            embed.add_field(
+                name="Errors", value="\n".join(self.errors)[:1024], inline=False
+            )
+        return embed
+
+
+def _query(title: str, author: Optional[str]) -> str:
+    if author and author != UNKNOWN_AUTHOR:
+        return f"{title} {author}"
+    return title
+
+
+def _changes(item: _Item, book: BookInfo) -> dict:
+    return {
+        name: value
+        for name in item.missing
+        if (value := getattr(book, name)) is not None
+    }
+
+
+class Enrichment:
+    """
+    Fills in missing metadata of club books and suggestions. Titles are looked
+    up in batches, several per request, and written back in bulk per batch.
+    """
+
+    def __init__(
+        self,
+        engine,
+        search_many: Callable[[list[str]], Awaitable[list[list[BookInfo]]]],
+        batch_size: int = BATCH_SIZE,
+        concurrency: int = CONCURRENCY,
+    ):
+        self.engine = engine
+        self.search_many = search_many
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.progress = EnrichmentProgress()
+        self._task: Optional[asyncio.Task] = None
+        # New suggestions waiting to be looked up.
+        self._suggestions: set[int] = set()
+        self._prefetch_task: Optional[asyncio.Task] = None
+
+    def incomplete(
+        self, models: tuple[type, ...] = (Book, SuggestedBook), ids=None
+    ) -> list[_Item]:
+        """Books and suggestions with a real title and missing metadata."""
+        items = []
+        with Session(self.engine) as session:
+            for model in models:
+                query = select(model).where(
+                    model.title != PLACEHOLDER_TITLE,
+                    or_(*(getattr(model, name).is_(None) for name in METADATA_FIELDS)),
+                )
+                if ids is not None:
+                    query = query.where(model.id.in_(ids))
+                rows = session.execute(query).scalars()
+                for row in rows:
+                    items.append(
+                        _Item(
+                            model=model,
+                            id=row.id,
+                            query=_query(row.title, row.author),
+                            missing=tuple(
+                                name
+                                for name in METADATA_FIELDS
+                                if getattr(row, name) is None
+                            ),
+                        )
+                    )
+        return items
+
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> bool:
+        """Start a run in the background, False if one is already running."""
+        if self.running():
+            return False
+        items = self.incomplete()
+        self.progress = EnrichmentProgress(total=len(items), running=True)
+        self._task = asyncio.create_task(self._run(items))
+        return True
+
+    async def run(self) -> EnrichmentProgress:
+        """Run to completion, joining the current run if there is one."""
+        self.start()
+        await asyncio.shield(self._task)
+        return self.progress
+
+    async def _run(self, items: list[_Item]) -> None:
+        logging.info("Enriching metadata of %d books", len(items))
+        semaphore = asyncio.Semaphore(self.concurrency)
+        batches = [
+            items[i : i + self.batch_size]
+            for i in range(0, len(items), self.batch_size)
+        ]
+        try:
+            await asyncio.gather(
+                *(self._batch(batch, semaphore, self.progress) for batch in batches)
+            )
+        finally:
+            self.progress.running = False
+        logging.info("Book enrichment done: %s", self.progress)
+
+    def prefetch(self, suggestion_id: int) -> None:
+        """
+        Look up the metadata of a new suggestion in the background. Suggestions
+        made while a lookup is pending share its request.
+        """
+        self._suggestions.add(suggestion_id)
+        if self._prefetch_task is None or self._prefetch_task.done():
+            self._prefetch_task = asyncio.create_task(self._prefetch())
+
+    async def _prefetch(self) -> None:
+        semaphore = asyncio.Semaphore(self.concurrency)
+        while self._suggestions:
+            ids, self._suggestions = self._suggestions, set()
+            items = self.incomplete((SuggestedBook,), ids)
+            for i in range(0, len(items), self.batch_size):
+                await self._batch(
+                    items[i : i + self.batch_size], semaphore, EnrichmentProgress()
+                )
+
+    async def _batch(
+        self,
+        items: list[_Item],
+        semaphore: asyncio.Semaphore,
+        progress: EnrichmentProgress,
+    ) -> None:
+        async with semaphore:
+            try:
+                results = await self.search_many([item.query for item in items])
+            except Exception as e:
+                logging.warning("Book enrichment batch failed: %r", e)
+                progress.failed += len(items)
+                progress.done += len(items)
+                if len(progress.errors) < MAX_ERRORS:
+                    progress.errors.append(
+                        f"{items[0].query} (+{len(items) - 1}): {e!r}"[:200]
+                    )
+                return
+        updates: dict[type, list[dict]] = {}
+        for item, books in zip(items, results):
+            changes = _changes(item, books[0]) if books else {}
+            if changes:
+                updates.setdefault(item.model, []).append({"id": item.id, **changes})
+                progress.updated += 1
+            else:
+                progress.not_found += 1
+        self._write(updates)
+        progress.done += len(items)
+
+    def _write(self, updates: dict[type, list[dict]]) -> None:
+        if not updates:
+            return
+        with Session(self.engine) as session:
+            for model, rows in updates.items():
+                # Rows have different columns, so one executemany per model
+                # and set of columns.
+                by_columns: dict[tuple, list[dict]] = {}
+                for row in rows:
+                    by_columns.setdefault(tuple(sorted(row)), []).append(row)
+                for group in by_columns.values():
+                    session.execute(update(model), group)
+            session.commit()
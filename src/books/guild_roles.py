@@ -0,0 +1,52 @@
+import asyncio
+import logging
+from typing import Iterable
+
+import discord
+
+# Guilds provisioned at the same time during startup reconciliation.
+PROVISION_CONCURRENCY = 5
+
+
+class GuildRoles:
+    """
+    Reader roles per guild. Creates missing roles and caches the name -> role
+    mapping until a role in the guild changes.
+    """
+
+    def __init__(self, names: set[str], concurrency: int = PROVISION_CONCURRENCY):
+        self.names = names
+        self.concurrency = concurrency
+        self._roles: dict[int, dict[str, discord.Role]] = {}
+
+    def get(self, guild: discord.Guild) -> dict[str, discord.Role]:
+        """Mapping from role name to guild role."""
+        roles = self._roles.get(guild.id)
+        if roles is None:
+            roles = {role.name: role for role in guild.roles if role.name in self.names}
+            self._roles[guild.id] = roles
+        return roles
+
+    def invalidate(self, guild_id: int) -> None:
+        self._roles.pop(guild_id, None)
+
+    async def provision(self, guild: discord.Guild) -> None:
+        """Create the reader roles missing in the guild."""
+        for name in sorted(self.names - self.get(guild).keys()):
+            await guild.create_role(name=name, hoist=True, color=discord.Color.random())
+        self.invalidate(guild.id)
+
+    async def reconcile(self, guilds: Iterable[discord.Guild]) -> None:
+        """Provision all guilds, a bounded number at a time."""
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def provision(guild: discord.Guild) -> None:
+            async with semaphore:
+                try:
+                    await self.provision(guild)
+                except Exception:
+                    logging.exception("Failed to provision roles in guild %s", guild.id)
+
+        guilds = list(guilds)
+        await asyncio.gather(*(provision(guild) for guild in guilds))
+        logging.info("Reconciled reader roles in %d guilds.", len(guilds))
@@ -103,6 +103,12 @@ class BookClub(Base):
     state: Mapped[BookState] = mapped_column(
         Enum(BookState), nullable=False, default=BookState.PLANNED
     )
+    # Pinned status message kept up to date by the bot, if enabled.
+    status_message_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    # Digest mode: post one summary per interval (seconds) instead of a
+    # message per event. Disabled when the interval is NULL.
+    digest_interval: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    digest_max_events: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
 
     # Optionally add fields like meeting_date, etc.
     book: Mapped["Book"] = relationship("Book", back_populates="book_club")
@@ -189,6 +195,11 @@ class SuggestedBook(Base):
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     title: Mapped[str] = mapped_column(String, nullable=False)
     author: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    # Metadata looked up on Hardcover, copied to the club book when picked.
+    year: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    rating: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    pages: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    img_url: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     suggester_id: Mapped[int] = mapped_column(
         Integer, ForeignKey("user.id"), nullable=False
     )
@@ -0,0 +1,116 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload
+
+from .model import (
+    Book,
+    BookClub,
+    BookClubReader,
+    BookClubReaderRole,
+    BookClubReaderState,
+    BookState,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class BookSnapshot:
+    title: str
+    author: Optional[str]
+    year: Optional[int]
+    pages: Optional[int]
+    rating: Optional[float]
+    img_url: Optional[str]
+
+    @classmethod
+    def from_book(cls, book: Book) -> "BookSnapshot":
+        return cls(
+            title=book.title,
+            author=book.author,
+            year=book.year,
+            pages=book.pages,
+            rating=book.rating,
+            img_url=book.img_url,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class ReaderSnapshot:
+    user_id: int
+    name: str
+    state: BookClubReaderState
+    role: BookClubReaderRole
+    progress: Optional[str]
+
+    @property
+    def behind(self) -> bool:
+        """Has not caught up to the target yet."""
+        return self.state not in (
+            BookClubReaderState.CAUGHT_UP,
+            BookClubReaderState.COMPLETED,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class ClubSnapshot:
+    id: int
+    state: BookState
+    target: Optional[str]
+    book: Optional[BookSnapshot]
+    readers: tuple[ReaderSnapshot, ...]
+
+    def behind(self) -> list[ReaderSnapshot]:
+        return [reader for reader in self.readers if reader.behind]
+
+
+class ReadModel:
+    """
+    Loads clubs as plain snapshots in a short session. The snapshots are
+    detached from the database, so they can be used across slow awaits
+    without keeping a session or transaction open.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    def club(self, book_club_id: int) -> Optional[ClubSnapshot]:
+        return next(iter(self.clubs([book_club_id])), None)
+
+    def clubs(self, book_club_ids) -> list[ClubSnapshot]:
+        """Snapshots of the clubs that exist among the ids, in one query."""
+        with Session(self.engine) as session:
+            clubs = session.scalars(
+                select(BookClub)
+                .where(BookClub.id.in_(list(book_club_ids)))
+                .options(
+                    selectinload(BookClub.book),
+                    selectinload(BookClub.readers).selectinload(BookClubReader.user),
+                )
+            ).all()
+            return [
+                ClubSnapshot(
+                    id=club.id,
+                    state=club.state,
+                    target=club.target,
+                    book=BookSnapshot.from_book(club.book) if club.book else None,
+                    readers=tuple(
+                        ReaderSnapshot(
+                            user_id=reader.user_id,
+                            name=reader.user.name,
+                            state=reader.state,
+                            role=reader.role,
+                            progress=reader.progress,
+                        )
+                        for reader in club.readers
+                    ),
+                )
+                for club in clubs
+            ]
+
+    def book(self, book_club_id: int) -> Optional[BookSnapshot]:
+        with Session(self.engine) as session:
+            book = session.scalar(
+                select(Book).join(BookClub).where(BookClub.id == book_club_id)
+            )
+            return BookSnapshot.from_book(book) if book else None
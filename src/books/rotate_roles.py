@@ -2,6 +2,7 @@ import discord
 from sqlalchemy.orm import Session
 from ..result_types import Ok, Err, Result
 from .model import BookClub
+from .service import club_with_readers
 
 
 def rotate_roles(engine, book_club_id: int) -> Result[discord.Embed]:
@@ -9,7 +10,7 @@ def rotate_roles(engine, book_club_id: int) -> Result[discord.Embed]:
     Rotate roles among all readers in the book club: each reader gets the next reader's role (cyclic).
     """
     with Session(engine) as session:
-        club = session.get(BookClub, book_club_id)
+        club = session.get(BookClub, book_club_id, options=club_with_readers())
         if not club:
             return Err("Book club not found.")
         readers = [r for r in club.readers]
@@ -21,7 +22,6 @@ def rotate_roles(engine, book_club_id: int) -> Result[discord.Embed]:
         rotated_roles = roles[-1:] + roles[:-1]
         for reader, new_role in zip(readers, rotated_roles):
             reader.role = new_role
-        session.commit()
         embed = discord.Embed(
             title="Roles Rotated",
             description="Each reader has received the next reader's role.",
@@ -33,4 +33,6 @@ def rotate_roles(engine, book_club_id: int) -> Result[discord.Embed]:
                 value=f"{role.emoji} {role.value}",
                 inline=True,
             )
+        # After the embed, committing expires the readers.
+        session.commit()
         return Ok(embed)
@@ -2,12 +2,13 @@ import logging
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from functools import wraps
-from typing import Optional
+from typing import Callable, Optional
 
 import discord
 from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 
+from .. import metrics
 from ..result_types import Err, Ok, Result
 from .model import (
     Book,
@@ -22,6 +23,8 @@ from .model import (
     SuggestedBook,
     User,
 )
+from .digest import DigestSettings
+from .status import ClubStatus
 
 
 def try_except_result(func):
@@ -31,6 +34,7 @@ def try_except_result(func):
             return func(*args, **kwargs)
         except Exception:
             logging.exception("An error occurred in BookCircleService")
+            metrics.error("service")
             return Err("An error occurred")
 
     return wrapper
@@ -43,6 +47,23 @@ class ServiceBook:
     suggester_id: int
     suggested_at: datetime
     author: Optional[str] = None
+    year: Optional[int] = None
+    pages: Optional[int] = None
+    rating: Optional[float] = None
+    img_url: Optional[str] = None
+
+
+def club_with_readers(*relationships):
+    """
+    Options loading a club's book and readers with their users, plus the
+    given reader relationships, each in one query for all readers.
+    """
+    readers = selectinload(BookClub.readers)
+    return [
+        selectinload(BookClub.book),
+        readers.selectinload(BookClubReader.user),
+        *(readers.selectinload(relationship) for relationship in relationships),
+    ]
 
 
 # Put this in a utility function.
@@ -111,8 +132,13 @@ class BookCircleService:
 
     @try_except_result
     def suggest_book(
-        self, suggester_id: int, title: str, author: Optional[str] = None
+        self,
+        suggester_id: int,
+        title: str,
+        author: Optional[str] = None,
+        prefetch: Optional[Callable[[int], None]] = None,
     ) -> Result[discord.Embed]:
+        """`prefetch` is called with the id of the new suggestion, to look up its metadata."""
         with Session(self.engine) as session:
             user = session.get(User, suggester_id)
             if not user:
@@ -122,6 +148,8 @@ class BookCircleService:
             )
             session.add(suggestion)
             session.commit()
+            if prefetch is not None:
+                prefetch(suggestion.id)
             embed = discord.Embed(
                 title="📚 Book Suggested",
                 description=f"'{title}' by {author or 'Unknown'} has been suggested by {user.name}.",
@@ -143,6 +171,10 @@ class BookCircleService:
                         author=s.author,
                         suggester_id=s.suggester_id,
                         suggested_at=s.created_at,
+                        year=s.year,
+                        pages=s.pages,
+                        rating=s.rating,
+                        img_url=s.img_url,
                     )
                     for s in suggestions
                 ]
@@ -174,8 +206,14 @@ class BookCircleService:
             if not suggestion:
                 return Err("Suggestion not found.")
             if club:
+                # Metadata was looked up when the book was suggested, the
+                # old book's is replaced even where it is missing.
                 club.book.title = suggestion.title
                 club.book.author = suggestion.author
+                club.book.year = suggestion.year
+                club.book.pages = suggestion.pages
+                club.book.rating = suggestion.rating
+                club.book.img_url = suggestion.img_url
             session.delete(suggestion)
             session.commit()
             if club:
@@ -187,7 +225,7 @@ class BookCircleService:
         import random
 
         with Session(self.engine) as session:
-            club = session.get(BookClub, book_club_id)
+            club = session.get(BookClub, book_club_id, options=club_with_readers())
             if not club:
                 return Err("Book club not found.")
             readers = [r for r in club.readers]
@@ -205,7 +243,6 @@ class BookCircleService:
             random.shuffle(roles)
             for reader, role in zip(readers, roles):
                 reader.role = role
-            session.commit()
 
             embed = discord.Embed(
                 title="🔀 Roles Shuffled",
@@ -218,12 +255,14 @@ class BookCircleService:
                     value=f"{role.emoji} {role.value}",
                     inline=True,
                 )
+            # After the embed, committing expires the readers.
+            session.commit()
             return Ok(embed)
 
     @try_except_result
     def list_roles(self, book_club_id: int) -> Result[discord.Embed]:
         with Session(self.engine) as session:
-            club = session.get(BookClub, book_club_id)
+            club = session.get(BookClub, book_club_id, options=club_with_readers())
             if not club:
                 return Err("This channel does not have a registered book club.")
             if not club.readers:
@@ -266,6 +305,7 @@ class BookCircleService:
                     select(BookClub)
                     .join(BookClubReader)
                     .where(BookClubReader.user_id == db_user.id)
+                    .options(selectinload(BookClub.book))
                 )
                 .scalars()
                 .all()
@@ -293,7 +333,11 @@ class BookCircleService:
     @try_except_result
     def get_reviews(self, book_club_id: int) -> Result[discord.Embed]:
         with Session(self.engine) as session:
-            club = session.get(BookClub, book_club_id)
+            club = session.get(
+                BookClub,
+                book_club_id,
+                options=club_with_readers(BookClubReader.reviews),
+            )
             if not club:
                 return Err("Book club not found.")
             reviews = []
@@ -323,7 +367,11 @@ class BookCircleService:
     @try_except_result
     def get_notes(self, book_club_id: int) -> Result[discord.Embed]:
         with Session(self.engine) as session:
-            club = session.get(BookClub, book_club_id)
+            club = session.get(
+                BookClub,
+                book_club_id,
+                options=club_with_readers(BookClubReader.notes),
+            )
             if not club:
                 return Err("Book club not found.")
             notes = []
@@ -346,7 +394,11 @@ class BookCircleService:
     @try_except_result
     def get_quotes(self, book_club_id: int) -> Result[discord.Embed]:
         with Session(self.engine) as session:
-            club = session.get(BookClub, book_club_id)
+            club = session.get(
+                BookClub,
+                book_club_id,
+                options=club_with_readers(BookClubReader.quotes),
+            )
             if not club:
                 return Err("Book club not found.")
             quotes = []
@@ -673,60 +725,65 @@ class BookCircleService:
             )
             return Ok(embed)
 
+    @try_except_result
+    def get_club_status(self, book_club_id: int) -> Result[ClubStatus]:
+        with Session(self.engine) as session:
+            club = session.get(
+                BookClub,
+                book_club_id,
+                options=club_with_readers(
+                    BookClubReader.reviews, BookClubReader.quotes, BookClubReader.notes
+                ),
+            )
+            if not club:
+                return Err("Book club not found.")
+            return Ok(ClubStatus.from_club(club))
+
     @try_except_result
     def get_status(self, book_club_id: int) -> Result[discord.Embed]:
+        match r := self.get_club_status(book_club_id):
+            case Ok(status):
+                return Ok(status.to_embed())
+        return r
+
+    @try_except_result
+    def get_digest_settings(
+        self, book_club_id: int
+    ) -> Result[Optional[DigestSettings]]:
         with Session(self.engine) as session:
             club = session.get(BookClub, book_club_id)
             if not club:
-                return Err("Book club not found.")
-            # Aggregate reviews, quotes, notes from all BookClubReader objects
-            total_reviews = sum(len(reader.reviews) for reader in club.readers)
-            total_quotes = sum(len(reader.quotes) for reader in club.readers)
-            total_notes = sum(len(reader.notes) for reader in club.readers)
-            readers_list = (
-                ", ".join(reader.user.name for reader in club.readers)
-                if club.readers
-                else "No readers yet"
-            )
-            ratings = [
-                review.rating if review.rating else 0
-                for reader in club.readers
-                for review in reader.reviews
-            ]
-            discord_average_ratings = None
-            if ratings:
-                discord_average_ratings = sum(ratings) / len(ratings)
-            embed = discord.Embed(title=club.book.title)
-            embed.add_field(
-                name="Book Info",
-                value=(
-                    f"✍️ Author: {club.book.author or 'Unknown'}\n"
-                    f"📅 Year: {club.book.year if club.book.year is not None else 'N/A'}\n"
-                    f"📄 Pages: {club.book.pages if club.book.pages is not None else 'N/A'}\n"
-                    f"⭐ Rating (Hardcover): {f'{club.book.rating:.2f}' if club.book.rating else 'N/A'}\n"
-                    f"⭐ Rating (Discord): {f'{discord_average_ratings:.2f}' if discord_average_ratings else 'N/A'}"
-                ),
-                inline=False,
-            )
-            if club.book.img_url:
-                embed.set_image(url=club.book.img_url)
-            embed.add_field(name="State", value=f"📖 {club.state.value}", inline=False)
-            embed.add_field(
-                name="Target", value=f"🎯 {club.target or 'N/A'}", inline=False
-            )
-            embed.add_field(name="Readers", value=f"🙋 {readers_list}", inline=False)
-            embed.add_field(name="Reviews", value=f"⭐ {total_reviews}", inline=True)
-            embed.add_field(name="Quotes", value=f"💬 {total_quotes}", inline=True)
-            embed.add_field(name="Notes", value=f"🗒️ {total_notes}", inline=True)
-            # Add per-user progress
-            progress_lines = []
-            for reader in club.readers:
-                progress = getattr(reader, "progress", None)
-                progress_lines.append(
-                    f"{reader.user.name}: {progress or 'No progress set'}"
-                )
-            if progress_lines:
-                embed.add_field(
-                    name="Progress", value="\n".join(progress_lines), inline=False
+                return Ok(None)
+            if club.digest_interval is None:
+                return Ok(None)
+            return Ok(
+                DigestSettings(
+                    interval=club.digest_interval,
+                    max_events=club.digest_max_events or DigestSettings.max_events,
                 )
-            return Ok(embed)
+            )
+
+    @try_except_result
+    def set_digest_settings(
+        self, book_club_id: int, settings: Optional[DigestSettings]
+    ) -> Result[None]:
+        with Session(self.engine) as session:
+            club = session.get(BookClub, book_club_id)
+            if not club:
+                return Err("Book club not found.")
+            club.digest_interval = settings.interval if settings else None
+            club.digest_max_events = settings.max_events if settings else None
+            session.commit()
+            return Ok(None)
+
+    @try_except_result
+    def set_status_message(
+        self, book_club_id: int, message_id: Optional[int]
+    ) -> Result[None]:
+        with Session(self.engine) as session:
+            club = session.get(BookClub, book_club_id)
+            if not club:
+                return Err("Book club not found.")
+            club.status_message_id = message_id
+            session.commit()
+            return Ok(None)
@@ -0,0 +1,333 @@
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+import discord
+from blinker import signal
+
+from ..result_types import Err, Ok, Result
+from .model import BookClub, BookClubReaderState, BookState
+
+# Seconds to wait before editing a pinned status message, so that a burst of
+# updates ends up in a single edit.
+STATUS_EDIT_DELAY = 5
+
+
+@dataclass
+class ReaderStatus:
+    name: str
+    progress: Optional[str] = None
+    state: BookClubReaderState = BookClubReaderState.READING
+    # One rating (0 when missing) per review.
+    ratings: list[int] = field(default_factory=list)
+    quotes: int = 0
+    notes: int = 0
+
+
+@dataclass
+class ClubStatus:
+    """Everything shown by `!info`, kept in memory and updated in place."""
+
+    title: str
+    author: Optional[str]
+    year: Optional[int]
+    pages: Optional[int]
+    rating: Optional[float]
+    img_url: Optional[str]
+    state: BookState
+    target: Optional[str]
+    readers: dict[int, ReaderStatus]
+    status_message_id: Optional[int] = None
+
+    @classmethod
+    def from_club(cls, club: BookClub) -> "ClubStatus":
+        book = club.book
+        return cls(
+            title=book.title,
+            author=book.author,
+            year=book.year,
+            pages=book.pages,
+            rating=book.rating,
+            img_url=book.img_url,
+            state=club.state,
+            target=club.target,
+            readers={
+                reader.user_id: ReaderStatus(
+                    name=reader.user.name,
+                    progress=reader.progress,
+                    state=reader.state,
+                    ratings=[review.rating or 0 for review in reader.reviews],
+                    quotes=len(reader.quotes),
+                    notes=len(reader.notes),
+                )
+                for reader in club.readers
+            },
+            status_message_id=club.status_message_id,
+        )
+
+    def set_progress(self, user_id: int, progress: str) -> None:
+        if reader := self.readers.get(user_id):
+            reader.progress = progress
+
+    def caught_up(self, user_id: int) -> None:
+        if reader := self.readers.get(user_id):
+            reader.state = BookClubReaderState.CAUGHT_UP
+            reader.progress = self.target
+
+    def set_target(self, target: str, state: BookState) -> None:
+        # Mirrors BookCircleService.set_target.
+        self.state = state
+        if self.target != target:
+            self.target = target
+            for reader in self.readers.values():
+                reader.state = BookClubReaderState.READING
+        if state == BookState.COMPLETED:
+            for reader in self.readers.values():
+                reader.state = BookClubReaderState.COMPLETED
+
+    def join(self, user_id: int, name: str) -> None:
+        self.readers.setdefault(user_id, ReaderStatus(name=name))
+
+    def leave(self, user_id: int) -> None:
+        self.readers.pop(user_id, None)
+
+    def add_note(self, user_id: int) -> None:
+        if reader := self.readers.get(user_id):
+            reader.notes += 1
+
+    def add_quote(self, user_id: int) -> None:
+        if reader := self.readers.get(user_id):
+            reader.quotes += 1
+
+    def set_review(self, user_id: int, rating: Optional[int]) -> None:
+        # A reader has a single review, adding one replaces it.
+        if reader := self.readers.get(user_id):
+            reader.ratings = [rating or 0]
+
+    def to_embed(self) -> discord.Embed:
+        readers = list(self.readers.values())
+        total_reviews = sum(len(reader.ratings) for reader in readers)
+        total_quotes = sum(reader.quotes for reader in readers)
+        total_notes = sum(reader.notes for reader in readers)
+        readers_list = (
+            ", ".join(reader.name for reader in readers)
+            if readers
+            else "No readers yet"
+        )
+        ratings = [rating for reader in readers for rating in reader.ratings]
+        discord_average_ratings = None
+        if ratings:
+            discord_average_ratings = sum(ratings) / len(ratings)
+        embed = discord.Embed(title=self.title)
+        embed.add_field(
+            name="Book Info",
+            value=(
+                f"✍️ Author: {self.author or 'Unknown'}\n"
+                f"📅 Year: {self.year if self.year is not None else 'N/A'}\n"
+                f"📄 Pages: {self.pages if self.pages is not None else 'N/A'}\n"
+                f"⭐ Rating (Hardcover): {f'{self.rating:.2f}' if self.rating else 'N/A'}\n"
+                f"⭐ Rating (Discord): {f'{discord_average_ratings:.2f}' if discord_average_ratings else 'N/A'}"
+            ),
+            inline=False,
+        )
+        if self.img_url:
+            embed.set_image(url=self.img_url)
+        embed.add_field(name="State", value=f"📖 {self.state.value}", inline=False)
+        embed.add_field(name="Target", value=f"🎯 {self.target or 'N/A'}", inline=False)
+        embed.add_field(name="Readers", value=f"🙋 {readers_list}", inline=False)
+        embed.add_field(name="Reviews", value=f"⭐ {total_reviews}", inline=True)
+        embed.add_field(name="Quotes", value=f"💬 {total_quotes}", inline=True)
+        embed.add_field(name="Notes", value=f"🗒️ {total_notes}", inline=True)
+        # Add per-user progress
+        progress_lines = [
+            f"{reader.name}: {reader.progress or 'No progress set'}"
+            for reader in readers
+        ]
+        if progress_lines:
+            embed.add_field(
+                name="Progress", value="\n".join(progress_lines), inline=False
+            )
+        return embed
+
+
+def _club_id(kwargs) -> Optional[int]:
+    if (book_club_id := kwargs.get("book_club_id")) is not None:
+        return book_club_id
+    ctx = kwargs.get("ctx")
+    return ctx.channel.id if ctx is not None else None
+
+
+class StatusBoard:
+    """
+    Keeps the opt-in pinned status message of each club up to date. The club
+    state is loaded once and then updated from the book signals.
+    """
+
+    def __init__(self, bot, service):
+        self.bot = bot
+        self.service = service
+        # None for clubs without a pinned status message.
+        self.clubs: dict[int, Optional[ClubStatus]] = {}
+        self._pending: dict[int, asyncio.Task] = {}
+        receivers = {
+            "read": self.on_read,
+            "caught_up": self.on_caught_up,
+            "notes": self.on_note,
+            "quotes": self.on_quote,
+            "reviews": self.on_review,
+            "target": self.on_target,
+            "books_finished": self.on_books_finished,
+            "membership": self.on_membership,
+            "book": self.on_book,
+        }
+        for name, receiver in receivers.items():
+            signal(name).connect(receiver)
+
+    async def enable(self, channel: discord.TextChannel) -> Result[discord.Embed]:
+        match r := self.service.get_club_status(channel.id):
+            case Ok(status):
+                if status.status_message_id is not None:
+                    return Err("This book club already has a pinned status message.")
+                message = await channel.send(embed=status.to_embed())
+                await message.pin()
+                match r := self.service.set_status_message(channel.id, message.id):
+                    case Ok():
+                        status.status_message_id = message.id
+                        self.clubs[channel.id] = status
+                        return Ok(
+                            discord.Embed(
+                                title="📌 Status Pinned",
+                                description="The pinned status message will be kept up to date.",
+                                color=discord.Color.green(),
+                            )
+                        )
+        return r
+
+    async def disable(self, channel: discord.TextChannel) -> Result[discord.Embed]:
+        match r := self.service.get_club_status(channel.id):
+            case Ok(status):
+                if status.status_message_id is None:
+                    return Err("This book club has no pinned status message.")
+                match r := self.service.set_status_message(channel.id, None):
+                    case Ok():
+                        self.clubs[channel.id] = None
+                        try:
+                            await channel.get_partial_message(
+                                status.status_message_id
+                            ).unpin()
+                        except discord.HTTPException:
+                            logging.warning(
+                                "Could not unpin status message in %s", channel.id
+                            )
+                        return Ok(
+                            discord.Embed(
+                                title="📌 Status Unpinned",
+                                description="The status message will no longer be updated.",
+                                color=discord.Color.orange(),
+                            )
+                        )
+        return r
+
+    def update(self, club_id: int, change: Callable[[ClubStatus], None]) -> None:
+        """Apply a change to a club with a pinned status and schedule an edit."""
+        if club_id in self.clubs:
+            status = self.clubs[club_id]
+            if status is None:
+                return
+            change(status)
+        elif self._load(club_id) is None:
+            return
+        self._schedule(club_id)
+
+    def reload(self, club_id: int) -> None:
+        self.clubs.pop(club_id, None)
+        self.update(club_id, lambda status: None)
+
+    def _load(self, club_id: int) -> Optional[ClubStatus]:
+        # Loaded after the change was committed, so it is already included.
+        match self.service.get_club_status(club_id):
+            case Ok(status):
+                if status.status_message_id is None:
+                    status = None
+                self.clubs[club_id] = status
+                return status
+        return None
+
+    def _schedule(self, club_id: int) -> None:
+        task = self._pending.get(club_id)
+        if task is None or task.done():
+            self._pending[club_id] = asyncio.create_task(self._edit_later(club_id))
+
+    async def _edit_later(self, club_id: int) -> None:
+        await asyncio.sleep(STATUS_EDIT_DELAY)
+        self._pending.pop(club_id, None)
+        await self._edit(club_id)
+
+    async def _edit(self, club_id: int) -> None:
+        status = self.clubs.get(club_id)
+        channel = self.bot.get_channel(club_id)
+        if status is None or status.status_message_id is None or channel is None:
+            return
+        try:
+            await channel.get_partial_message(status.status_message_id).edit(
+                embed=status.to_embed()
+            )
+        except discord.NotFound:
+            logging.info("Status message in %s was deleted, disabling it.", club_id)
+            self.clubs[club_id] = None
+            self.service.set_status_message(club_id, None)
+        except Exception:
+            logging.exception("Failed to edit status message in %s", club_id)
+
+    def close(self) -> None:
+        for task in self._pending.values():
+            task.cancel()
+        self._pending.clear()
+
+    async def on_read(self, sender, **kwargs):
+        if (club_id := _club_id(kwargs)) is None or "progress" not in kwargs:
+            return
+        self.update(
+            club_id, lambda s: s.set_progress(kwargs["user_id"], kwargs["progress"])
+        )
+
+    async def on_caught_up(self, sender, **kwargs):
+        if (club_id := _club_id(kwargs)) is not None:
+            self.update(club_id, lambda s: s.caught_up(kwargs["user_id"]))
+
+    async def on_note(self, sender, **kwargs):
+        if (club_id := _club_id(kwargs)) is not None:
+            self.update(club_id, lambda s: s.add_note(kwargs["user_id"]))
+
+    async def on_quote(self, sender, **kwargs):
+        if (club_id := _club_id(kwargs)) is not None:
+            self.update(club_id, lambda s: s.add_quote(kwargs["user_id"]))
+
+    async def on_review(self, sender, **kwargs):
+        if (club_id := _club_id(kwargs)) is not None:
+            self.update(
+                club_id, lambda s: s.set_review(kwargs["user_id"], kwargs.get("rating"))
+            )
+
+    async def on_target(self, sender, **kwargs):
+        if (club_id := _club_id(kwargs)) is not None:
+            self.update(
+                club_id, lambda s: s.set_target(kwargs["target"], kwargs["state"])
+            )
+
+    async def on_books_finished(self, sender, **kwargs):
+        if (club_id := _club_id(kwargs)) is not None:
+            self.update(club_id, lambda s: s.set_target("Done", BookState.COMPLETED))
+
+    async def on_membership(self, sender, **kwargs):
+        if (club_id := _club_id(kwargs)) is None:
+            return
+        if kwargs.get("joined"):
+            self.update(club_id, lambda s: s.join(kwargs["user_id"], kwargs["name"]))
+        else:
+            self.update(club_id, lambda s: s.leave(kwargs["user_id"]))
+
+    async def on_book(self, sender, **kwargs):
+        if (club_id := _club_id(kwargs)) is not None:
+            self.reload(club_id)
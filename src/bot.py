@@ -1,11 +1,16 @@
+import logging
+from typing import Iterable, Optional
+
 import discord
 
 from discord.ext import commands
 from sqlalchemy import create_engine
-from . import models
-from .books.cog import BookCircle
-from .achievements.cog import Achievements
-from .genai.cog import GenAI
+from . import logs, schema
+from .apis.provider import MetadataProvider
+from .config import Config
+from .gateway import GatewayProfile
+from .metrics import Metrics, Stats
+from .sharding import Shards
 
 
 from sqlalchemy.event import listens_for
@@ -21,6 +26,19 @@ def set_sqlite_pragma(dbapi_connection, connection_record):
     cursor.close()
 
 
+DATABASE_URL = "sqlite:///app.db"
+
+# Modules of the Cogs that can be turned off with BOKCIRKEL_COGS, by name.
+# They are imported by load_extension, only when enabled.
+EXTENSIONS = {
+    "books": ".books.cog",
+    "achievements": ".achievements.cog",
+    "genai": ".genai.cog",
+    "watchdog": ".watchdog",
+    "profiling": ".profiling",
+}
+
+
 class Help(commands.Cog):
     @commands.command()
     async def help(self, ctx: commands.Context) -> None:
@@ -41,7 +59,7 @@ class Help(commands.Cog):
         )
         embed.add_field(
             name="Notes and Quotes",
-            value="Take notes on your reading and share quotes with `!note` and `!quote` commands. Read notes and quotes with `!notes` and `!quotes`.",
+            value="Take notes on your reading and share quotes with `!note` and `!quote` commands. Read notes and quotes with `!notes` and `!quotes`, or get a summary with `!summary`.",
             inline=False,
         )
         embed.add_field(
@@ -66,30 +84,52 @@ class Help(commands.Cog):
         ):
             embed.add_field(
                 name="Admin Commands",
-                value="- !shuffleroles: Shuffle member roles randomly.\n- !add @user: Add a new member to the book club.\n- !kick @user: Remove a member from the book club.",
+                value="- !shuffleroles: Shuffle member roles randomly.\n- !add @user: Add a new member to the book club.\n- !kick @user: Remove a member from the book club.\n- !pinstatus: Pin a status message that updates itself.\n- !digest <minutes|off>: Summarize club activity periodically.\n- !enrich: Look up missing book and suggestion metadata.\n- !genaistats: Show GenAI latency, token usage and errors.\n- !stats: Show latency, queries and errors per command.\n- !profile <seconds> [sample|cprofile] [--stacks]: Profile the bot for a while.\n- !memprofile <seconds>: Show the largest allocation sites and their growth.",
                 inline=False,
             )
         await ctx.send(embed=embed)
 
 
-class Bot(commands.Bot):
+class _BookCircleBot:
     """
-    Custom Bot class for Book Circle, attaches the database and loads the Cog.
+    Shared setup for the Book Circle bots, attaches the database and loads the Cogs.
+    The extensions read `engine`, `metadata`, `metrics` and `metrics_port` from it.
     """
 
-    def __init__(self, intents: discord.Intents) -> None:
-        engine = create_engine("sqlite:///app.db", echo=False)
-        models.Base.metadata.create_all(engine)
-        self._cogs = [
-            Help(),
-            BookCircle(self, engine),
-            Achievements(self, engine),
-            GenAI(self, engine),
-        ]
-        super().__init__(command_prefix="!", intents=intents)
+    def __init__(
+        self,
+        intents: discord.Intents,
+        metadata: Optional[MetadataProvider] = None,
+        metrics_port: Optional[int] = None,
+        cogs: Iterable[str] = Config.cogs,
+        **options,
+    ) -> None:
+        self.enabled_cogs = tuple(cogs)
+        if unknown := set(self.enabled_cogs) - EXTENSIONS.keys():
+            raise ValueError(
+                f"Unknown cogs {', '.join(sorted(unknown))}, "
+                f"choose from {', '.join(EXTENSIONS)}"
+            )
+        self.engine = create_engine(DATABASE_URL, echo=False)
+        schema.check(self.engine)
+        self.metadata = metadata
+        self.metrics = Metrics()
+        self.metrics.instrument_engine(self.engine)
+        self.metrics_port = metrics_port
+        super().__init__(command_prefix="!", intents=intents, **options)
         self.remove_command("help")
 
+    async def invoke(self, ctx: commands.Context) -> None:
+        if ctx.command is None:
+            return await super().invoke(ctx)
+        name = ctx.command.qualified_name
+        guild = ctx.guild.id if ctx.guild else None
+        with logs.context(command=name, guild=guild), self.metrics.command(name):
+            await super().invoke(ctx)
+
     async def on_command_error(self, ctx: commands.Context, error: Exception) -> None:
+        if ctx.command is not None:
+            self.metrics.count_error(ctx.command.qualified_name, type(error).__name__)
         if isinstance(error, commands.CommandNotFound):
             await ctx.send(
                 embed=discord.Embed(
@@ -98,7 +138,45 @@ class Bot(commands.Bot):
                     color=discord.Color.red(),
                 )
             )
+        elif isinstance(error, commands.CommandInvokeError):
+            logging.error(
+                "Error in command %s",
+                ctx.command.qualified_name if ctx.command else None,
+                exc_info=error.original,
+            )
+        else:
+            # Bad arguments, missing permissions and the like.
+            logging.info("Command %s failed: %s", ctx.message.content, error)
 
     async def setup_hook(self) -> None:
-        for cog in self._cogs:
+        self.metrics.instrument_http(self.http)
+        for cog in [Help(), Shards(self), Stats(self.metrics, self.metrics_port)]:
             await self.add_cog(cog)
+        for name in self.enabled_cogs:
+            await self.load_extension(EXTENSIONS[name], package=__package__)
+        for cog in self.cogs.values():
+            if hasattr(cog, "samples"):
+                self.metrics.register(cog.samples)
+
+
+class Bot(_BookCircleBot, commands.Bot):
+    """Book Circle bot on a single gateway connection."""
+
+
+class ShardedBot(_BookCircleBot, commands.AutoShardedBot):
+    """Book Circle bot running several shards in this process."""
+
+
+def create_bot(
+    config: Config,
+    profile: GatewayProfile,
+    metadata: Optional[MetadataProvider] = None,
+) -> commands.Bot:
+    options = profile.client_options()
+    options["metadata"] = metadata
+    options["metrics_port"] = config.metrics_port
+    options["cogs"] = config.cogs
+    if not config.sharded:
+        return Bot(**options)
+    shard_ids = list(config.shard_ids) if config.shard_ids else None
+    return ShardedBot(shard_count=config.shard_count, shard_ids=shard_ids, **options)
@@ -0,0 +1,69 @@
+"""Runtime settings, read from ``BOKCIRKEL_*`` environment variables."""
+
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+
+def _env(name: str, default: str) -> str:
+    return os.environ.get(f"BOKCIRKEL_{name}", default)
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    return _env(name, str(default)).strip().lower() in ("1", "true", "yes", "on")
+
+
+def _env_int(name: str, default: Optional[int]) -> Optional[int]:
+    value = _env(name, "").strip()
+    return int(value) if value else default
+
+
+def parse_names(value: str) -> Optional[tuple[str, ...]]:
+    """Parse a list like ``"books, genai"``."""
+    return tuple(filter(None, (p.strip() for p in value.split(",")))) or None
+
+
+def parse_shard_ids(value: str) -> Optional[tuple[int, ...]]:
+    """Parse shard IDs like ``"0-3,6"``."""
+    ids: list[int] = []
+    for part in filter(None, (p.strip() for p in value.split(","))):
+        start, _, end = part.partition("-")
+        ids.extend(range(int(start), int(end or start) + 1))
+    return tuple(ids) or None
+
+
+@dataclass(frozen=True)
+class Config:
+    # Gateway intents profile, one of gateway.PROFILES.
+    intents: str = "minimal"
+    # Run as an AutoShardedBot. Without a shard count Discord picks one.
+    sharded: bool = False
+    shard_count: Optional[int] = None
+    # Shards handled by this process, requires shard_count.
+    shard_ids: Optional[tuple[int, ...]] = None
+    # Spawn this many processes, each with a contiguous range of shards.
+    shard_processes: int = 1
+    # Serve Prometheus metrics on this local port, off without one.
+    metrics_port: Optional[int] = None
+    # JSON lines log, "-" for stdout.
+    log_file: str = "/var/log/bokcirkel.log"
+    log_level: str = "info"
+    # Rotate the log file at this size.
+    log_max_bytes: int = 10 * 1024 * 1024
+    # Cogs loaded as extensions, see bot.EXTENSIONS.
+    cogs: tuple[str, ...] = ("books", "achievements", "genai", "watchdog", "profiling")
+
+    @classmethod
+    def from_env(cls) -> "Config":
+        return cls(
+            intents=_env("INTENTS", cls.intents),
+            sharded=_env_bool("SHARDED", cls.sharded),
+            shard_count=_env_int("SHARD_COUNT", cls.shard_count),
+            shard_ids=parse_shard_ids(_env("SHARD_IDS", "")),
+            shard_processes=_env_int("SHARD_PROCESSES", cls.shard_processes),
+            metrics_port=_env_int("METRICS_PORT", cls.metrics_port),
+            log_file=_env("LOG_FILE", cls.log_file),
+            log_level=_env("LOG_LEVEL", cls.log_level),
+            log_max_bytes=_env_int("LOG_MAX_BYTES", cls.log_max_bytes),
+            cogs=parse_names(_env("COGS", "")) or cls.cogs,
+        )
@@ -0,0 +1,102 @@
+"""Gateway intents and member cache profiles.
+
+The cogs only need guild/message/reaction events and the message content of
+commands, so the default profile leaves out presences and the member list.
+Members that are not cached are fetched over REST when needed, see
+`resolve_member`.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Optional
+
+import discord
+
+
+@dataclass(frozen=True)
+class GatewayProfile:
+    name: str
+    intents: discord.Intents
+    member_cache_flags: discord.MemberCacheFlags
+    chunk_guilds_at_startup: bool
+
+    def client_options(self) -> dict:
+        """Keyword arguments for `commands.Bot`."""
+        return {
+            "intents": self.intents,
+            "member_cache_flags": self.member_cache_flags,
+            "chunk_guilds_at_startup": self.chunk_guilds_at_startup,
+        }
+
+
+def _base_intents() -> discord.Intents:
+    intents = discord.Intents.none()
+    intents.guilds = True
+    intents.guild_messages = True
+    intents.dm_messages = True
+    intents.message_content = True
+    intents.guild_reactions = True
+    return intents
+
+
+def _minimal() -> GatewayProfile:
+    # No member list at all: authors and mentions come with the message
+    # payload, everyone else is fetched on demand.
+    return GatewayProfile(
+        name="minimal",
+        intents=_base_intents(),
+        member_cache_flags=discord.MemberCacheFlags.none(),
+        chunk_guilds_at_startup=False,
+    )
+
+
+def _members() -> GatewayProfile:
+    # Member events and a cache that fills up as members show up, but no
+    # chunking of every guild at startup.
+    intents = _base_intents()
+    intents.members = True
+    return GatewayProfile(
+        name="members",
+        intents=intents,
+        member_cache_flags=discord.MemberCacheFlags.from_intents(intents),
+        chunk_guilds_at_startup=False,
+    )
+
+
+def _full() -> GatewayProfile:
+    # The old behaviour: everything, with every guild chunked on connect.
+    return GatewayProfile(
+        name="full",
+        intents=discord.Intents.all(),
+        member_cache_flags=discord.MemberCacheFlags.all(),
+        chunk_guilds_at_startup=True,
+    )
+
+
+PROFILES = {"minimal": _minimal, "members": _members, "full": _full}
+
+
+def profile(name: str) -> GatewayProfile:
+    """Build the gateway profile with the given name."""
+    try:
+        return PROFILES[name]()
+    except KeyError:
+        raise ValueError(
+            f"Unknown intents profile {name!r}, expected one of {sorted(PROFILES)}"
+        ) from None
+
+
+async def resolve_member(
+    guild: discord.Guild, user_id: int
+) -> Optional[discord.Member]:
+    """Get a member from the cache, falling back to fetching it over REST."""
+    member = guild.get_member(user_id)
+    if member is not None:
+        return member
+    try:
+        return await guild.fetch_member(user_id)
+    except discord.NotFound:
+        return None
+    except discord.HTTPException:
+        logging.exception("Failed to fetch member %s in guild %s", user_id, guild.id)
+        return None
@@ -0,0 +1,140 @@
+import asyncio
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from .model import GeneratedText
+
+# Outputs kept in memory, the rest is only in SQLite.
+MAX_SIZE = 128
+# Outputs kept in SQLite, the oldest are deleted first.
+MAX_ROWS = 1000
+# Seconds before an output is generated again.
+TTL = 30 * 24 * 60 * 60
+
+
+def cache_key(template: str, title: str, author: Optional[str]) -> str:
+    """Key of the output of a prompt template for a book."""
+    parts = "\0".join([template, title.casefold(), (author or "").casefold()])
+    return hashlib.sha256(parts.encode()).hexdigest()
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+@dataclass
+class OutputCacheStats:
+    hits: int = 0
+    misses: int = 0
+    # Requests that waited for a generation already running.
+    coalesced: int = 0
+
+
+@dataclass
+class _Entry:
+    text: str
+    created_at: datetime
+
+
+class OutputCache:
+    """
+    Generated texts cached in memory (LRU) and in SQLite. Concurrent
+    generations of the same key share a single model call.
+    """
+
+    def __init__(
+        self,
+        engine,
+        max_size: int = MAX_SIZE,
+        max_rows: int = MAX_ROWS,
+        ttl: float = TTL,
+        clock: Callable[[], datetime] = _utcnow,
+    ):
+        self.engine = engine
+        self.max_size = max_size
+        self.max_rows = max_rows
+        self.ttl = ttl
+        self.clock = clock
+        self.stats = OutputCacheStats()
+        self._memory: OrderedDict[str, _Entry] = OrderedDict()
+        self._inflight: dict[str, asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    def get(self, key: str) -> Optional[str]:
+        """The cached text, None if it is missing or expired."""
+        entry = self._memory.get(key)
+        if entry is not None:
+            self._memory.move_to_end(key)
+        else:
+            entry = self._load(key)
+        if (
+            entry is None
+            or (self.clock() - entry.created_at).total_seconds() >= self.ttl
+        ):
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        return entry.text
+
+    def inflight(self, key: str) -> bool:
+        return key in self._inflight
+
+    async def generate(self, key: str, generate: Callable[[], Awaitable[str]]) -> str:
+        """
+        Run `generate` and cache its text. If a generation of the key is
+        already running, wait for it instead.
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._generate(key, generate))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._inflight.pop(key, None))
+        else:
+            self.stats.coalesced += 1
+        # One requester giving up does not cancel the others.
+        return await asyncio.shield(task)
+
+    async def _generate(self, key: str, generate: Callable[[], Awaitable[str]]) -> str:
+        text = await generate()
+        self._store(key, text)
+        return text
+
+    def _memory_put(self, key: str, entry: _Entry) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_size:
+            self._memory.popitem(last=False)
+
+    def _load(self, key: str) -> Optional[_Entry]:
+        with Session(self.engine) as session:
+            row = session.get(GeneratedText, key)
+            if row is None:
+                return None
+            entry = _Entry(text=row.text, created_at=row.created_at)
+        self._memory_put(key, entry)
+        return entry
+
+    def _store(self, key: str, text: str) -> None:
+        entry = _Entry(text=text, created_at=self.clock())
+        self._memory_put(key, entry)
+        with Session(self.engine) as session:
+            session.merge(
+                GeneratedText(key=key, text=text, created_at=entry.created_at)
+            )
+            newest = (
+                select(GeneratedText.key)
+                .order_by(GeneratedText.created_at.desc())
+                .limit(self.max_rows)
+            )
+            session.execute(
+                delete(GeneratedText).where(GeneratedText.key.not_in(newest))
+            )
+            session.commit()
@@ -1,39 +1,85 @@
+import asyncio
 import logging
-from pathlib import Path
+import time
+from typing import AsyncIterator, Awaitable, Optional
 
 import discord
 from discord.ext import commands
-from google import genai
 from sqlalchemy import Engine
-from sqlalchemy.orm import Session
 
-from ..books import model
+from .. import metrics
+from ..books.read_model import ReadModel
+from .cache import OutputCache, cache_key
+from .llm import API_KEY_FILE, Chunk, GeminiModel, TextModel, Usage
+from .scheduler import QueueFull, Scheduler
+from .summary import Summarizer, prompt_key
 
 _playlist_prompt = """You are a character from {book_title} by {book_author}. Create a playlist of five songs/pieces that reflect your personality, experiences, and worldview. Choose songs that you would realistically listen to, or that capture the themes, emotions, and struggles in your life. For each song, give a short explanation (1–2 sentences) in your own voice, describing why it fits you or your story. Keep the tone consistent with your character’s personality and speaking style. Format the result as a clear, numbered playlist. P.S. less than 5000 characters."""
 
 _discussion_prompt = """"You are a character from {book_title} by {book_author}. Imagine you are sitting in on our book club. Write 5–7 discussion questions or prompts that you would bring up, written in your own voice and perspective. The topics should reflect your personality, values, biases, and experiences. Make them open-ended, encouraging readers to reflect, debate, and connect with the story. Stay true to how you would actually speak or think, even if your tone is humorous, tragic, arrogant, naive, or wise. P.S. less than 5000 characters."""
 
 
+# Seconds between edits of the message the output is streamed into.
+EDIT_INTERVAL = 1.0
+# Longest text an embed description can hold.
+MAX_DESCRIPTION = 4096
+
+
+def _embed(title: str, text: str) -> discord.Embed:
+    if len(text) > MAX_DESCRIPTION:
+        text = text[: MAX_DESCRIPTION - 3] + "..."
+    return discord.Embed(title=title, description=text, color=discord.Color.purple())
+
+
+async def stream_into(
+    message: discord.Message,
+    title: str,
+    chunks: AsyncIterator[Chunk],
+    usage: Optional[Usage] = None,
+) -> str:
+    """
+    Write streamed text into a message, editing it at most every
+    EDIT_INTERVAL. `usage` is updated with the token counts reported.
+    """
+    text = ""
+    last_edit = float("-inf")
+    async for chunk in chunks:
+        text += chunk.text
+        if usage is not None and chunk.usage is not None:
+            usage.prompt_tokens = chunk.usage.prompt_tokens
+            usage.output_tokens = chunk.usage.output_tokens
+        if text and time.monotonic() - last_edit >= EDIT_INTERVAL:
+            last_edit = time.monotonic()
+            await message.edit(embed=_embed(title, text + " ▌"))
+    await message.edit(embed=_embed(title, text))
+    return text
+
+
+async def _not_found(ctx: commands.Context) -> None:
+    embed = discord.Embed(
+        title="📚 Book Club Not Found",
+        description="Book club not found.",
+        color=discord.Color.orange(),
+    )
+    await ctx.send(embed=embed)
+
+
 # TODO: Clean up the code and move it to a separate service file.
 class GenAI(commands.Cog):
     """Separate Cog for GenAI stuff to keep it in one place."""
 
-    def __init__(self, bot: commands.Bot, engine: Engine):
-        try:
-            # Load Gemini API key from file
-            api_key_file = Path(".gemini-api-key")
-            if not api_key_file.exists():
-                raise FileNotFoundError(
-                    "Missing .gemini-api-key file with your Gemini API token."
-                )
-
-            with api_key_file.open("r", encoding="utf-8") as f:
-                api_key = f.read().strip()
-            self.client = genai.Client(api_key=api_key)
-        except Exception as e:
-            logging.warning(f"Error loading Gemini API key: {e}")
+    def __init__(
+        self, bot: commands.Bot, engine: Engine, llm: Optional[TextModel] = None
+    ):
         self.bot = bot
         self.engine = engine
+        self.read_model = ReadModel(engine)
+        self.llm = llm or GeminiModel()
+        self.cache = OutputCache(engine)
+        self.scheduler = Scheduler()
+        self.summarizer = Summarizer(
+            engine, self.llm, self.cache, scheduler=self.scheduler
+        )
         super().__init__()
 
     @commands.Cog.listener()
@@ -41,102 +87,221 @@ class GenAI(commands.Cog):
         """Event handler for when the bot is ready."""
         logging.info("GenAI Cog is ready.")
 
-    @commands.command()
-    @commands.has_permissions(administrator=True)
-    async def playlist(self, ctx: commands.Context):
-        try:
-            logging.info("Generating playlist...")
-            if self.client is None:
-                embed = discord.Embed(
-                    title="❌ Gemini API Error",
-                    description="Gemini API client is not initialized.",
-                    color=discord.Color.red(),
-                )
-                await ctx.send(embed=embed)
-                return
-            with Session(self.engine) as session:
-                book_club = session.get(model.BookClub, ctx.channel.id)
-                if not book_club:
-                    embed = discord.Embed(
-                        title="📚 Book Club Not Found",
-                        description="Book club not found.",
-                        color=discord.Color.orange(),
-                    )
-                    await ctx.send(embed=embed)
-                    return
-                logging.info(
-                    f"Generating playlist for book: {book_club.book.title} by {book_club.book.author}"
-                )
-                await ctx.send("Generating playlist, please wait...")
-                response = self.client.models.generate_content(
-                    model="gemini-2.5-flash",
-                    contents=_playlist_prompt.format(
-                        book_title=book_club.book.title,
-                        book_author=book_club.book.author,
+    def samples(self) -> list[metrics.Sample]:
+        stats = self.scheduler.stats
+        samples = metrics.stats_samples("genai", stats.total)
+        for guild_id, calls in stats.guilds.items():
+            samples += metrics.stats_samples("genai_guild", calls, guild=str(guild_id))
+        samples += metrics.stats_samples("genai_cache", self.cache.stats)
+        samples.append(
+            metrics.Sample("genai_running", sum(self.scheduler.running.values()))
+        )
+        samples.append(metrics.Sample("genai_waiting", len(self.scheduler.waiting)))
+        return samples
+
+    def _book(self, book_club_id: int) -> Optional[tuple[str, Optional[str]]]:
+        book = self.read_model.book(book_club_id)
+        return (book.title, book.author) if book else None
+
+    async def generate(
+        self,
+        ctx: commands.Context,
+        prompt: str,
+        title: str,
+        what: str,
+        fresh: bool = False,
+    ) -> None:
+        """
+        Stream the answer to a prompt about the club's book into a message.
+        Answers are cached per book, `fresh` generates a new one.
+        """
+        book = self._book(ctx.channel.id)
+        if book is None:
+            await _not_found(ctx)
+            return
+        book_title, book_author = book
+        key = cache_key(prompt, book_title, book_author)
+        if not fresh and (text := self.cache.get(key)) is not None:
+            await ctx.send(embed=_embed(title, text))
+            return
+        logging.info("Generating %s for book: %s by %s", what, book_title, book_author)
+        message = await ctx.send(
+            embed=_embed(title, f"Generating {what}, please wait...")
+        )
+
+        async def produce() -> str:
+            usage = Usage()
+            return await self.scheduler.run(
+                ctx.guild.id if ctx.guild else 0,
+                lambda: stream_into(
+                    message,
+                    title,
+                    self.llm.stream(
+                        prompt.format(book_title=book_title, book_author=book_author)
                     ),
-                )
-                logging.info(f"Response from Gemini: {response.text}")
-                embed = discord.Embed(
-                    title="🎶 Recommended Playlist 🎶",
-                    description=response.text,
-                    color=discord.Color.purple(),
-                )
-                await ctx.send(embed=embed)
-        except:
-            logging.exception("Error generating playlist")
+                    usage,
+                ),
+                usage=usage,
+                on_position=lambda position: message.edit(
+                    embed=_embed(title, f"⏳ Waiting in line, position {position}...")
+                ),
+            )
+
+        async def respond() -> str:
+            # Only the first request streams, the others get the whole text.
+            shared = self.cache.inflight(key)
+            text = await self.cache.generate(key, produce)
+            if shared:
+                await message.edit(embed=_embed(title, text))
+            return text
+
+        await self._respond(message, what, respond())
+
+    async def _respond(
+        self, message: discord.Message, what: str, response: Awaitable[str]
+    ) -> None:
+        """Await a response, replacing the message with an error if it fails."""
+        try:
+            text = await response
+            logging.info("Response from Gemini: %s", text)
+        except QueueFull as e:
+            embed = discord.Embed(
+                title="⏳ Busy",
+                description=str(e),
+                color=discord.Color.orange(),
+            )
+            await message.edit(embed=embed)
+        except FileNotFoundError:
+            logging.warning("Gemini API key is missing")
+            embed = discord.Embed(
+                title="❌ Gemini API Error",
+                description="Gemini API client is not initialized.",
+                color=discord.Color.red(),
+            )
+            await message.edit(embed=embed)
+        except Exception:
+            logging.exception("Error generating %s", what)
             embed = discord.Embed(
                 title="❌ Error",
-                description="An error occurred while generating the playlist.",
+                description=f"An error occurred while generating the {what}.",
                 color=discord.Color.red(),
             )
-            await ctx.send(embed=embed)
+            await message.edit(embed=embed)
 
     @commands.command()
     @commands.has_permissions(administrator=True)
-    async def discussion(self, ctx: commands.Context):
-        try:
-            logging.info("Generating discussion prompts...")
-            if self.client is None:
-                embed = discord.Embed(
-                    title="❌ Gemini API Error",
-                    description="Gemini API client is not initialized.",
-                    color=discord.Color.red(),
-                )
-                await ctx.send(embed=embed)
-                return
-            with Session(self.engine) as session:
-                book_club = session.get(model.BookClub, ctx.channel.id)
-                if not book_club:
-                    embed = discord.Embed(
-                        title="📚 Book Club Not Found",
-                        description="Book club not found.",
-                        color=discord.Color.orange(),
-                    )
-                    await ctx.send(embed=embed)
-                    return
-                logging.info(
-                    f"Generating discussion prompts for book: {book_club.book.title} by {book_club.book.author}"
-                )
-                await ctx.send("Generating discussion prompts, please wait...")
-                response = self.client.models.generate_content(
-                    model="gemini-2.5-flash",
-                    contents=_discussion_prompt.format(
-                        book_title=book_club.book.title,
-                        book_author=book_club.book.author,
-                    ),
-                )
-                logging.info(f"Response from Gemini: {response.text}")
-                embed = discord.Embed(
-                    title="💬 Discussion Prompts 💬",
-                    description=response.text,
-                    color=discord.Color.purple(),
-                )
-                await ctx.send(embed=embed)
-        except:
-            logging.exception("Error generating discussion prompts")
+    async def playlist(self, ctx: commands.Context, option: str = ""):
+        """`!playlist [--fresh]`, --fresh skips the cached playlist."""
+        await self.generate(
+            ctx,
+            _playlist_prompt,
+            "🎶 Recommended Playlist 🎶",
+            "playlist",
+            fresh=option == "--fresh",
+        )
+
+    @commands.command()
+    @commands.has_permissions(administrator=True)
+    async def discussion(self, ctx: commands.Context, option: str = ""):
+        """`!discussion [--fresh]`, --fresh skips the cached prompts."""
+        await self.generate(
+            ctx,
+            _discussion_prompt,
+            "💬 Discussion Prompts 💬",
+            "discussion prompts",
+            fresh=option == "--fresh",
+        )
+
+    @commands.command()
+    async def summary(self, ctx: commands.Context, option: str = ""):
+        """`!summary [--fresh]`, summarize the club's notes and quotes."""
+        book = self._book(ctx.channel.id)
+        if book is None:
+            await _not_found(ctx)
+            return
+        book_title, book_author = book
+        chunks = await asyncio.to_thread(self.summarizer.chunks, ctx.channel.id)
+        if not any(chunks.values()):
             embed = discord.Embed(
-                title="❌ Error",
-                description="An error occurred while generating the discussion prompts.",
-                color=discord.Color.red(),
+                title="📝 Nothing to Summarize",
+                description="No notes or quotes have been shared yet.",
+                color=discord.Color.orange(),
             )
             await ctx.send(embed=embed)
+            return
+        title = f"📝 Summary of {book_title}"
+        message = await ctx.send(
+            embed=_embed(title, "Summarizing notes and quotes, please wait...")
+        )
+        guild_id = ctx.guild.id if ctx.guild else 0
+
+        async def work() -> str:
+            # Every map call is scheduled on its own by the summarizer.
+            prompt = await self.summarizer.reduce_prompt(
+                chunks, book_title, book_author, Usage(), guild_id
+            )
+            key = prompt_key(prompt)
+            if option != "--fresh" and (text := self.cache.get(key)) is not None:
+                await message.edit(embed=_embed(title, text))
+                return text
+            shared = self.cache.inflight(key)
+
+            async def reduce() -> str:
+                usage = Usage()
+                return await self.scheduler.run(
+                    guild_id,
+                    lambda: stream_into(message, title, self.llm.stream(prompt), usage),
+                    usage=usage,
+                    on_position=lambda position: message.edit(
+                        embed=_embed(
+                            title, f"⏳ Waiting in line, position {position}..."
+                        )
+                    ),
+                )
+
+            text = await self.cache.generate(key, reduce)
+            if shared:
+                await message.edit(embed=_embed(title, text))
+            return text
+
+        await self._respond(message, "summary", work())
+
+    @commands.command()
+    @commands.has_permissions(administrator=True)
+    async def genaistats(self, ctx: commands.Context):
+        """Show GenAI call latency, token usage and outcomes (admin only)."""
+        stats = self.scheduler.stats
+        embed = discord.Embed(title="🤖 GenAI Stats", color=discord.Color.purple())
+        for name, calls in [
+            ("All Servers", stats.total),
+            ("This Server", stats.guild(ctx.guild.id if ctx.guild else 0)),
+        ]:
+            embed.add_field(
+                name=name,
+                value=(
+                    f"📨 {calls.calls} calls, {calls.errors} failed, "
+                    f"{calls.rejected} rejected\n"
+                    f"⏱️ {calls.mean_latency:.1f}s mean, {calls.max_latency:.1f}s max\n"
+                    f"⏳ {calls.mean_wait:.1f}s mean wait\n"
+                    f"🔤 {calls.prompt_tokens} prompt + {calls.output_tokens} output tokens"
+                ),
+                inline=False,
+            )
+        cache = self.cache.stats
+        embed.add_field(
+            name="Queue",
+            value=f"🏃 {sum(self.scheduler.running.values())} running\n🧍 {len(self.scheduler.waiting)} waiting",
+        )
+        embed.add_field(
+            name="Cache",
+            value=f"✅ {cache.hits} hits\n🌐 {cache.misses} misses\n🤝 {cache.coalesced} shared",
+        )
+        await ctx.send(embed=embed)
+
+
+async def setup(bot: commands.Bot) -> None:
+    # Without a key every command would fail, leave them out.
+    if not API_KEY_FILE.exists():
+        logging.info("No %s, the GenAI commands are disabled.", API_KEY_FILE)
+        return
+    await bot.add_cog(GenAI(bot, bot.engine))
@@ -0,0 +1,101 @@
+import asyncio
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, AsyncIterator, Callable, Iterable, Optional
+
+if TYPE_CHECKING:
+    from google import genai
+
+API_KEY_FILE = Path(".gemini-api-key")
+MODEL = "gemini-2.5-flash"
+
+
+def load_api_key() -> str:
+    """Load the Gemini API key from file."""
+    if not API_KEY_FILE.exists():
+        raise FileNotFoundError(
+            "Missing .gemini-api-key file with your Gemini API token."
+        )
+    with API_KEY_FILE.open("r", encoding="utf-8") as f:
+        return f.read().strip()
+
+
+@dataclass
+class Usage:
+    prompt_tokens: int = 0
+    output_tokens: int = 0
+
+    def add(self, other: "Usage") -> None:
+        self.prompt_tokens += other.prompt_tokens
+        self.output_tokens += other.output_tokens
+
+
+@dataclass
+class Chunk:
+    text: str
+    # Token counts so far, if the model reports them.
+    usage: Optional[Usage] = None
+
+
+class TextModel(ABC):
+    """A model generating text from a prompt, injected into the GenAI cog."""
+
+    @abstractmethod
+    def stream(self, prompt: str) -> AsyncIterator[Chunk]:
+        """The generated text in pieces, as they arrive."""
+
+
+class GeminiModel(TextModel):
+    """
+    Gemini through the async client. The SDK takes about a second to import,
+    so it is imported and the API key read on first use.
+    """
+
+    def __init__(self, load_key: Callable[[], str] = load_api_key, model: str = MODEL):
+        self.load_key = load_key
+        self.model = model
+        self._client: Optional["genai.Client"] = None
+
+    def client(self) -> "genai.Client":
+        if self._client is None:
+            from google import genai
+
+            self._client = genai.Client(api_key=self.load_key())
+        return self._client
+
+    async def stream(self, prompt: str) -> AsyncIterator[Chunk]:
+        # The first call imports the SDK, off the event loop.
+        client = self._client or await asyncio.to_thread(self.client)
+        responses = await client.aio.models.generate_content_stream(
+            model=self.model, contents=prompt
+        )
+        async for response in responses:
+            usage = None
+            if (metadata := response.usage_metadata) is not None:
+                usage = Usage(
+                    prompt_tokens=metadata.prompt_token_count or 0,
+                    output_tokens=metadata.candidates_token_count or 0,
+                )
+            yield Chunk(text=response.text or "", usage=usage)
+
+
+class FakeModel(TextModel):
+    """Local model for tests, streams the given pieces of text."""
+
+    def __init__(self, pieces: Iterable[str] = ("Generated text.",), delay: float = 0):
+        self.pieces = list(pieces)
+        # Seconds between pieces.
+        self.delay = delay
+        self.prompts: list[str] = []
+
+    async def stream(self, prompt: str) -> AsyncIterator[Chunk]:
+        self.prompts.append(prompt)
+        output = 0
+        for piece in self.pieces:
+            await asyncio.sleep(self.delay)
+            output += len(piece.split())
+            yield Chunk(
+                text=piece,
+                usage=Usage(prompt_tokens=len(prompt.split()), output_tokens=output),
+            )
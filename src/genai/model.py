@@ -0,0 +1,14 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ..models import Base
+
+
+class GeneratedText(Base):
+    __tablename__ = "generated_text"
+    # Hash of the prompt template, book title and author.
+    key: Mapped[str] = mapped_column(String, primary_key=True)
+    text: Mapped[str] = mapped_column(String, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
@@ -0,0 +1,175 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from .llm import Usage
+
+T = TypeVar("T")
+
+# Jobs waiting or running at once, across all guilds.
+MAX_QUEUED = 20
+# Model calls running at once.
+CONCURRENCY = 2
+# Model calls running at once for a single guild.
+GUILD_CONCURRENCY = 1
+# Lane of jobs submitted without one.
+DEFAULT_LANE = "default"
+
+
+class QueueFull(Exception):
+    """Raised when a job is submitted while MAX_QUEUED jobs are pending."""
+
+
+@dataclass
+class CallStats:
+    calls: int = 0
+    errors: int = 0
+    rejected: int = 0
+    prompt_tokens: int = 0
+    output_tokens: int = 0
+    # Seconds spent in the model and waiting in the queue.
+    latency: float = 0.0
+    max_latency: float = 0.0
+    wait: float = 0.0
+
+    def record(self, latency: float, wait: float, usage: Usage, ok: bool) -> None:
+        self.calls += 1
+        self.errors += not ok
+        self.prompt_tokens += usage.prompt_tokens
+        self.output_tokens += usage.output_tokens
+        self.latency += latency
+        self.max_latency = max(self.max_latency, latency)
+        self.wait += wait
+
+    @property
+    def mean_latency(self) -> float:
+        return self.latency / self.calls if self.calls else 0.0
+
+    @property
+    def mean_wait(self) -> float:
+        return self.wait / self.calls if self.calls else 0.0
+
+
+@dataclass
+class _Waiter:
+    guild_id: int
+    lane: str
+    started: asyncio.Future
+    on_position: Optional[Callable[[int], Awaitable[None]]]
+    position: int = 0
+
+
+@dataclass
+class GenAIStats:
+    total: CallStats = field(default_factory=CallStats)
+    guilds: dict[int, CallStats] = field(default_factory=dict)
+
+    def guild(self, guild_id: int) -> CallStats:
+        return self.guilds.setdefault(guild_id, CallStats())
+
+
+class Scheduler:
+    """
+    Runs model calls first come, first served, with a bound on the calls
+    running per guild and in total, and on the number of jobs pending.
+    Jobs are bound per guild within their lane, so the lanes in `lanes` get
+    an allowance of their own besides `guild_concurrency`.
+    """
+
+    def __init__(
+        self,
+        max_queued: int = MAX_QUEUED,
+        concurrency: int = CONCURRENCY,
+        guild_concurrency: int = GUILD_CONCURRENCY,
+        lanes: Optional[dict[str, int]] = None,
+    ):
+        self.max_queued = max_queued
+        self.concurrency = concurrency
+        self.guild_concurrency = guild_concurrency
+        # Calls running at once for a single guild, by lane.
+        self.lanes = dict(lanes or {})
+        self.stats = GenAIStats()
+        self.running: dict[tuple[int, str], int] = {}
+        self.waiting: list[_Waiter] = []
+
+    def pending(self) -> int:
+        return len(self.waiting) + sum(self.running.values())
+
+    async def run(
+        self,
+        guild_id: int,
+        work: Callable[[], Awaitable[T]],
+        usage: Optional[Usage] = None,
+        on_position: Optional[Callable[[int], Awaitable[None]]] = None,
+        lane: str = DEFAULT_LANE,
+    ) -> T:
+        """
+        Run `work` once the limits allow it. `on_position` is told the
+        place in the queue while it waits, `usage` is filled in by `work`.
+        """
+        if self.pending() >= self.max_queued:
+            self.stats.total.rejected += 1
+            self.stats.guild(guild_id).rejected += 1
+            raise QueueFull("Too many requests are queued, try again later.")
+        waiter = _Waiter(
+            guild_id, lane, asyncio.get_running_loop().create_future(), on_position
+        )
+        queued_at = time.monotonic()
+        self.waiting.append(waiter)
+        self._dispatch()
+        try:
+            await waiter.started
+        except asyncio.CancelledError:
+            if waiter in self.waiting:
+                self.waiting.remove(waiter)
+            else:
+                self._release(waiter)
+            raise
+        started_at = time.monotonic()
+        usage = usage or Usage()
+        ok = False
+        try:
+            result = await work()
+            ok = True
+            return result
+        finally:
+            latency = time.monotonic() - started_at
+            wait = started_at - queued_at
+            self.stats.total.record(latency, wait, usage, ok)
+            self.stats.guild(guild_id).record(latency, wait, usage, ok)
+            logging.info(
+                "GenAI call for guild %s: %s in %.1fs after %.1fs queued, %d+%d tokens",
+                guild_id,
+                "ok" if ok else "error",
+                latency,
+                wait,
+                usage.prompt_tokens,
+                usage.output_tokens,
+            )
+            self._release(waiter)
+
+    def _release(self, waiter: _Waiter) -> None:
+        key = (waiter.guild_id, waiter.lane)
+        self.running[key] -= 1
+        if not self.running[key]:
+            del self.running[key]
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Start the waiting jobs the limits allow, and report new positions."""
+        for waiter in list(self.waiting):
+            if sum(self.running.values()) >= self.concurrency:
+                break
+            key = (waiter.guild_id, waiter.lane)
+            limit = self.lanes.get(waiter.lane, self.guild_concurrency)
+            if self.running.get(key, 0) >= limit:
+                continue
+            self.waiting.remove(waiter)
+            self.running[key] = self.running.get(key, 0) + 1
+            waiter.started.set_result(None)
+        for position, waiter in enumerate(self.waiting, start=1):
+            if waiter.position != position and waiter.on_position is not None:
+                asyncio.create_task(waiter.on_position(position))
+            waiter.position = position
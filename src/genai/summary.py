@@ -0,0 +1,185 @@
+import asyncio
+import hashlib
+from typing import Iterable, Iterator, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..books.model import BookClubReader, Note, Quote, User
+from .cache import OutputCache
+from .llm import TextModel, Usage
+from .scheduler import Scheduler
+
+# Estimated tokens of notes and quotes per model call.
+CHUNK_TOKENS = 3000
+# Chunks summarized at once.
+MAP_CONCURRENCY = 4
+# Scheduler lane of the map calls, which run MAP_CONCURRENCY at once per
+# guild without taking the guild's slot for other commands.
+MAP_LANE = "summary-map"
+# Rows fetched from SQLite at a time.
+FETCH_SIZE = 500
+
+_map_prompt = """Summarize these {kind} shared in a book club reading {book_title} by {book_author}. Write a few short bullet points covering the main observations, questions and themes, and mention who said what when it matters. Keep notable quotes word for word.
+
+{entries}"""
+
+_reduce_prompt = """These are partial summaries of the notes and quotes shared in a book club reading {book_title} by {book_author}. Combine them into one summary of at most 300 words. Highlight recurring themes, disagreements and the most memorable quotes.
+
+{entries}"""
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count, about four characters per token."""
+    return len(text) // 4 + 1
+
+
+def prompt_key(prompt: str) -> str:
+    return hashlib.sha256(prompt.encode()).hexdigest()
+
+
+def chunk(entries: Iterable[str], budget: int) -> Iterator[str]:
+    """
+    Pack entries into chunks of at most `budget` estimated tokens, in order.
+    Entries added at the end only change the last chunk.
+    """
+    lines: list[str] = []
+    tokens = 0
+    for entry in entries:
+        entry = entry[: budget * 4]
+        size = estimate_tokens(entry)
+        if lines and tokens + size > budget:
+            yield "\n".join(lines)
+            lines, tokens = [], 0
+        lines.append(entry)
+        tokens += size
+    if lines:
+        yield "\n".join(lines)
+
+
+class Summarizer:
+    """
+    Summarizes a club's notes and quotes with map-reduce: chunks are
+    summarized concurrently, then the partial summaries are combined.
+    Partial summaries are cached by the hash of their prompt, so only
+    chunks that changed are summarized again. With a scheduler, each model
+    call waits for its turn in the scheduler's MAP_LANE.
+    """
+
+    def __init__(
+        self,
+        engine,
+        llm: TextModel,
+        cache: OutputCache,
+        chunk_tokens: int = CHUNK_TOKENS,
+        concurrency: int = MAP_CONCURRENCY,
+        scheduler: Optional[Scheduler] = None,
+    ):
+        self.engine = engine
+        self.llm = llm
+        self.cache = cache
+        self.chunk_tokens = chunk_tokens
+        self.concurrency = concurrency
+        self.scheduler = scheduler
+        if scheduler is not None:
+            scheduler.lanes[MAP_LANE] = concurrency
+
+    def _entries(self, session: Session, model, book_club_id: int, verb: str):
+        rows = session.execute(
+            select(User.name, model.text)
+            .join(BookClubReader, model.book_club_reader_id == BookClubReader.id)
+            .join(User, BookClubReader.user_id == User.id)
+            .where(BookClubReader.book_club_id == book_club_id)
+            .order_by(model.created_at, model.id)
+            .execution_options(yield_per=FETCH_SIZE)
+        )
+        for name, text in rows:
+            yield f"- {name} {verb}: {text}"
+
+    def chunks(self, book_club_id: int) -> dict[str, list[str]]:
+        """Notes and quotes of a club in chunks, oldest first, by kind."""
+        with Session(self.engine) as session:
+            return {
+                kind: list(
+                    chunk(
+                        self._entries(session, model, book_club_id, verb),
+                        self.chunk_tokens,
+                    )
+                )
+                for kind, model, verb in [
+                    ("notes", Note, "noted"),
+                    ("quotes", Quote, "quoted"),
+                ]
+            }
+
+    async def complete(self, prompt: str, usage: Usage, guild_id: int = 0) -> str:
+        """The model's whole answer to a prompt, cached by the prompt's hash."""
+        key = prompt_key(prompt)
+        if (text := self.cache.get(key)) is not None:
+            return text
+        call = Usage()
+
+        async def generate() -> str:
+            text, last = "", None
+            async for piece in self.llm.stream(prompt):
+                text += piece.text
+                last = piece.usage or last
+            if last is not None:
+                call.add(last)
+            return text
+
+        async def scheduled() -> str:
+            if self.scheduler is None:
+                return await generate()
+            return await self.scheduler.run(
+                guild_id, generate, usage=call, lane=MAP_LANE
+            )
+
+        text = await self.cache.generate(key, scheduled)
+        usage.add(call)
+        return text
+
+    async def map(
+        self, prompts: list[str], usage: Usage, guild_id: int = 0
+    ) -> list[str]:
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def summarize(prompt: str) -> str:
+            async with semaphore:
+                return await self.complete(prompt, usage, guild_id)
+
+        return await asyncio.gather(*(summarize(prompt) for prompt in prompts))
+
+    async def reduce_prompt(
+        self,
+        chunks: dict[str, list[str]],
+        book_title: str,
+        book_author: str,
+        usage: Usage,
+        guild_id: int = 0,
+    ) -> str:
+        """
+        Summarize the chunks and return the prompt combining the partial
+        summaries. Partials that do not fit in one prompt are combined in
+        rounds first.
+        """
+        book = {"book_title": book_title, "book_author": book_author}
+        partials = await self.map(
+            [
+                _map_prompt.format(kind=kind, entries=text, **book)
+                for kind, texts in chunks.items()
+                for text in texts
+            ],
+            usage,
+            guild_id,
+        )
+        while True:
+            groups = list(chunk(partials, self.chunk_tokens))
+            # Stop when another round would not make the partials fewer.
+            if len(groups) <= 1 or len(groups) == len(partials):
+                return _reduce_prompt.format(entries="\n\n".join(partials), **book)
+            partials = await self.map(
+                [_reduce_prompt.format(entries=group, **book) for group in groups],
+                usage,
+                guild_id,
+            )
@@ -0,0 +1,127 @@
+"""
+Logging that keeps disk writes off the event loop.
+
+Records go through a queue to a listener thread, which writes them as JSON
+lines to a file rotated by size. The command and guild a record was logged
+from are added to it, from a context variable set around each command.
+Log with %-style arguments in hot paths, so the message is only built for
+enabled levels.
+"""
+
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Iterator, Optional
+
+# Rotate the log file once it reaches this many bytes.
+MAX_BYTES = 10 * 1024 * 1024
+# Rotated files kept, as bokcirkel.log.1 to bokcirkel.log.5.
+BACKUPS = 5
+# Write to stdout instead of a file, nice for local debugging.
+STDOUT = "-"
+
+_context: ContextVar[dict[str, object]] = ContextVar("log_context", default={})
+
+
+@contextmanager
+def context(**fields) -> Iterator[None]:
+    """Add the fields to the records logged inside the block."""
+    token = _context.set({**_context.get(), **fields})
+    try:
+        yield
+    finally:
+        _context.reset(token)
+
+
+class ContextFilter(logging.Filter):
+    """Copies the fields of `context` onto records, in the thread logging them."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        for key, value in _context.get().items():
+            setattr(record, key, value)
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, with the context fields that are set."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key in ("command", "guild"):
+            if (value := getattr(record, key, None)) is not None:
+                line[key] = value
+        if record.exc_info:
+            line["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            line["exception"] = record.exc_text
+        if record.stack_info:
+            line["stack"] = self.formatStack(record.stack_info)
+        return json.dumps(line, default=str)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """
+    Leaves formatting to the listener thread. Only the message and the
+    traceback are rendered here, the arguments and frames may have changed
+    by the time the listener gets to the record.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def setup(
+    path: str,
+    level: int = logging.INFO,
+    max_bytes: int = MAX_BYTES,
+    backups: int = BACKUPS,
+) -> logging.handlers.QueueListener:
+    """
+    Send the root logger's records to a listener writing them to `path`,
+    or stdout for STDOUT. Stop the returned listener to flush them.
+    """
+    if path == STDOUT:
+        handler: logging.Handler = logging.StreamHandler(sys.stdout)
+    else:
+        handler = logging.handlers.RotatingFileHandler(
+            path, maxBytes=max_bytes, backupCount=backups, encoding="utf-8"
+        )
+    handler.setFormatter(JsonFormatter())
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = _QueueHandler(records)
+    queue_handler.addFilter(ContextFilter())
+    root = logging.getLogger()
+    for old in root.handlers[:]:
+        root.removeHandler(old)
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+    listener = logging.handlers.QueueListener(
+        records, handler, respect_handler_level=True
+    )
+    listener.start()
+    return listener
+
+
+def level(name: Optional[str]) -> int:
+    """A level by name like "debug", INFO for an unknown one."""
+    value = logging.getLevelName((name or "").upper())
+    return value if isinstance(value, int) else logging.INFO
@@ -0,0 +1,317 @@
+"""
+Per-command metrics: latency split into database and Discord API time,
+SQL statements and errors, exposed in the Prometheus text format.
+
+A command runs inside `Metrics.command`, which keeps a timing in a context
+variable. Engine events and the wrapped Discord HTTP client add to the
+timing of the command that is running, so code in between needs no changes.
+"""
+
+import asyncio
+import bisect
+import enum
+import logging
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field, fields
+from typing import Callable, Iterable, Iterator, Optional
+
+import discord
+from aiohttp import web
+from discord.ext import commands
+from sqlalchemy import event
+
+PREFIX = "bokcirkel"
+# Upper bounds in seconds of the latency buckets.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Upper bounds of the SQL statements per command buckets.
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+# Commands listed in the !stats embed, slowest in total first.
+STATS_COMMANDS = 10
+# The endpoint only listens locally.
+METRICS_HOST = "127.0.0.1"
+
+
+class Histogram:
+    """Counts of observations per bucket, like a Prometheus histogram."""
+
+    def __init__(self, buckets: Iterable[float]):
+        self.buckets = tuple(buckets)
+        # One count per bucket and a last one for +Inf, not cumulative.
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the quantile, the largest bound for +Inf."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank and seen:
+                return bound
+        return self.buckets[-1]
+
+    def cumulative(self) -> Iterator[tuple[str, int]]:
+        seen = 0
+        for bound, count in zip((*self.buckets, "+Inf"), self.counts):
+            seen += count
+            yield str(bound), seen
+
+
+@dataclass
+class CommandMetrics:
+    latency: Histogram = field(default_factory=lambda: Histogram(LATENCY_BUCKETS))
+    db: Histogram = field(default_factory=lambda: Histogram(LATENCY_BUCKETS))
+    discord: Histogram = field(default_factory=lambda: Histogram(LATENCY_BUCKETS))
+    queries: Histogram = field(default_factory=lambda: Histogram(QUERY_BUCKETS))
+
+
+@dataclass
+class Timing:
+    """Time and statements of the command that is running."""
+
+    metrics: "Metrics"
+    command: str
+    db: float = 0.0
+    discord: float = 0.0
+    queries: int = 0
+
+
+@dataclass(frozen=True)
+class Sample:
+    name: str
+    value: float
+    labels: dict[str, str] = field(default_factory=dict)
+
+
+_current: ContextVar[Optional[Timing]] = ContextVar("metrics_timing", default=None)
+
+
+def _current_task() -> Optional[asyncio.Task]:
+    try:
+        return asyncio.current_task()
+    except RuntimeError:
+        return None
+
+
+def current() -> Optional[Timing]:
+    """The timing of the command running in this context, if any."""
+    return _current.get()
+
+
+def error(kind: str) -> None:
+    """Count an error of the running command, errors outside commands are not counted."""
+    if (timing := current()) is not None:
+        timing.metrics.count_error(timing.command, kind)
+
+
+def stats_samples(name: str, stats, **labels) -> list[Sample]:
+    """
+    One sample per number in a stats dataclass. Enum fields become a
+    sample with the value as a label, like `state="open"`.
+    """
+    samples = []
+    for f in fields(stats):
+        value = getattr(stats, f.name)
+        if isinstance(value, enum.Enum):
+            samples.append(
+                Sample(f"{name}_{f.name}", 1, {**labels, f.name: value.name.lower()})
+            )
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            samples.append(Sample(f"{name}_{f.name}", value, dict(labels)))
+    return samples
+
+
+def _labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    escaped = (
+        (key, str(value).replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n"))
+        for key, value in labels.items()
+    )
+    return "{" + ",".join(f'{key}="{value}"' for key, value in escaped) + "}"
+
+
+class Metrics:
+    """
+    Command metrics, plus samples from collectors registered by the Cogs
+    for the stats they already keep.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        self.clock = clock
+        self.commands: dict[str, CommandMetrics] = defaultdict(CommandMetrics)
+        self.errors: dict[tuple[str, str], int] = defaultdict(int)
+        # Commands running, by the task running them.
+        self.running: dict[asyncio.Task, Timing] = {}
+        self.collectors: list[Callable[[], Iterable[Sample]]] = []
+
+    def register(self, collector: Callable[[], Iterable[Sample]]) -> None:
+        self.collectors.append(collector)
+
+    @contextmanager
+    def command(self, name: str) -> Iterator[Timing]:
+        timing = Timing(self, name)
+        token = _current.set(timing)
+        task = _current_task()
+        if task is not None:
+            self.running[task] = timing
+        started = self.clock()
+        try:
+            yield timing
+        finally:
+            _current.reset(token)
+            self.running.pop(task, None)
+            command = self.commands[name]
+            command.latency.observe(self.clock() - started)
+            command.db.observe(timing.db)
+            command.discord.observe(timing.discord)
+            command.queries.observe(timing.queries)
+
+    def count_error(self, command: str, kind: str) -> None:
+        self.errors[command, kind] += 1
+
+    def instrument_engine(self, engine) -> None:
+        """Count and time the statements run on the engine during commands."""
+
+        # Kept on the execution context, which goes away with the statement
+        # even when it fails and after_cursor_execute never fires.
+        def before(conn, cursor, statement, parameters, context, executemany):
+            context._metrics_started = self.clock()
+
+        def after(conn, cursor, statement, parameters, context, executemany):
+            started = context._metrics_started
+            if (timing := current()) is not None:
+                timing.queries += 1
+                timing.db += self.clock() - started
+
+        event.listen(engine, "before_cursor_execute", before)
+        event.listen(engine, "after_cursor_execute", after)
+
+    def instrument_http(self, http) -> None:
+        """Time the Discord API requests made during commands."""
+        request = http.request
+
+        async def timed(*args, **kwargs):
+            started = self.clock()
+            try:
+                return await request(*args, **kwargs)
+            finally:
+                if (timing := current()) is not None:
+                    timing.discord += self.clock() - started
+
+        http.request = timed
+
+    def samples(self) -> list[Sample]:
+        samples = []
+        for collector in self.collectors:
+            try:
+                samples.extend(collector())
+            except Exception:
+                logging.exception("Error collecting metrics")
+        return samples
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text format."""
+        lines = []
+        for metric, attr, unit in [
+            ("command_duration", "latency", "seconds"),
+            ("command_db_duration", "db", "seconds"),
+            ("command_discord_duration", "discord", "seconds"),
+            ("command_queries", "queries", ""),
+        ]:
+            name = f"{PREFIX}_{metric}" + (f"_{unit}" if unit else "")
+            lines.append(f"# TYPE {name} histogram")
+            for command, stats in sorted(self.commands.items()):
+                histogram = getattr(stats, attr)
+                for bound, count in histogram.cumulative():
+                    labels = _labels({"command": command, "le": bound})
+                    lines.append(f"{name}_bucket{labels} {count}")
+                labels = _labels({"command": command})
+                lines.append(f"{name}_sum{labels} {histogram.sum}")
+                lines.append(f"{name}_count{labels} {histogram.count}")
+        name = f"{PREFIX}_command_errors_total"
+        lines.append(f"# TYPE {name} counter")
+        for (command, kind), count in sorted(self.errors.items()):
+            lines.append(f"{name}{_labels({'command': command, 'kind': kind})} {count}")
+        by_name: dict[str, list[Sample]] = defaultdict(list)
+        for sample in self.samples():
+            by_name[f"{PREFIX}_{sample.name}"].append(sample)
+        for name, samples in by_name.items():
+            lines.append(f"# TYPE {name} gauge")
+            lines.extend(f"{name}{_labels(s.labels)} {s.value}" for s in samples)
+        return "\n".join(lines) + "\n"
+
+
+class Stats(commands.Cog):
+    """Serves the metrics over HTTP and shows them with !stats."""
+
+    def __init__(self, metrics: Metrics, port: Optional[int] = None):
+        self.metrics = metrics
+        self.port = port
+        self._runner: Optional[web.AppRunner] = None
+        super().__init__()
+
+    async def handle(self, request: web.Request) -> web.Response:
+        return web.Response(
+            text=self.metrics.render(), content_type="text/plain", charset="utf-8"
+        )
+
+    async def cog_load(self) -> None:
+        if self.port is None:
+            return
+        app = web.Application()
+        app.router.add_get("/metrics", self.handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, METRICS_HOST, self.port).start()
+        logging.info("Serving metrics on http://%s:%s/metrics", METRICS_HOST, self.port)
+
+    async def cog_unload(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    @commands.command()
+    @commands.has_permissions(administrator=True)
+    async def stats(self, ctx: commands.Context) -> None:
+        """Show latency, queries and errors per command (admin only)."""
+        embed = discord.Embed(title="📊 Command Stats", color=discord.Color.blue())
+        errors: dict[str, int] = defaultdict(int)
+        for (command, _), count in self.metrics.errors.items():
+            errors[command] += count
+        slowest = sorted(
+            self.metrics.commands.items(),
+            key=lambda item: item[1].latency.sum,
+            reverse=True,
+        )
+        for command, stats in slowest[:STATS_COMMANDS]:
+            embed.add_field(
+                name=f"!{command}",
+                value=(
+                    f"📨 {stats.latency.count} calls, {errors[command]} errors\n"
+                    f"⏱️ {stats.latency.mean * 1000:.0f} ms mean, "
+                    f"≤{stats.latency.quantile(0.99) * 1000:.0f} ms p99\n"
+                    f"🗄️ {stats.db.mean * 1000:.0f} ms, "
+                    f"{stats.queries.mean:.1f} queries\n"
+                    f"🌐 {stats.discord.mean * 1000:.0f} ms Discord"
+                ),
+                inline=True,
+            )
+        if not slowest:
+            embed.description = "No commands run yet."
+        await ctx.send(embed=embed)
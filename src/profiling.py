@@ -0,0 +1,231 @@
+"""
+On-demand profiling for admins, without restarting the bot.
+
+`!profile` samples the stacks of every thread from a background thread, so
+the event loop and the threads running database work are both covered, or
+runs cProfile on the loop thread. `!memprofile` compares two tracemalloc
+snapshots taken some seconds apart. Unless the bot runs with
+PYTHONTRACEMALLOC set, tracing starts with the command, so only memory
+allocated during the window is seen.
+"""
+
+import asyncio
+import cProfile
+import io
+import pstats
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+from typing import Optional
+
+import discord
+from discord.ext import commands
+
+# Seconds between stack samples.
+SAMPLE_INTERVAL = 0.005
+# Functions or allocation sites listed in the attached reports.
+TOP = 30
+# Of those, the ones shown in the reply embed.
+EMBED_TOP = 5
+# Longest profiling window, in seconds.
+MAX_SECONDS = 300
+
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    return f"{Path(code.co_filename).name}:{code.co_firstlineno}({code.co_name})"
+
+
+class SamplingProfiler:
+    """Counts the stacks of all other threads every `interval` seconds."""
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL):
+        self.interval = interval
+        # Stacks from the thread name to the innermost frame.
+        self.stacks: Counter[tuple[str, ...]] = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="sampling-profiler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        me = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == me:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_name(frame))
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, str(thread_id)))
+                self.stacks[tuple(reversed(stack))] += 1
+            self.samples += 1
+
+    def top(self, n: int = TOP) -> list[tuple[str, int, int]]:
+        """(function, cumulative samples, own samples), most cumulative first."""
+        cumulative: Counter[str] = Counter()
+        own: Counter[str] = Counter()
+        for stack, count in self.stacks.items():
+            own[stack[-1]] += count
+            for name in set(stack[1:]):
+                cumulative[name] += count
+        return [(name, count, own[name]) for name, count in cumulative.most_common(n)]
+
+    def report(self, n: int = TOP) -> str:
+        lines = [f"{self.samples} samples every {self.interval * 1000:.0f} ms"]
+        lines.append(f"{'cumulative':>10} {'own':>8}  function")
+        lines.extend(
+            f"{cumulative:>10} {own:>8}  {name}"
+            for name, cumulative, own in self.top(n)
+        )
+        return "\n".join(lines) + "\n"
+
+    def collapsed(self) -> str:
+        """Stacks in the collapsed format read by flamegraph.pl and speedscope."""
+        return "".join(
+            f"{';'.join(stack)} {count}\n" for stack, count in self.stacks.items()
+        )
+
+
+def cprofile_report(profile: cProfile.Profile, n: int = TOP) -> str:
+    out = io.StringIO()
+    pstats.Stats(profile, stream=out).sort_stats("cumulative").print_stats(n)
+    return out.getvalue()
+
+
+def _snapshot() -> tracemalloc.Snapshot:
+    return tracemalloc.take_snapshot().filter_traces(
+        (tracemalloc.Filter(False, tracemalloc.__file__),)
+    )
+
+
+def memory_report(
+    before: tracemalloc.Snapshot, after: tracemalloc.Snapshot, n: int = TOP
+) -> str:
+    lines = ["Largest allocation sites:"]
+    lines.extend(str(stat) for stat in after.statistics("lineno")[:n])
+    lines.extend(["", "Growth since the first snapshot:"])
+    lines.extend(str(stat) for stat in after.compare_to(before, "lineno")[:n])
+    return "\n".join(lines) + "\n"
+
+
+def _file(text: str, filename: str) -> discord.File:
+    return discord.File(io.BytesIO(text.encode()), filename=filename)
+
+
+def _error(description: str) -> discord.Embed:
+    return discord.Embed(
+        title="Error", description=description, color=discord.Color.red()
+    )
+
+
+class Profiling(commands.Cog):
+    """Admin commands profiling CPU time and memory for a while."""
+
+    def __init__(self):
+        self._running = False
+        super().__init__()
+
+    async def _start(self, ctx: commands.Context, seconds: int) -> bool:
+        if not 1 <= seconds <= MAX_SECONDS:
+            await ctx.send(embed=_error(f"Profile for 1 to {MAX_SECONDS} seconds."))
+            return False
+        if self._running:
+            await ctx.send(embed=_error("A profile is already running."))
+            return False
+        self._running = True
+        return True
+
+    @commands.command()
+    @commands.has_permissions(administrator=True)
+    async def profile(self, ctx: commands.Context, seconds: int = 10, *options: str):
+        """`!profile [seconds] [sample|cprofile] [--stacks]`, profile the bot (admin only)."""
+        if not await self._start(ctx, seconds):
+            return
+        try:
+            if "cprofile" in options:
+                profile = cProfile.Profile()
+                profile.enable()
+                try:
+                    await asyncio.sleep(seconds)
+                finally:
+                    profile.disable()
+                report = cprofile_report(profile)
+                top = [
+                    f"{pstats.func_std_string(func)}: {stat[3]:.3f}s"
+                    for func, stat in sorted(
+                        pstats.Stats(profile).stats.items(),
+                        key=lambda item: item[1][3],
+                        reverse=True,
+                    )[:EMBED_TOP]
+                ]
+                files = [_file(report, "profile.txt")]
+            else:
+                sampler = SamplingProfiler()
+                sampler.start()
+                try:
+                    await asyncio.sleep(seconds)
+                finally:
+                    await asyncio.to_thread(sampler.stop)
+                top = [
+                    f"{name}: {cumulative / max(sampler.samples, 1):.0%}"
+                    for name, cumulative, _ in sampler.top(EMBED_TOP)
+                ]
+                files = [_file(sampler.report(), "profile.txt")]
+                if "--stacks" in options:
+                    files.append(_file(sampler.collapsed(), "stacks.txt"))
+        finally:
+            self._running = False
+        embed = discord.Embed(
+            title=f"⏱️ Profile of {seconds}s",
+            description="\n".join(f"`{line}`" for line in top) or "Nothing sampled.",
+            color=discord.Color.blue(),
+        )
+        await ctx.send(embed=embed, files=files)
+
+    @commands.command()
+    @commands.has_permissions(administrator=True)
+    async def memprofile(self, ctx: commands.Context, seconds: int = 30):
+        """`!memprofile [seconds]`, largest allocation sites and their growth (admin only)."""
+        if not await self._start(ctx, seconds):
+            return
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        try:
+            before = _snapshot()
+            await asyncio.sleep(seconds)
+            after = _snapshot()
+        finally:
+            if started:
+                tracemalloc.stop()
+            self._running = False
+        growth = after.compare_to(before, "lineno")[:EMBED_TOP]
+        embed = discord.Embed(
+            title=f"🧠 Memory over {seconds}s",
+            description="\n".join(f"`{stat}`" for stat in growth)
+            or "No allocations traced.",
+            color=discord.Color.blue(),
+        )
+        await ctx.send(
+            embed=embed, files=[_file(memory_report(before, after), "memory.txt")]
+        )
+
+
+async def setup(bot: commands.Bot) -> None:
+    await bot.add_cog(Profiling())
@@ -0,0 +1,73 @@
+"""
+Startup check that the database is at the latest migration.
+
+Reading the revision Alembic stamped is a single query, where `create_all`
+inspects every table on each boot. A new database is created from the
+models and stamped with the head revision. An outdated one has to be
+migrated with `alembic upgrade head` first.
+"""
+
+import logging
+from pathlib import Path
+from typing import Optional
+
+from sqlalchemy import Engine, exc, inspect, text
+
+from .models import Base
+
+# Latest revision in alembic/versions, tests/test_schema.py checks it.
+HEAD = "a7c4e2f9b1d3"
+ALEMBIC_INI = Path(__file__).resolve().parent.parent / "alembic.ini"
+VERSION_TABLE = "alembic_version"
+
+
+class SchemaOutdated(RuntimeError):
+    pass
+
+
+def revision(engine: Engine) -> Optional[str]:
+    """The revision the database is stamped with, None without one."""
+    with engine.connect() as conn:
+        try:
+            return conn.execute(
+                text(f"SELECT version_num FROM {VERSION_TABLE}")
+            ).scalar()
+        except exc.DBAPIError:
+            return None
+
+
+def create(engine: Engine) -> None:
+    """Create the tables of all models and stamp them with the head revision."""
+    from alembic.config import Config
+    from alembic.runtime.migration import MigrationContext
+    from alembic.script import ScriptDirectory
+
+    from .achievements import model as _achievements  # noqa: F401
+    from .apis import model as _apis  # noqa: F401
+    from .books import model as _books  # noqa: F401
+    from .genai import model as _genai  # noqa: F401
+
+    script = ScriptDirectory.from_config(Config(str(ALEMBIC_INI)))
+    with engine.begin() as conn:
+        Base.metadata.create_all(conn)
+        MigrationContext.configure(conn).stamp(script, "head")
+
+
+def check(engine: Engine) -> None:
+    """Raise SchemaOutdated unless the database is at HEAD, creating a new one."""
+    current = revision(engine)
+    if current == HEAD:
+        return
+    if current is None:
+        if inspect(engine).get_table_names():
+            raise SchemaOutdated(
+                "The database has no Alembic revision. Run `alembic stamp head` "
+                "if its tables are up to date, otherwise `alembic upgrade head`."
+            )
+        logging.info("Creating the database schema at revision %s", HEAD)
+        create(engine)
+        return
+    raise SchemaOutdated(
+        f"The database is at revision {current}, not {HEAD}. "
+        "Run `alembic upgrade head`."
+    )
@@ -0,0 +1,199 @@
+"""Shard helpers: shard ranges per process and per-shard monitoring."""
+
+import asyncio
+import logging
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Optional
+
+import discord
+from discord.ext import commands
+
+from . import logs
+from .config import Config
+from .metrics import Sample
+
+LOG_INTERVAL = 60
+
+
+def shard_ids(bot: commands.Bot) -> list[int]:
+    """The shard IDs handled by this process."""
+    shards = getattr(bot, "shards", None)
+    if shards:
+        return sorted(shards)
+    return [bot.shard_id or 0]
+
+
+def shard_for_guild(bot: commands.Bot, guild_id: int) -> int:
+    """The shard a guild belongs to, see `discord.Guild.shard_id`."""
+    if not bot.shard_count:
+        return 0
+    return (guild_id >> 22) % bot.shard_count
+
+
+def shard_ranges(shard_count: int, processes: int) -> list[range]:
+    """Split the shards into one contiguous range per process."""
+    processes = min(processes, shard_count)
+    size, extra = divmod(shard_count, processes)
+    ranges = []
+    start = 0
+    for i in range(processes):
+        end = start + size + (1 if i < extra else 0)
+        ranges.append(range(start, end))
+        start = end
+    return ranges
+
+
+def child_environments(config: Config, environ=os.environ) -> list[dict[str, str]]:
+    """The environment of each bot process, one per shard range."""
+    envs = []
+    ranges = shard_ranges(config.shard_count, config.shard_processes)
+    for i, shards in enumerate(ranges):
+        env = dict(
+            environ,
+            BOKCIRKEL_SHARDED="1",
+            BOKCIRKEL_SHARD_IDS=f"{shards.start}-{shards.stop - 1}",
+            BOKCIRKEL_SHARD_PROCESSES="1",
+        )
+        # Processes rotating one file would rename it under each other.
+        if config.log_file != logs.STDOUT:
+            env["BOKCIRKEL_LOG_FILE"] = (
+                f"{config.log_file}.shards-{shards.start}-{shards.stop - 1}"
+            )
+        # Only one process can listen on a port.
+        if config.metrics_port is not None:
+            env["BOKCIRKEL_METRICS_PORT"] = str(config.metrics_port + i)
+        envs.append(env)
+    return envs
+
+
+def launch_processes(config: Config) -> None:
+    """Run one bot process per shard range and wait for all of them."""
+    if config.shard_count is None:
+        raise ValueError("BOKCIRKEL_SHARD_COUNT is required with several processes")
+    children = []
+    for env in child_environments(config):
+        logging.info("Starting process for shards %s", env["BOKCIRKEL_SHARD_IDS"])
+        children.append(subprocess.Popen([sys.executable, *sys.argv], env=env))
+    for child in children:
+        child.wait()
+
+
+@dataclass
+class ShardStats:
+    shard_id: int
+    latency: float
+    events: int
+    events_per_second: float
+
+
+class Shards(commands.Cog):
+    """Logs latency and event rates per shard."""
+
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        self.events: dict[int, int] = defaultdict(int)
+        self._last_events: dict[int, int] = {}
+        self._last_time = time.monotonic()
+        self._rates: dict[int, float] = {}
+        self._task: Optional[asyncio.Task] = None
+        super().__init__()
+
+    def stats(self) -> list[ShardStats]:
+        latencies = dict(getattr(self.bot, "latencies", []))
+        return [
+            ShardStats(
+                shard_id=shard_id,
+                latency=latencies.get(shard_id, self.bot.latency),
+                events=self.events[shard_id],
+                events_per_second=self._rates.get(shard_id, 0.0),
+            )
+            for shard_id in shard_ids(self.bot)
+        ]
+
+    def samples(self) -> list[Sample]:
+        samples = []
+        for s in self.stats():
+            labels = {"shard": str(s.shard_id)}
+            samples.append(Sample("shard_latency_seconds", s.latency, labels))
+            samples.append(Sample("shard_events", s.events, labels))
+        return samples
+
+    def _count(self, guild_id: Optional[int]) -> None:
+        if guild_id is not None:
+            self.events[shard_for_guild(self.bot, guild_id)] += 1
+
+    def _update_rates(self) -> None:
+        now = time.monotonic()
+        elapsed = max(now - self._last_time, 1e-9)
+        for shard_id in shard_ids(self.bot):
+            total = self.events[shard_id]
+            delta = total - self._last_events.get(shard_id, 0)
+            self._rates[shard_id] = delta / elapsed
+            self._last_events[shard_id] = total
+        self._last_time = now
+
+    async def _log_stats(self) -> None:
+        while not self.bot.is_closed():
+            await asyncio.sleep(LOG_INTERVAL)
+            self._update_rates()
+            for s in self.stats():
+                logging.info(
+                    "Shard %s: latency %.0f ms, %.2f events/s",
+                    s.shard_id,
+                    s.latency * 1000,
+                    s.events_per_second,
+                )
+
+    @commands.Cog.listener()
+    async def on_ready(self) -> None:
+        logging.info(
+            "Handling shards %s of %s", shard_ids(self.bot), self.bot.shard_count
+        )
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._log_stats())
+
+    @commands.Cog.listener()
+    async def on_shard_connect(self, shard_id: int) -> None:
+        logging.info("Shard %s connected.", shard_id)
+
+    @commands.Cog.listener()
+    async def on_shard_disconnect(self, shard_id: int) -> None:
+        logging.warning("Shard %s disconnected.", shard_id)
+
+    @commands.Cog.listener()
+    async def on_shard_resumed(self, shard_id: int) -> None:
+        logging.info("Shard %s resumed.", shard_id)
+
+    @commands.Cog.listener()
+    async def on_message(self, message: discord.Message) -> None:
+        self._count(message.guild.id if message.guild else None)
+
+    @commands.Cog.listener()
+    async def on_raw_reaction_add(self, payload: discord.RawReactionActionEvent):
+        self._count(payload.guild_id)
+
+    @commands.Cog.listener()
+    async def on_raw_reaction_remove(self, payload: discord.RawReactionActionEvent):
+        self._count(payload.guild_id)
+
+    @commands.command()
+    @commands.has_permissions(administrator=True)
+    async def shards(self, ctx: commands.Context) -> None:
+        """Show latency and event rates per shard (admin only)."""
+        embed = discord.Embed(title="🛰️ Shards", color=discord.Color.blue())
+        current = ctx.guild.shard_id if ctx.guild else None
+        for s in self.stats():
+            name = f"Shard {s.shard_id}" + (
+                " (this server)" if s.shard_id == current else ""
+            )
+            embed.add_field(
+                name=name,
+                value=f"⏱️ {s.latency * 1000:.0f} ms\n📨 {s.events} events, {s.events_per_second:.2f}/s",
+                inline=True,
+            )
+        await ctx.send(embed=embed)
@@ -0,0 +1,139 @@
+"""
+Event loop stall watchdog.
+
+A task on the loop wakes up every INTERVAL and records how late it woke,
+the loop lag. A thread checks that the task keeps waking up. When it has
+not for THRESHOLD seconds, a callback is blocking the loop, and the thread
+logs the loop thread's stack together with the command that is running.
+"""
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional
+
+from discord.ext import commands
+
+from .metrics import LATENCY_BUCKETS, Histogram, Metrics, Sample
+
+# Seconds between heartbeats of the loop.
+INTERVAL = 0.1
+# The loop is reported stalled after this many seconds without a heartbeat.
+THRESHOLD = 0.5
+# Recent stalls kept for inspection.
+MAX_STALLS = 20
+
+
+@dataclass
+class Stall:
+    # Seconds without a heartbeat when the stack was taken.
+    blocked: float
+    command: Optional[str]
+    task: Optional[str]
+    stack: str
+
+
+class Watchdog(commands.Cog):
+    """Measures event loop lag and logs what blocks the loop."""
+
+    def __init__(
+        self,
+        metrics: Optional[Metrics] = None,
+        interval: float = INTERVAL,
+        threshold: float = THRESHOLD,
+    ):
+        self.metrics = metrics
+        self.interval = interval
+        self.threshold = threshold
+        self.lag = Histogram(LATENCY_BUCKETS)
+        self.max_lag = 0.0
+        self.stall_count = 0
+        self.stalls: deque[Stall] = deque(maxlen=MAX_STALLS)
+        self._beat = time.monotonic()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._sampler: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        super().__init__()
+
+    async def cog_load(self) -> None:
+        self.start()
+
+    async def cog_unload(self) -> None:
+        await self.stop()
+
+    def start(self) -> None:
+        """Start watching the running loop."""
+        self._loop = asyncio.get_running_loop()
+        self._thread_id = threading.get_ident()
+        self._beat = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.create_task(self._heartbeat())
+        self._sampler = threading.Thread(
+            target=self._sample, name="loop-watchdog", daemon=True
+        )
+        self._sampler.start()
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        if self._sampler is not None:
+            await asyncio.to_thread(self._sampler.join)
+
+    async def _heartbeat(self) -> None:
+        while True:
+            started = time.monotonic()
+            await asyncio.sleep(self.interval)
+            self._beat = time.monotonic()
+            lag = max(self._beat - started - self.interval, 0.0)
+            self.lag.observe(lag)
+            self.max_lag = max(self.max_lag, lag)
+
+    def _sample(self) -> None:
+        reported = None
+        while not self._stop.wait(self.interval / 2):
+            beat = self._beat
+            blocked = time.monotonic() - beat
+            # One report per stall, the beat moves on once the loop is free.
+            if blocked >= self.threshold and beat != reported:
+                reported = beat
+                self._report(blocked)
+
+    def _report(self, blocked: float) -> None:
+        frame = sys._current_frames().get(self._thread_id)
+        stack = "".join(traceback.format_stack(frame)) if frame else ""
+        # Read from this thread, the loop is blocked and cannot switch tasks.
+        task = asyncio.current_task(self._loop)
+        timing = self.metrics.running.get(task) if self.metrics and task else None
+        stall = Stall(
+            blocked=blocked,
+            command=timing.command if timing else None,
+            task=task.get_name() if task else None,
+            stack=stack,
+        )
+        self.stalls.append(stall)
+        self.stall_count += 1
+        where = f"!{stall.command}" if stall.command else stall.task or "a callback"
+        logging.warning(
+            "Event loop blocked for %.2fs by %s, stack:\n%s", blocked, where, stack
+        )
+
+    def samples(self) -> list[Sample]:
+        return [
+            Sample("loop_lag_seconds_mean", self.lag.mean),
+            Sample("loop_lag_seconds_max", self.max_lag),
+            Sample("loop_lag_seconds_p99", self.lag.quantile(0.99)),
+            Sample("loop_stalls", self.stall_count),
+        ]
+
+
+async def setup(bot: commands.Bot) -> None:
+    await bot.add_cog(Watchdog(bot.metrics))
@@ -0,0 +1,30 @@
+from contextlib import contextmanager
+
+import pytest
+
+from query_counter import QueryCounter
+from session_guard import SessionGuard
+
+
+@pytest.fixture
+def session_guard():
+    """Run coroutines with `session_guard.run`, fails on sessions held across awaits."""
+    guard = SessionGuard()
+    yield guard
+    assert not guard.held, "\n".join(str(held) for held in guard.held)
+
+
+@pytest.fixture
+def count_queries():
+    """
+    `with count_queries(engine, budget=3):` fails when the block runs more
+    statements than the budget, or the same statement for many rows.
+    """
+
+    @contextmanager
+    def count(engine, budget=None):
+        with QueryCounter(engine) as counter:
+            yield counter
+        counter.check(budget)
+
+    return count
@@ -0,0 +1,76 @@
+"""
+Test hook that counts the SQL statements run on an engine.
+
+Besides the total, it finds SELECT statements run repeatedly with
+different parameters, the signature of an N+1 pattern: a lazy relationship
+loaded once per row of a previous query, instead of for all rows at once.
+Inserts are left out, the ORM inserts rows one at a time on SQLite when it
+needs server defaults back.
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import event
+
+# The same SELECT run this many times with different parameters is
+# reported as an N+1 pattern.
+REPEAT_THRESHOLD = 3
+
+
+@dataclass
+class Repeated:
+    statement: str
+    # Distinct parameter sets the statement was run with.
+    count: int
+
+    def __str__(self) -> str:
+        return f"{self.count}x {' '.join(self.statement.split())}"
+
+
+class QueryCounter:
+    """
+    Use as a context manager around the code under test, the statements it
+    runs end up in `statements`. `check` raises AssertionError when they
+    exceed a budget or contain an N+1 pattern.
+    """
+
+    def __init__(self, engine, repeat_threshold: int = REPEAT_THRESHOLD):
+        self.engine = engine
+        self.repeat_threshold = repeat_threshold
+        self.statements: list[tuple[str, object]] = []
+
+    def __enter__(self) -> "QueryCounter":
+        event.listen(self.engine, "before_cursor_execute", self._before)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        event.remove(self.engine, "before_cursor_execute", self._before)
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append((statement, parameters))
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def repeated(self) -> list[Repeated]:
+        """SELECTs run with at least `repeat_threshold` parameter sets."""
+        parameters: dict[str, set[str]] = defaultdict(set)
+        for statement, params in self.statements:
+            if statement.lstrip().upper().startswith("SELECT"):
+                parameters[statement].add(repr(params))
+        return [
+            Repeated(statement, len(params))
+            for statement, params in parameters.items()
+            if len(params) >= self.repeat_threshold
+        ]
+
+    def check(self, budget: Optional[int] = None) -> None:
+        problems = []
+        if budget is not None and self.count > budget:
+            problems.append(f"{self.count} statements, the budget is {budget}")
+        problems.extend(f"N+1 pattern: {repeated}" for repeated in self.repeated())
+        if problems:
+            raise AssertionError("\n".join(problems))
@@ -0,0 +1,122 @@
+"""
+Test hook that flags database sessions held across awaits.
+
+Tasks created while the guard is installed run their coroutine through a
+wrapper. Each time the coroutine suspends, the guard checks whether the
+task still has a transaction open that it began itself. Such a session
+stays open while other tasks run, pinning a connection and lengthening
+the SQLite transaction.
+"""
+
+import asyncio
+import collections.abc
+import traceback
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+# Frames of the bot and its tests, not of SQLAlchemy or asyncio.
+_ROOT = str(Path(__file__).resolve().parent.parent)
+
+
+@dataclass
+class HeldSession:
+    task: str
+    # Where the transaction was begun, the innermost frame of our code.
+    begun_at: str
+
+    def __str__(self) -> str:
+        return f"Session begun at {self.begun_at} held across an await in {self.task}"
+
+
+def _location() -> str:
+    for frame in reversed(traceback.extract_stack()):
+        if (
+            frame.filename.startswith(_ROOT)
+            and "site-packages" not in frame.filename
+            and frame.filename != __file__
+        ):
+            return f"{Path(frame.filename).name}:{frame.lineno} in {frame.name}"
+    return "unknown location"
+
+
+class _Guarded(collections.abc.Coroutine):
+    def __init__(self, coro, guard: "SessionGuard"):
+        self._coro = coro
+        self._guard = guard
+        self.__name__ = getattr(coro, "__name__", type(coro).__name__)
+        self.__qualname__ = getattr(coro, "__qualname__", self.__name__)
+
+    def send(self, value):
+        result = self._coro.send(value)
+        self._guard._suspended()
+        return result
+
+    def throw(self, *args):
+        result = self._coro.throw(*args)
+        self._guard._suspended()
+        return result
+
+    def close(self):
+        return self._coro.close()
+
+    def __await__(self):
+        return self._coro.__await__()
+
+
+class SessionGuard:
+    """
+    Use as a context manager around `asyncio.run`-like code, or call
+    `run(main)`. Sessions held across awaits end up in `held`.
+    """
+
+    def __init__(self):
+        self.held: list[HeldSession] = []
+        self._open: dict[Session, tuple[asyncio.Task, str]] = {}
+        self._reported: set[int] = set()
+
+    def __enter__(self) -> "SessionGuard":
+        event.listen(Session, "after_begin", self._after_begin)
+        event.listen(Session, "after_transaction_end", self._after_transaction_end)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        event.remove(Session, "after_begin", self._after_begin)
+        event.remove(Session, "after_transaction_end", self._after_transaction_end)
+
+    def run(self, main):
+        """Run a coroutine like `asyncio.run`, with every task guarded."""
+        with self, asyncio.Runner() as runner:
+            runner.get_loop().set_task_factory(self._task_factory)
+            return runner.run(main)
+
+    def _task_factory(self, loop, coro, **kwargs) -> asyncio.Task:
+        return asyncio.Task(_Guarded(coro, self), loop=loop, **kwargs)
+
+    def _after_begin(self, session, transaction, connection) -> None:
+        task = _current_task()
+        if task is not None:
+            self._open[session] = (task, _location())
+
+    def _after_transaction_end(self, session, transaction) -> None:
+        if transaction.parent is None:
+            self._open.pop(session, None)
+
+    def _suspended(self) -> None:
+        task = _current_task()
+        for session, (owner, begun_at) in list(self._open.items()):
+            if owner is task and id(session) not in self._reported:
+                self._reported.add(id(session))
+                self.held.append(
+                    HeldSession(task=task.get_coro().__qualname__, begun_at=begun_at)
+                )
+
+
+def _current_task() -> Optional[asyncio.Task]:
+    try:
+        return asyncio.current_task()
+    except RuntimeError:
+        return None
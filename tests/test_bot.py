@@ -0,0 +1,56 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from discord.ext import commands
+
+from src import gateway
+from src.bot import create_bot
+from src.config import Config, parse_names
+
+
+def test_parse_names():
+    assert parse_names(" books, genai ,") == ("books", "genai")
+    assert parse_names("") is None
+
+
+def loaded_cogs(*cogs):
+    bot = create_bot(Config(cogs=cogs), gateway.profile("minimal"))
+
+    async def setup():
+        await bot.setup_hook()
+        loaded = set(bot.cogs)
+        await bot.close()
+        return loaded
+
+    return asyncio.run(setup())
+
+
+def test_only_enabled_cogs_are_loaded(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    assert loaded_cogs("profiling") == {"Help", "Shards", "Stats", "Profiling"}
+
+
+def test_genai_needs_a_key(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    assert "GenAI" not in loaded_cogs("genai")
+    (tmp_path / ".gemini-api-key").write_text("key")
+    assert "GenAI" in loaded_cogs("genai")
+
+
+def test_unknown_cog(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with pytest.raises(ValueError, match="Unknown cogs"):
+        create_bot(Config(cogs=("books", "music")), gateway.profile("minimal"))
+
+
+def test_command_errors_are_logged(tmp_path, monkeypatch, caplog):
+    monkeypatch.chdir(tmp_path)
+    bot = create_bot(Config(cogs=()), gateway.profile("minimal"))
+    ctx = SimpleNamespace(command=SimpleNamespace(qualified_name="book"))
+    error = commands.CommandInvokeError(FileNotFoundError("no key"))
+    asyncio.run(bot.on_command_error(ctx, error))
+    [record] = caplog.records
+    assert record.levelname == "ERROR"
+    assert "book" in record.getMessage()
+    assert record.exc_info[1] is error.original
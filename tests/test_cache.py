@@ -0,0 +1,173 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from src.apis.cache import BookCache
+from src.apis.library import Book, HardcoverError
+from src.apis.model import BookMetadataCache
+from src.apis.resilience import CircuitOpenError
+from src.models import Base
+
+DUNE = Book("Dune", "Frank Herbert", 1965, 412, 4.3, None)
+
+
+class Clock:
+    def __init__(self):
+        self.now = datetime(2026, 1, 1)
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += timedelta(seconds=seconds)
+
+
+class Fetch:
+    def __init__(self, books):
+        self.books = books
+        self.calls = []
+
+    async def __call__(self, query):
+        self.calls.append(query)
+        await asyncio.sleep(0)
+        book = self.books.get(query.casefold())
+        return [book] if book else []
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite:///:memory:", echo=False)
+    Base.metadata.create_all(engine)
+    return engine
+
+
+def test_repeated_lookups_hit_the_cache(engine):
+    fetch = Fetch({"dune": DUNE})
+    cache = BookCache(engine, fetch)
+
+    async def run():
+        assert await cache.get("Dune") == [DUNE]
+        assert await cache.get("  dune ") == [DUNE]
+
+    asyncio.run(run())
+    assert fetch.calls == ["Dune"]
+    assert cache.stats.hits == 1
+
+
+def test_lookups_survive_restarts(engine):
+    asyncio.run(BookCache(engine, Fetch({"dune": DUNE})).get("Dune"))
+    fetch = Fetch({})
+    assert asyncio.run(BookCache(engine, fetch).get("dune")) == [DUNE]
+    assert fetch.calls == []
+
+
+def test_missing_books_are_cached_until_negative_ttl(engine):
+    clock = Clock()
+    fetch = Fetch({})
+    cache = BookCache(engine, fetch, negative_ttl=60, clock=clock)
+    assert asyncio.run(cache.get("nothing")) == []
+    assert asyncio.run(cache.get("nothing")) == []
+    assert len(fetch.calls) == 1
+    clock.advance(61)
+    assert asyncio.run(cache.get("nothing")) == []
+    assert len(fetch.calls) == 2
+
+
+def test_stale_entries_are_served_while_refreshing(engine):
+    clock = Clock()
+    fetch = Fetch({"dune": DUNE})
+    cache = BookCache(engine, fetch, ttl=60, stale_ttl=600, clock=clock)
+
+    async def run():
+        await cache.get("dune")
+        clock.advance(120)
+        fetch.books["dune"] = Book("Dune", "Frank Herbert", 1965, 500, 4.5, None)
+        assert (await cache.get("dune"))[0].pages == 412
+        await asyncio.sleep(0.01)
+        assert (await cache.get("dune"))[0].pages == 500
+
+    asyncio.run(run())
+    assert cache.stats.stale_hits == 1
+    assert len(fetch.calls) == 2
+
+
+def test_concurrent_misses_share_one_request(engine):
+    fetch = Fetch({"dune": DUNE})
+    cache = BookCache(engine, fetch)
+
+    async def run():
+        return await asyncio.gather(*(cache.get("dune") for _ in range(5)))
+
+    assert asyncio.run(run()) == [[DUNE]] * 5
+    assert len(fetch.calls) == 1
+
+
+def test_cancelled_lookup_does_not_cancel_the_others(engine):
+    fetch = Fetch({"dune": DUNE})
+    cache = BookCache(engine, fetch)
+
+    async def run():
+        first = asyncio.create_task(cache.get("dune"))
+        second = asyncio.create_task(cache.get("dune"))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(run()) == [DUNE]
+    assert len(fetch.calls) == 1
+    assert asyncio.run(cache.get("dune")) == [DUNE]
+    assert len(fetch.calls) == 1
+
+
+def test_memory_tier_is_bounded(engine):
+    cache = BookCache(engine, Fetch({}), max_size=2)
+
+    async def run():
+        for query in ["a", "b", "c"]:
+            await cache.get(query)
+
+    asyncio.run(run())
+    assert len(cache) == 2
+
+
+def test_expired_entries_are_served_when_lookups_fail(engine):
+    clock = Clock()
+    fetch = Fetch({"dune": DUNE})
+    cache = BookCache(engine, fetch, ttl=60, stale_ttl=600, clock=clock)
+    asyncio.run(cache.get("dune"))
+    clock.advance(601)
+
+    async def fail(query):
+        raise CircuitOpenError("down")
+
+    cache.fetch = fail
+    assert asyncio.run(cache.get("dune")) == [DUNE]
+    assert cache.stats.fallbacks == 1
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(cache.get("unknown"))
+
+
+def test_api_errors_are_not_cached_as_missing(engine):
+    clock = Clock()
+    fetch = Fetch({"dune": DUNE})
+    cache = BookCache(engine, fetch, ttl=60, stale_ttl=600, clock=clock)
+
+    async def fail(query):
+        raise HardcoverError("Hardcover API returned errors: [...]")
+
+    cache.fetch = fail
+    with pytest.raises(HardcoverError):
+        asyncio.run(cache.get("dune"))
+    assert len(cache) == 0
+    with Session(engine) as session:
+        assert session.get(BookMetadataCache, "dune") is None
+
+    cache.fetch = fetch
+    assert asyncio.run(cache.get("dune")) == [DUNE]
+    clock.advance(601)
+    cache.fetch = fail
+    assert asyncio.run(cache.get("dune")) == [DUNE]
+    assert cache.stats.fallbacks == 1
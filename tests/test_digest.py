@@ -0,0 +1,98 @@
+import asyncio
+
+import discord
+import pytest
+from blinker import signal
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.achievements.listener import announce
+from src.books.digest import Digest, DigestSettings
+from src.books.model import Base, Book, BookClub, BookState
+from src.books.service import BookCircleService
+
+
+class DummyChannel:
+    id = 1
+
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, embed):
+        self.sent.append(embed)
+
+
+class DummyContext:
+    def __init__(self, channel):
+        self.channel = channel
+
+    async def send(self, embed):
+        await self.channel.send(embed=embed)
+
+
+class DummyBot:
+    def __init__(self, channel):
+        self.channel = channel
+
+    def get_channel(self, id):
+        return self.channel if id == self.channel.id else None
+
+
+@pytest.fixture
+def service():
+    engine = create_engine("sqlite:///:memory:", echo=False)
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as session:
+        club = BookClub(id=1, state=BookState.READING, target="Ch 1")
+        club.book = Book(title="Dune", author="Frank Herbert")
+        session.add(club)
+        session.commit()
+    return BookCircleService(engine)
+
+
+def test_digest_collects_events_until_max_events(service):
+    channel = DummyChannel()
+    ctx = DummyContext(channel)
+
+    async def run():
+        digest = Digest(DummyBot(channel), service)
+        await digest.configure(1, DigestSettings(interval=3600, max_events=4))
+        await signal("read").send_async(None, ctx=ctx, user_id=1, progress="p. 10")
+        await signal("read").send_async(None, ctx=ctx, user_id=1, progress="p. 20")
+        await signal("notes").send_async(None, ctx=ctx, user_id=2)
+        assert channel.sent == []
+        await announce(ctx, 1, discord.Embed(title="User1 unlocks achievement: X"))
+        await asyncio.sleep(0)
+
+    asyncio.run(run())
+    assert len(channel.sent) == 1
+    fields = {f.name: f.value for f in channel.sent[0].fields}
+    assert fields["📈 Progress"] == "<@1>: p. 20"
+    assert fields["🗒️ Notes"] == "1 new"
+    assert fields["🏆 Achievements"] == "User1 unlocks achievement: X"
+
+
+def test_digest_is_flushed_on_shutdown(service):
+    channel = DummyChannel()
+    ctx = DummyContext(channel)
+
+    async def run():
+        digest = Digest(DummyBot(channel), service)
+        await digest.configure(1, DigestSettings(interval=3600, max_events=100))
+        await signal("caught_up").send_async(None, ctx=ctx, user_id=1)
+        await digest.flush_all()
+
+    asyncio.run(run())
+    assert len(channel.sent) == 1
+
+
+def test_achievements_are_sent_without_digest(service):
+    channel = DummyChannel()
+
+    async def run():
+        Digest(DummyBot(channel), service)
+        await announce(DummyContext(channel), 1, discord.Embed(title="Unlocked"))
+
+    asyncio.run(run())
+    assert [e.title for e in channel.sent] == ["Unlocked"]
@@ -0,0 +1,100 @@
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from src.apis.library import Book as BookInfo
+from src.books.enrichment import Enrichment
+from src.books.model import Book, BookClub, SuggestedBook, User
+from src.books.service import BookCircleService
+from src.models import Base
+
+DUNE = BookInfo("Dune", "Frank Herbert", 1965, 412, 4.3, "https://example.com/d.jpg")
+
+
+class SearchMany:
+    def __init__(self, books, fail=()):
+        self.books = books
+        self.fail = fail
+        self.calls = []
+
+    async def __call__(self, queries):
+        self.calls.append(queries)
+        await asyncio.sleep(0)
+        if any(query in self.fail for query in queries):
+            raise LookupError("boom")
+        return [[self.books[q]] if q in self.books else [] for q in queries]
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite:///:memory:", echo=False)
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(User(id=1, name="alice"))
+        # The suggestion has no relationship to order its insert after the user.
+        session.flush()
+        session.add_all(
+            [
+                Book(id=1, title="Dune", author="Frank Herbert", pages=999),
+                Book(id=2, title="Update me", author="Unknown"),
+                Book(id=3, title="Complete", year=1, pages=1, rating=1, img_url="x"),
+                Book(id=4, title="Missing", author="Unknown"),
+            ]
+        )
+        session.add(SuggestedBook(id=1, title="Dune", suggester_id=1))
+        session.commit()
+    return engine
+
+
+def test_fills_only_missing_fields(engine):
+    search = SearchMany({"Dune Frank Herbert": DUNE, "Dune": DUNE})
+    progress = asyncio.run(Enrichment(engine, search).run())
+    assert (progress.total, progress.updated, progress.not_found) == (3, 2, 1)
+    assert progress.failed == 0 and not progress.running
+    assert search.calls == [["Dune Frank Herbert", "Missing", "Dune"]]
+    with Session(engine) as session:
+        book = session.get(Book, 1)
+        assert (book.year, book.pages, book.rating) == (1965, 999, 4.3)
+        suggestion = session.get(SuggestedBook, 1)
+        assert (suggestion.year, suggestion.pages) == (1965, 412)
+        assert session.get(Book, 2).year is None
+
+
+def test_batches_and_reports_failures(engine):
+    search = SearchMany({"Dune": DUNE}, fail={"Missing"})
+    progress = asyncio.run(Enrichment(engine, search, batch_size=1).run())
+    assert len(search.calls) == 3
+    assert (progress.done, progress.updated, progress.failed) == (3, 1, 1)
+    assert "Missing" in progress.errors[0]
+
+
+def test_suggestions_are_prefetched_and_applied_offline(engine):
+    search = SearchMany({"Dune": DUNE})
+    enrichment = Enrichment(engine, search)
+    service = BookCircleService(engine)
+    with Session(engine) as session:
+        session.add(BookClub(id=1, book_id=2))
+        session.commit()
+
+    async def run():
+        for title in ["Dune", "Unknown Book"]:
+            service.suggest_book(1, title, prefetch=enrichment.prefetch)
+        await enrichment._prefetch_task
+
+    asyncio.run(run())
+    # Both new suggestions share one request.
+    assert search.calls == [["Dune", "Unknown Book"]]
+    suggestion = service.get_suggested_books().value[1]
+    assert (suggestion.year, suggestion.pages) == (1965, 412)
+
+    search.fail = {"Dune"}
+    assert isinstance(
+        service.pop_suggested_book(1, suggestion.id).value,
+        BookCircleService.BookAppliedToClub,
+    )
+    assert len(search.calls) == 1
+    with Session(engine) as session:
+        book = session.get(Book, 2)
+        assert (book.title, book.year, book.img_url) == ("Dune", 1965, DUNE.img_url)
@@ -0,0 +1,55 @@
+import asyncio
+
+import discord
+import pytest
+
+from src import gateway
+
+
+def test_minimal_profile_skips_presences_and_members():
+    profile = gateway.profile("minimal")
+    assert profile.intents.message_content
+    assert profile.intents.guild_reactions
+    assert not profile.intents.presences
+    assert not profile.intents.members
+    assert not profile.chunk_guilds_at_startup
+    assert profile.member_cache_flags.value == 0
+
+
+def test_full_profile_matches_old_behaviour():
+    profile = gateway.profile("full")
+    assert profile.intents == discord.Intents.all()
+    assert profile.chunk_guilds_at_startup
+
+
+def test_unknown_profile():
+    with pytest.raises(ValueError):
+        gateway.profile("everything")
+
+
+class DummyGuild:
+    id = 1
+
+    def __init__(self, cached, remote):
+        self.cached = cached
+        self.remote = remote
+        self.fetched = []
+
+    def get_member(self, user_id):
+        return self.cached.get(user_id)
+
+    async def fetch_member(self, user_id):
+        self.fetched.append(user_id)
+        if user_id not in self.remote:
+            raise discord.NotFound(
+                type("Response", (), {"status": 404, "reason": ""}), ""
+            )
+        return self.remote[user_id]
+
+
+def test_resolve_member_falls_back_to_fetch():
+    guild = DummyGuild(cached={1: "cached"}, remote={2: "fetched"})
+    assert asyncio.run(gateway.resolve_member(guild, 1)) == "cached"
+    assert asyncio.run(gateway.resolve_member(guild, 2)) == "fetched"
+    assert asyncio.run(gateway.resolve_member(guild, 3)) is None
+    assert guild.fetched == [2, 3]
@@ -0,0 +1,151 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from src.books.model import Book, BookClub, BookClubReader, Note, User
+from src.genai import cog as genai_cog
+from src.genai.cache import OutputCache
+from src.genai.cog import GenAI
+from src.genai.llm import FakeModel
+from src.genai.model import GeneratedText
+from src.models import Base
+
+
+class Message:
+    def __init__(self, embed):
+        self.embeds = [embed]
+
+    async def edit(self, embed):
+        self.embeds.append(embed)
+
+
+class Context:
+    def __init__(self, channel_id):
+        self.channel = SimpleNamespace(id=channel_id)
+        self.guild = SimpleNamespace(id=1)
+        self.messages = []
+
+    async def send(self, embed):
+        self.messages.append(Message(embed))
+        return self.messages[-1]
+
+
+@pytest.fixture
+def engine(tmp_path):
+    # A file, the notes are read from a worker thread.
+    engine = create_engine(f"sqlite:///{tmp_path / 'app.db'}", echo=False)
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(BookClub(id=1, book=Book(title="Dune", author="Frank Herbert")))
+        session.commit()
+    return engine
+
+
+def test_output_is_streamed_into_the_placeholder(engine, monkeypatch):
+    monkeypatch.setattr(genai_cog, "EDIT_INTERVAL", 0.05)
+    llm = FakeModel(["Hello", " there", " reader"], delay=0.03)
+    ctx = Context(1)
+    cog = GenAI(None, engine, llm)
+    asyncio.run(cog.generate(ctx, "{book_title}", "T", "test"))
+
+    assert llm.prompts == ["Dune"]
+    assert cog.scheduler.stats.guild(1).output_tokens == 3
+    [message] = ctx.messages
+    descriptions = [embed.description for embed in message.embeds]
+    assert descriptions[0] == "Generating test, please wait..."
+    assert descriptions[1] == "Hello ▌"
+    assert descriptions[-1] == "Hello there reader"
+    # Edits are throttled, not one per piece.
+    assert len(descriptions) < 5
+
+
+def test_unknown_club(engine):
+    ctx = Context(2)
+    llm = FakeModel()
+    asyncio.run(GenAI(None, engine, llm).generate(ctx, "{book_title}", "T", "test"))
+    assert ctx.messages[0].embeds[0].title == "📚 Book Club Not Found"
+    assert llm.prompts == []
+
+
+def test_missing_api_key(engine):
+    class NoKey(FakeModel):
+        async def stream(self, prompt):
+            raise FileNotFoundError()
+            yield
+
+    ctx = Context(1)
+    asyncio.run(GenAI(None, engine, NoKey()).generate(ctx, "{book_title}", "T", "x"))
+    assert ctx.messages[0].embeds[-1].title == "❌ Gemini API Error"
+
+
+def test_outputs_are_cached_per_book(engine):
+    llm = FakeModel(["A playlist"])
+
+    async def run():
+        cog = GenAI(None, engine, llm)
+        await cog.generate(Context(1), "{book_title}", "T", "test")
+        await cog.generate(Context(1), "{book_title}", "T", "test")
+        await cog.generate(Context(1), "{book_title}", "T", "test", fresh=True)
+        # Survives a restart.
+        ctx = Context(1)
+        await GenAI(None, engine, llm).generate(ctx, "{book_title}", "T", "test")
+        return cog, ctx
+
+    cog, ctx = asyncio.run(run())
+    assert len(llm.prompts) == 2
+    assert (cog.cache.stats.hits, cog.cache.stats.misses) == (1, 1)
+    assert ctx.messages[0].embeds[0].description == "A playlist"
+
+
+def test_concurrent_requests_share_one_generation(engine):
+    llm = FakeModel(["Shared", " text"], delay=0.01)
+
+    async def run():
+        cog = GenAI(None, engine, llm)
+        contexts = [Context(1) for _ in range(3)]
+        await asyncio.gather(
+            *(cog.generate(ctx, "{book_title}", "T", "test") for ctx in contexts)
+        )
+        return cog, contexts
+
+    cog, contexts = asyncio.run(run())
+    assert len(llm.prompts) == 1
+    assert cog.cache.stats.coalesced == 2
+    for ctx in contexts:
+        assert ctx.messages[0].embeds[-1].description == "Shared text"
+
+
+def test_cache_is_bounded(engine):
+    cache = OutputCache(engine, max_size=1, max_rows=2)
+
+    async def run():
+        for key in "abc":
+            await cache.generate(key, lambda: asyncio.sleep(0, result=key))
+
+    asyncio.run(run())
+    assert len(cache) == 1
+    with Session(engine) as session:
+        assert session.query(GeneratedText).count() == 2
+
+
+def test_summary_of_notes(engine):
+    with Session(engine) as session:
+        session.add(User(id=1, name="alice"))
+        session.add(BookClubReader(id=1, book_club_id=1, user_id=1))
+        session.add(Note(book_club_reader_id=1, text="Spice must flow"))
+        session.commit()
+    llm = FakeModel(["Summary"])
+    ctx = Context(1)
+    cog = GenAI(None, engine, llm)
+    asyncio.run(cog.summary.callback(cog, ctx))
+
+    # One chunk summarized, then the partials combined.
+    assert len(llm.prompts) == 2
+    assert "alice noted: Spice must flow" in llm.prompts[0]
+    assert ctx.messages[0].embeds[-1].description == "Summary"
+    # Both model calls went through the scheduler.
+    assert cog.scheduler.stats.total.calls == 2
+    assert cog.scheduler.stats.total.output_tokens == 2
@@ -0,0 +1,43 @@
+import asyncio
+
+from src.books.guild_roles import GuildRoles
+
+
+class DummyRole:
+    def __init__(self, name):
+        self.name = name
+
+
+class DummyGuild:
+    active = 0
+    max_active = 0
+
+    def __init__(self, id, role_names):
+        self.id = id
+        self.roles = [DummyRole(n) for n in role_names]
+
+    async def create_role(self, name, **kwargs):
+        DummyGuild.active += 1
+        DummyGuild.max_active = max(DummyGuild.max_active, DummyGuild.active)
+        await asyncio.sleep(0)
+        self.roles.append(DummyRole(name))
+        DummyGuild.active -= 1
+
+
+def test_reconcile_creates_missing_roles_with_bounded_concurrency():
+    guilds = [DummyGuild(i, ["A"]) for i in range(10)]
+    guild_roles = GuildRoles({"A", "B", "C"}, concurrency=3)
+    asyncio.run(guild_roles.reconcile(guilds))
+    for guild in guilds:
+        assert sorted(r.name for r in guild.roles) == ["A", "B", "C"]
+    assert DummyGuild.max_active <= 3
+
+
+def test_role_map_is_cached_until_invalidated():
+    guild = DummyGuild(1, ["A", "Other"])
+    guild_roles = GuildRoles({"A", "B"})
+    assert set(guild_roles.get(guild)) == {"A"}
+    guild.roles.append(DummyRole("B"))
+    assert set(guild_roles.get(guild)) == {"A"}
+    guild_roles.invalidate(guild.id)
+    assert set(guild_roles.get(guild)) == {"A", "B"}
@@ -0,0 +1,186 @@
+import asyncio
+
+import aiohttp
+import pytest
+from aiohttp import web
+
+from src.apis import library
+from src.apis.resilience import Resilience
+
+DUNE = {
+    "title": "Dune",
+    "contributions": [{"author": {"name": "Frank Herbert"}}],
+    "release_year": 1965,
+    "pages": 412,
+    "rating": 4.3,
+    "image": {"url": "https://example.com/dune.jpg"},
+}
+
+
+async def serve(handler):
+    """Start a stub GraphQL server, returns the runner and its URL."""
+    app = web.Application()
+    app.router.add_post("/v1/graphql", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}/v1/graphql"
+
+
+def search_handler(documents, requests):
+    async def handler(request):
+        body = await request.json()
+        requests.append((request.headers["authorization"], body))
+        hits = [{"document": doc} for doc in documents]
+        return web.json_response({"data": {"search": {"results": {"hits": hits}}}})
+
+    return handler
+
+
+def run_against(handler, test):
+    async def run():
+        runner, url = await serve(handler)
+        client = library.HardcoverClient(
+            "secret", url=url, resilience=Resilience(max_wait=0)
+        )
+        try:
+            return await test(client)
+        finally:
+            await client.close()
+            await runner.cleanup()
+
+    return asyncio.run(run())
+
+
+def test_fetch_book_parses_first_hit():
+    requests = []
+    book = run_against(search_handler([DUNE], requests), lambda c: c.fetch_book("dune"))
+    assert book == library.Book(
+        title="Dune",
+        author="Frank Herbert",
+        year=1965,
+        pages=412,
+        rating=4.3,
+        img_url="https://example.com/dune.jpg",
+    )
+    assert requests[0][0] == "secret"
+    assert requests[0][1]["variables"] == {"query": "dune", "per_page": 1}
+
+
+def test_search_books_returns_all_hits_in_one_request():
+    requests = []
+    messiah = dict(DUNE, title="Dune Messiah", release_year=1969)
+    books = run_against(
+        search_handler([DUNE, messiah], requests), lambda c: c.search_books("dune")
+    )
+    assert [b.title for b in books] == ["Dune", "Dune Messiah"]
+    assert len(requests) == 1
+    assert requests[0][1]["variables"]["per_page"] == library.SEARCH_LIMIT
+
+
+def test_fetch_book_without_hits():
+    assert run_against(search_handler([], []), lambda c: c.fetch_book("x")) is None
+
+
+def test_requests_share_one_session():
+    async def test(client):
+        await asyncio.gather(*(client.fetch_book(f"q{i}") for i in range(5)))
+        return client.session()
+
+    requests = []
+    session = run_against(search_handler([DUNE], requests), test)
+    assert len(requests) == 5
+    assert session.closed
+
+
+def test_http_errors_are_raised():
+    async def handler(request):
+        return web.Response(status=503)
+
+    with pytest.raises(aiohttp.ClientResponseError):
+        run_against(handler, lambda c: c.fetch_book("dune"))
+
+
+def test_server_errors_are_retried():
+    requests = []
+    search = search_handler([DUNE], requests)
+
+    async def handler(request):
+        if not requests:
+            requests.append(None)
+            return web.Response(status=429)
+        return await search(request)
+
+    async def test(client):
+        return await client.fetch_book("dune"), client.resilience.stats()
+
+    book, stats = run_against(handler, test)
+    assert book.title == "Dune"
+    assert len(requests) == 2
+    assert stats.retries == 1 and stats.failures == 0
+
+
+def test_client_errors_are_not_retried():
+    calls = []
+
+    async def handler(request):
+        calls.append(request)
+        return web.Response(status=400)
+
+    with pytest.raises(aiohttp.ClientResponseError):
+        run_against(handler, lambda c: c.fetch_book("dune"))
+    assert len(calls) == 1
+
+
+def test_graphql_errors_are_raised_and_count_as_failures():
+    calls = []
+
+    async def handler(request):
+        calls.append(request)
+        return web.json_response({"errors": [{"message": "Internal error"}]})
+
+    async def test(client):
+        with pytest.raises(library.HardcoverError):
+            await client.search_books("dune")
+        return client.resilience.stats()
+
+    stats = run_against(handler, test)
+    assert len(calls) == 3
+    assert stats.failures == 1
+
+
+def test_slow_responses_time_out():
+    async def handler(request):
+        await asyncio.sleep(1)
+        return web.json_response({})
+
+    async def test(client):
+        client.timeout = aiohttp.ClientTimeout(total=0.1)
+        return await client.fetch_book("dune")
+
+    with pytest.raises(asyncio.TimeoutError):
+        run_against(handler, test)
+
+
+def test_search_many_aliases_queries_in_one_request():
+    requests = []
+
+    async def handler(request):
+        body = await request.json()
+        requests.append(body)
+        hits = {"dune": [{"document": DUNE}], "nothing": []}
+        return web.json_response(
+            {
+                "data": {
+                    f"b{i}": {"results": {"hits": hits[body["variables"][f"q{i}"]]}}
+                    for i in range(2)
+                }
+            }
+        )
+
+    results = run_against(handler, lambda c: c.search_many(["dune", "nothing"]))
+    assert [[b.title for b in books] for books in results] == [["Dune"], []]
+    assert len(requests) == 1
+    assert "b1: search(query: $q1" in requests[0]["query"]
@@ -0,0 +1,66 @@
+import json
+import logging
+
+import pytest
+
+from src import logs
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    path = tmp_path / "bokcirkel.log"
+    listener = logs.setup(str(path), max_bytes=2000, backups=2)
+    yield path, listener
+    listener.stop()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    for handler in handlers:
+        root.addHandler(handler)
+    root.setLevel(level)
+
+
+def flush(listener):
+    listener.stop()
+    listener.start()
+
+
+def lines(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_records_are_json_lines_with_context(log_file):
+    path, listener = log_file
+    with logs.context(command="progress", guild=42):
+        logging.info("Progress of %s", "Dune")
+    logging.info("Outside")
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logging.exception("Failed")
+    flush(listener)
+    inside, outside, failed = lines(path)
+    assert inside["message"] == "Progress of Dune"
+    assert (inside["command"], inside["guild"]) == ("progress", 42)
+    assert "command" not in outside
+    assert failed["level"] == "ERROR"
+    assert "ValueError: boom" in failed["exception"]
+
+
+def test_disabled_levels_do_not_format(log_file):
+    class Expensive:
+        def __str__(self):
+            raise AssertionError("formatted")
+
+    logging.debug("Data: %s", Expensive())
+
+
+def test_file_rotates_by_size(log_file):
+    path, listener = log_file
+    for i in range(100):
+        logging.info("Line %d", i)
+    flush(listener)
+    assert path.with_name("bokcirkel.log.1").exists()
+    assert not path.with_name("bokcirkel.log.3").exists()
+    assert path.stat().st_size <= 2000
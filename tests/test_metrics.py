@@ -0,0 +1,128 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from src import metrics
+from src.apis.resilience import BreakerState, ResilienceStats
+from src.metrics import Histogram, Metrics, Sample, Stats
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class Context:
+    def __init__(self):
+        self.embeds = []
+
+    async def send(self, embed):
+        self.embeds.append(embed)
+
+
+def test_histogram_buckets_and_quantiles():
+    histogram = Histogram((0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 5.0):
+        histogram.observe(value)
+
+    assert list(histogram.cumulative()) == [("0.1", 2), ("1.0", 3), ("+Inf", 4)]
+    assert histogram.mean == 5.65 / 4
+    assert histogram.quantile(0.5) == 0.1
+    assert histogram.quantile(0.75) == 1.0
+    assert histogram.quantile(0.99) == 1.0
+
+
+def test_queries_and_time_are_attributed_to_the_running_command():
+    clock = Clock()
+    registry = Metrics(clock)
+    engine = create_engine("sqlite:///:memory:")
+    registry.instrument_engine(engine)
+
+    class Http:
+        async def request(self, route):
+            clock.now += 0.2
+            return route
+
+    http = Http()
+    registry.instrument_http(http)
+
+    async def command():
+        with registry.command("read"):
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+                conn.execute(text("SELECT 2"))
+            assert await http.request("route") == "route"
+            metrics.error("reply")
+            clock.now += 0.1
+
+    asyncio.run(command())
+    # Outside a command nothing is recorded.
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 3"))
+    metrics.error("reply")
+
+    read = registry.commands["read"]
+    assert read.queries.sum == 2
+    assert read.latency.sum == pytest.approx(0.3)
+    assert read.discord.sum == pytest.approx(0.2)
+    assert registry.errors == {("read", "reply"): 1}
+
+
+def test_failing_statements_leave_nothing_on_the_connection():
+    registry = Metrics()
+    engine = create_engine("sqlite:///:memory:")
+    registry.instrument_engine(engine)
+    with registry.command("add"):
+        with engine.connect() as conn:
+            for _ in range(3):
+                with pytest.raises(Exception):
+                    conn.execute(text("SELECT * FROM missing"))
+            conn.execute(text("SELECT 1"))
+            assert dict(conn.info) == {}
+    assert registry.commands["add"].queries.sum == 1
+
+
+def test_render_includes_commands_errors_and_collected_stats():
+    registry = Metrics()
+    with registry.command("book"):
+        pass
+    registry.count_error("book", "CommandOnCooldown")
+    stats = ResilienceStats(
+        state=BreakerState.OPEN, failures=5, trips=1, rejected=2, retries=3, throttled=0
+    )
+    registry.register(lambda: metrics.stats_samples("hardcover", stats))
+    registry.register(lambda: [Sample("shard_events", 7, {"shard": "0"})])
+
+    lines = registry.render().splitlines()
+    assert 'bokcirkel_command_duration_seconds_count{command="book"} 1' in lines
+    assert 'bokcirkel_command_queries_bucket{command="book",le="0"} 1' in lines
+    assert (
+        'bokcirkel_command_errors_total{command="book",kind="CommandOnCooldown"} 1'
+        in lines
+    )
+    assert 'bokcirkel_hardcover_state{state="open"} 1' in lines
+    assert "bokcirkel_hardcover_trips 1" in lines
+    assert 'bokcirkel_shard_events{shard="0"} 7' in lines
+
+
+def test_stats_command_lists_commands():
+    registry = Metrics()
+    with registry.command("read"):
+        pass
+    registry.count_error("read", "service")
+    cog = Stats(registry)
+    ctx = Context()
+    asyncio.run(cog.stats.callback(cog, ctx))
+
+    [embed] = ctx.embeds
+    [field] = embed.fields
+    assert field.name == "!read"
+    assert "1 calls, 1 errors" in field.value
+
+    response = asyncio.run(cog.handle(SimpleNamespace()))
+    assert "bokcirkel_command_duration_seconds_count" in response.text
@@ -0,0 +1,87 @@
+import asyncio
+import time
+
+from src.profiling import Profiling, SamplingProfiler
+
+
+class Context:
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, embed=None, files=()):
+        self.sent.append((embed, list(files)))
+
+
+def busy_work():
+    deadline = time.monotonic() + 0.2
+    while time.monotonic() < deadline:
+        sum(range(1000))
+
+
+def test_sampling_profiler_finds_the_busy_function():
+    profiler = SamplingProfiler(interval=0.002)
+    profiler.start()
+    busy_work()
+    profiler.stop()
+
+    assert profiler.samples > 10
+    [(name, cumulative, _)] = [
+        row for row in profiler.top(100) if "busy_work" in row[0]
+    ]
+    assert cumulative > profiler.samples / 2
+    assert "busy_work" in profiler.report()
+    assert any(
+        "busy_work" in line and line.rsplit(" ", 1)[1].isdigit()
+        for line in profiler.collapsed().splitlines()
+    )
+
+
+def test_profile_command_attaches_reports():
+    cog = Profiling()
+    ctx = Context()
+
+    async def main():
+        task = asyncio.create_task(cog.profile.callback(cog, ctx, 1, "--stacks"))
+        await asyncio.sleep(0.1)
+        # A second profile is refused while the first runs.
+        await cog.profile.callback(cog, ctx, 1)
+        busy_work()
+        await task
+
+    asyncio.run(main())
+
+    (refused, _), (embed, files) = ctx.sent
+    assert refused.description == "A profile is already running."
+    assert [f.filename for f in files] == ["profile.txt", "stacks.txt"]
+    assert "busy_work" in files[0].fp.read().decode()
+
+
+def test_cprofile_and_memprofile():
+    cog = Profiling()
+    ctx = Context()
+
+    async def allocate():
+        await asyncio.sleep(0.05)
+        return [bytearray(1000) for _ in range(1000)]
+
+    async def main():
+        task = asyncio.create_task(allocate())
+        await cog.memprofile.callback(cog, ctx, 1)
+        await cog.profile.callback(cog, ctx, 1, "cprofile")
+        await task
+
+    asyncio.run(main())
+
+    (memory, [memory_file]), (profile, [profile_file]) = ctx.sent
+    assert "test_profiling.py" in memory_file.fp.read().decode()
+    assert "cumulative" in profile_file.fp.read().decode()
+
+
+def test_profile_window_is_bounded():
+    cog = Profiling()
+    ctx = Context()
+    asyncio.run(cog.profile.callback(cog, ctx, 0))
+
+    [(embed, files)] = ctx.sent
+    assert embed.title == "Error"
+    assert not files
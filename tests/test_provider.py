@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine
+
+from src.apis.library import Book
+from src.apis.provider import FixtureProvider, HardcoverProvider
+from src.books.cog import BookCircle
+from src.models import Base
+
+DUNE = Book("Dune", "Frank Herbert", 1965, 412, 4.3, None)
+MESSIAH = Book("Dune Messiah", "Frank Herbert", 1969, 256, 3.9, None)
+
+
+def test_hardcover_key_is_read_on_first_lookup():
+    loads = []
+
+    def load_key():
+        loads.append(None)
+        raise FileNotFoundError("no key")
+
+    provider = HardcoverProvider(load_key)
+    assert provider.stats() is None
+    assert loads == []
+    with pytest.raises(FileNotFoundError):
+        asyncio.run(provider.search_books("dune"))
+    assert len(loads) == 1
+    asyncio.run(provider.close())
+
+
+def test_fixture_provider_matches_all_words():
+    provider = FixtureProvider([DUNE, MESSIAH])
+    assert asyncio.run(provider.search_books("dune herbert")) == [DUNE, MESSIAH]
+    assert asyncio.run(provider.search_many(["messiah", "foundation"])) == [
+        [MESSIAH],
+        [],
+    ]
+    assert provider.queries == ["dune herbert", "messiah", "foundation"]
+
+
+def test_cog_uses_the_injected_provider():
+    engine = create_engine("sqlite:///:memory:", echo=False)
+    Base.metadata.create_all(engine)
+    provider = FixtureProvider([DUNE])
+    cog = BookCircle(None, engine, provider)
+    assert asyncio.run(cog.book_cache.get("dune")) == [DUNE]
+    assert provider.queries == ["dune"]
+
+
+class Context:
+    def __init__(self):
+        self.embeds = []
+
+    async def send(self, embed=None, **kwargs):
+        self.embeds.append(embed)
+
+
+def test_book_without_a_hardcover_key():
+    engine = create_engine("sqlite:///:memory:", echo=False)
+    Base.metadata.create_all(engine)
+
+    def load_key():
+        raise FileNotFoundError("no key")
+
+    cog = BookCircle(None, engine, HardcoverProvider(load_key))
+    ctx = Context()
+    asyncio.run(cog.book.callback(cog, ctx, query="dune"))
+    [embed] = ctx.embeds
+    assert embed.title == "Error"
+    assert "not configured" in embed.description
+    asyncio.run(cog.metadata.close())
@@ -0,0 +1,111 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from src.achievements.listener import BooksFinished
+from src.achievements.service import load_achievements_from_json
+from src.books.model import (
+    Book,
+    BookClub,
+    BookClubReader,
+    BookClubReaderRole,
+    BookState,
+    Note,
+    Quote,
+    Review,
+    User,
+)
+from src.books.rotate_roles import rotate_roles
+from src.books.service import BookCircleService
+from src.models import Base
+
+from query_counter import QueryCounter
+
+READERS = 5
+
+
+class Context:
+    async def send(self, embed=None):
+        pass
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite:///:memory:", echo=False)
+    Base.metadata.create_all(engine)
+    load_achievements_from_json(engine)
+    with Session(engine) as session:
+        club = BookClub(
+            id=1,
+            state=BookState.READING,
+            target="Chapter 1",
+            book=Book(title="Dune", author="Frank Herbert", pages=412),
+        )
+        for user_id in range(1, READERS + 1):
+            club.readers.append(
+                BookClubReader(
+                    user=User(id=user_id, name=f"user{user_id}"),
+                    role=BookClubReaderRole.SUMMARIZER,
+                    notes=[Note(text="A note"), Note(text="Another")],
+                    quotes=[Quote(text="A quote"), Quote(text="Another")],
+                    reviews=[Review(text="Good", rating=4)],
+                )
+            )
+        session.add(club)
+        session.commit()
+    return engine
+
+
+member = SimpleNamespace(id=1, name="user1")
+
+# Statements each call may run. Reading a club costs the same for any
+# number of readers.
+BUDGETS = [
+    ("get_notes", lambda s: s.get_notes(1), 5),
+    ("get_quotes", lambda s: s.get_quotes(1), 5),
+    ("get_reviews", lambda s: s.get_reviews(1), 5),
+    ("list_roles", lambda s: s.list_roles(1), 4),
+    ("shuffle_roles", lambda s: s.shuffle_roles(1), 9),
+    ("get_club_status", lambda s: s.get_club_status(1), 7),
+    ("get_books_for_user", lambda s: s.get_books_for_user(member), 3),
+    ("set_progress", lambda s: s.set_progress(1, 1, "page 2"), 2),
+    ("add_note", lambda s: s.add_note(1, member, "A note"), 7),
+]
+
+
+@pytest.mark.parametrize(
+    "call,budget",
+    [(call, budget) for _, call, budget in BUDGETS],
+    ids=[n for n, *_ in BUDGETS],
+)
+def test_service_query_budget(engine, count_queries, call, budget):
+    service = BookCircleService(engine)
+    with count_queries(engine, budget):
+        assert hasattr(call(service), "value")
+
+
+def test_rotate_roles_query_budget(engine, count_queries):
+    with count_queries(engine, budget=9):
+        assert hasattr(rotate_roles(engine, 1), "value")
+
+
+def test_books_finished_query_budget(engine, count_queries):
+    listener = BooksFinished(engine)
+    # The counters and achievements are inserted one reader at a time.
+    with count_queries(engine, budget=7 + 2 * READERS):
+        asyncio.run(listener.action(None, ctx=Context(), book_club_id=1))
+
+
+def test_lazy_loads_per_row_are_reported(engine):
+    with QueryCounter(engine) as counter:
+        with Session(engine) as session:
+            for reader in session.get(BookClub, 1).readers:
+                reader.user.name
+    [repeated] = counter.repeated()
+    assert repeated.count == READERS
+    assert "FROM user" in repeated.statement
+    with pytest.raises(AssertionError, match="N\\+1 pattern"):
+        counter.check()
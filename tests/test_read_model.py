@@ -0,0 +1,91 @@
+import asyncio
+import inspect
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from src.apis.provider import FixtureProvider
+from src.books.cog import BookCircle
+from src.books.model import (
+    Book,
+    BookClub,
+    BookClubReader,
+    BookClubReaderState,
+    User,
+)
+from src.books.read_model import ReadModel
+from src.models import Base
+
+from session_guard import SessionGuard
+
+
+class Context:
+    def __init__(self, channel_id):
+        self.channel = SimpleNamespace(id=channel_id)
+        self.author = SimpleNamespace(id=1)
+        self.sent = []
+
+    async def send(self, embed):
+        # Give other tasks a turn, like a real request would.
+        await asyncio.sleep(0)
+        self.sent.append(embed)
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite:///:memory:", echo=False)
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add_all([User(id=1, name="alice"), User(id=2, name="bob")])
+        session.add(BookClub(id=1, book=Book(title="Dune", author="Frank Herbert")))
+        session.add_all(
+            [
+                BookClubReader(
+                    book_club_id=1, user_id=1, state=BookClubReaderState.CAUGHT_UP
+                ),
+                BookClubReader(book_club_id=1, user_id=2),
+            ]
+        )
+        session.commit()
+    return engine
+
+
+def test_snapshots_are_detached(engine):
+    club = ReadModel(engine).club(1)
+    assert club.book.title == "Dune"
+    assert [r.name for r in club.behind()] == ["bob"]
+    assert not hasattr(club, "__dict__")
+    assert ReadModel(engine).club(2) is None
+    assert ReadModel(engine).book(1).author == "Frank Herbert"
+
+
+def test_guard_flags_sessions_held_across_awaits(engine):
+    async def holds():
+        nonlocal begun
+        with Session(engine) as session:
+            begun = inspect.currentframe().f_lineno + 1
+            session.get(BookClub, 1)
+            await asyncio.sleep(0)
+
+    async def releases():
+        with Session(engine) as session:
+            session.get(BookClub, 1)
+        await asyncio.sleep(0)
+
+    begun = None
+    guard = SessionGuard()
+    guard.run(releases())
+    assert guard.held == []
+    guard.run(holds())
+    [held] = guard.held
+    assert "holds" in held.task
+    assert held.begun_at == f"test_read_model.py:{begun} in holds"
+
+
+def test_shame_does_not_hold_a_session(engine, session_guard):
+    cog = BookCircle(None, engine, FixtureProvider())
+    ctx = Context(1)
+    session_guard.run(cog.shame.callback(cog, ctx))
+    assert "<@2>" in ctx.sent[0].description
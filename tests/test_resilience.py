@@ -0,0 +1,110 @@
+import asyncio
+
+import aiohttp
+import pytest
+
+from src.apis.resilience import (
+    BreakerState,
+    CircuitBreaker,
+    CircuitOpenError,
+    Resilience,
+    TokenBucket,
+)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def unavailable():
+    return aiohttp.ClientResponseError(None, (), status=503)
+
+
+def test_bucket_allows_bursts_then_throttles():
+    async def run():
+        bucket = TokenBucket(rate=100, capacity=3)
+        for _ in range(5):
+            await bucket.acquire()
+        return bucket.throttled
+
+    assert asyncio.run(run()) == 2
+
+
+def test_breaker_opens_and_recovers():
+    clock = Clock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=clock)
+    breaker.failure()
+    breaker.check()
+    breaker.failure()
+    assert breaker.state == BreakerState.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+
+    clock.now = 10
+    breaker.check()
+    assert breaker.state == BreakerState.HALF_OPEN
+    # Only the trial request is let through.
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+    breaker.failure()
+    assert breaker.state == BreakerState.OPEN
+
+    clock.now = 20
+    breaker.check()
+    breaker.success()
+    assert breaker.state == BreakerState.CLOSED
+    assert (breaker.trips, breaker.rejected) == (2, 2)
+
+
+def test_failing_calls_open_the_breaker():
+    calls = []
+
+    async def request():
+        calls.append(None)
+        raise unavailable()
+
+    async def run():
+        resilience = Resilience(
+            breaker=CircuitBreaker(failure_threshold=2), attempts=2, max_wait=0
+        )
+        for _ in range(2):
+            with pytest.raises(aiohttp.ClientResponseError):
+                await resilience.call(request)
+        with pytest.raises(CircuitOpenError):
+            await resilience.call(request)
+        return resilience.stats()
+
+    stats = asyncio.run(run())
+    assert len(calls) == 4
+    assert stats.state == BreakerState.OPEN
+    assert (stats.retries, stats.rejected) == (2, 1)
+
+
+def test_cancelled_trial_lets_the_next_request_try():
+    clock = Clock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+    breaker.failure()
+    clock.now = 10
+    resilience = Resilience(breaker=breaker, attempts=1, max_wait=0)
+
+    async def hang():
+        await asyncio.Event().wait()
+
+    async def ok():
+        return "ok"
+
+    async def run():
+        trial = asyncio.create_task(resilience.call(hang))
+        await asyncio.sleep(0)
+        assert breaker.state == BreakerState.HALF_OPEN
+        trial.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await trial
+        return await resilience.call(ok)
+
+    assert asyncio.run(run()) == "ok"
+    assert breaker.state == BreakerState.CLOSED
@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+
+from src.genai.llm import Usage
+from src.genai.scheduler import QueueFull, Scheduler
+
+
+def test_limits_per_guild_and_in_total():
+    scheduler = Scheduler(concurrency=2, guild_concurrency=1)
+    running = []
+    peak = {"total": 0, 1: 0, 2: 0}
+
+    async def work(guild_id):
+        running.append(guild_id)
+        peak["total"] = max(peak["total"], len(running))
+        peak[guild_id] = max(peak[guild_id], running.count(guild_id))
+        await asyncio.sleep(0.01)
+        running.remove(guild_id)
+        return guild_id
+
+    async def run():
+        return await asyncio.gather(
+            *(scheduler.run(g, lambda g=g: work(g)) for g in [1, 1, 2, 2, 1])
+        )
+
+    assert asyncio.run(run()) == [1, 1, 2, 2, 1]
+    assert peak == {"total": 2, 1: 1, 2: 1}
+    assert scheduler.stats.total.calls == 5
+    assert scheduler.stats.guild(1).calls == 3
+    assert scheduler.pending() == 0
+
+
+def test_waiting_jobs_are_told_their_position():
+    scheduler = Scheduler(concurrency=1)
+    positions = []
+
+    async def report(position):
+        positions.append(position)
+
+    async def run():
+        await asyncio.gather(
+            scheduler.run(1, lambda: asyncio.sleep(0.01)),
+            scheduler.run(2, lambda: asyncio.sleep(0.01)),
+            scheduler.run(3, lambda: asyncio.sleep(0.01), on_position=report),
+        )
+
+    asyncio.run(run())
+    assert positions == [2, 1]
+
+
+def test_full_queue_rejects_jobs():
+    scheduler = Scheduler(max_queued=1)
+
+    async def run():
+        first = asyncio.create_task(scheduler.run(1, lambda: asyncio.sleep(0.01)))
+        await asyncio.sleep(0)
+        with pytest.raises(QueueFull):
+            await scheduler.run(1, lambda: asyncio.sleep(0))
+        await first
+
+    asyncio.run(run())
+    assert scheduler.stats.total.rejected == 1
+
+
+def test_records_tokens_and_failures():
+    scheduler = Scheduler()
+    usage = Usage()
+
+    async def work():
+        usage.prompt_tokens, usage.output_tokens = 10, 20
+        return "ok"
+
+    async def fail():
+        raise RuntimeError("boom")
+
+    async def run():
+        await scheduler.run(1, work, usage=usage)
+        with pytest.raises(RuntimeError):
+            await scheduler.run(1, fail)
+
+    asyncio.run(run())
+    stats = scheduler.stats.guild(1)
+    assert (stats.calls, stats.errors) == (2, 1)
+    assert (stats.prompt_tokens, stats.output_tokens) == (10, 20)
@@ -0,0 +1,41 @@
+import pytest
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from sqlalchemy import create_engine, text
+
+from src import schema
+
+
+@pytest.fixture
+def engine(tmp_path):
+    return create_engine(f"sqlite:///{tmp_path / 'app.db'}")
+
+
+def test_head_is_the_latest_migration():
+    script = ScriptDirectory.from_config(Config(str(schema.ALEMBIC_INI)))
+    heads = script.get_heads()
+    assert heads == [schema.HEAD], f"Set schema.HEAD to the new migration {heads}"
+
+
+def test_new_database_is_created_at_head(engine):
+    schema.check(engine)
+    assert schema.revision(engine) == schema.HEAD
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT count(*) FROM book_club")).scalar() == 0
+    # Starting again only reads the revision.
+    schema.check(engine)
+
+
+def test_outdated_database_is_rejected(engine):
+    schema.check(engine)
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE alembic_version SET version_num = '5b7f0c2d9e41'"))
+    with pytest.raises(schema.SchemaOutdated, match="alembic upgrade head"):
+        schema.check(engine)
+
+
+def test_unstamped_database_is_rejected(engine):
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE book_club (id INTEGER PRIMARY KEY)"))
+    with pytest.raises(schema.SchemaOutdated, match="alembic stamp head"):
+        schema.check(engine)
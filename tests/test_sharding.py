@@ -0,0 +1,115 @@
+import asyncio
+from types import SimpleNamespace
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from src.apis.provider import FixtureProvider
+from src.books.cog import BookCircle
+from src.books.model import Book, BookClub, BookClubReader, User
+from src.config import Config, parse_shard_ids
+from src.models import Base
+from src.sharding import child_environments, shard_ranges
+
+
+def test_parse_shard_ids():
+    assert parse_shard_ids("") is None
+    assert parse_shard_ids("3") == (3,)
+    assert parse_shard_ids("0-3, 6") == (0, 1, 2, 3, 6)
+
+
+def test_shard_ranges_cover_every_shard_once():
+    ranges = shard_ranges(10, 3)
+    assert ranges == [range(0, 4), range(4, 7), range(7, 10)]
+    assert shard_ranges(2, 4) == [range(0, 1), range(1, 2)]
+
+
+def test_child_environments_get_their_own_port_and_log():
+    config = Config(
+        shard_count=4, shard_processes=2, metrics_port=9100, log_file="bot.log"
+    )
+    envs = child_environments(config, {"BOKCIRKEL_METRICS_PORT": "9100"})
+    assert [env["BOKCIRKEL_SHARD_IDS"] for env in envs] == ["0-1", "2-3"]
+    assert [env["BOKCIRKEL_METRICS_PORT"] for env in envs] == ["9100", "9101"]
+    assert [env["BOKCIRKEL_LOG_FILE"] for env in envs] == [
+        "bot.log.shards-0-1",
+        "bot.log.shards-2-3",
+    ]
+    assert all(env["BOKCIRKEL_SHARD_PROCESSES"] == "1" for env in envs)
+
+
+def test_child_environments_without_metrics():
+    config = Config(shard_count=2, shard_processes=2, log_file="-")
+    for env in child_environments(config, {}):
+        assert "BOKCIRKEL_METRICS_PORT" not in env
+        assert "BOKCIRKEL_LOG_FILE" not in env
+
+
+class Channel:
+    def __init__(self, channel_id):
+        self.id = channel_id
+        self.sent = []
+
+    async def send(self, embed):
+        self.sent.append(embed)
+
+
+class Guild:
+    def __init__(self, guild_id, shard_id, channel):
+        self.id = guild_id
+        self.shard_id = shard_id
+        self.text_channels = [channel]
+
+    def get_channel(self, channel_id):
+        return next((c for c in self.text_channels if c.id == channel_id), None)
+
+
+def sharded_cog():
+    """A club with a reader behind in a guild on each of two shards."""
+    engine = create_engine("sqlite:///:memory:", echo=False)
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(User(id=1, name="alice"))
+        for club_id in (1, 2):
+            session.add(
+                BookClub(
+                    id=club_id,
+                    book=Book(title="Dune", author="Frank Herbert"),
+                    readers=[BookClubReader(user_id=1)],
+                )
+            )
+        session.commit()
+    channels = [Channel(1), Channel(2)]
+    bot = SimpleNamespace(
+        guilds=[Guild(10, 0, channels[0]), Guild(20, 1, channels[1])],
+        shards={0: None, 1: None},
+    )
+    return BookCircle(bot, engine, FixtureProvider()), channels
+
+
+def test_shame_only_sweeps_the_guilds_of_its_shard():
+    cog, (first, second) = sharded_cog()
+    asyncio.run(cog.shame_shard(0))
+    assert (len(first.sent), len(second.sent)) == (1, 0)
+    asyncio.run(cog.shame_shard(1))
+    assert (len(first.sent), len(second.sent)) == (1, 1)
+    assert "<@1>" in second.sent[0].description
+
+
+def test_one_shame_task_per_shard():
+    cog, _ = sharded_cog()
+    cog.roles_reconciled = True
+
+    async def run():
+        cog.bot.loop = asyncio.get_running_loop()
+        cog.bot.wait_until_ready = asyncio.Event().wait
+        await cog.on_ready()
+        tasks = dict(cog.shame_tasks)
+        # Reconnecting fires on_ready again.
+        await cog.on_ready()
+        assert cog.shame_tasks == tasks
+        for task in tasks.values():
+            task.cancel()
+        return set(tasks)
+
+    assert asyncio.run(run()) == {0, 1}
@@ -0,0 +1,112 @@
+import asyncio
+
+import pytest
+from blinker import signal
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.books import status as status_module
+from src.books.model import Base, Book, BookClub, BookState, User
+from src.books.service import BookCircleService
+from src.result_types import Ok
+
+
+class DummyUser:
+    def __init__(self, id, name):
+        self.id = id
+        self.name = name
+
+
+@pytest.fixture
+def service():
+    engine = create_engine("sqlite:///:memory:", echo=False)
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as session:
+        club = BookClub(id=1, state=BookState.READING, target="Ch 1")
+        club.book = Book(title="Dune", author="Frank Herbert")
+        session.add_all([club, User(id=1, name="User1"), User(id=2, name="User2")])
+        session.commit()
+    return BookCircleService(engine)
+
+
+def test_incremental_status_matches_rebuild(service):
+    service.join_club(1, DummyUser(1, "User1"))
+    match service.get_club_status(1):
+        case Ok(status):
+            pass
+
+    service.join_club(1, DummyUser(2, "User2"))
+    status.join(2, "User2")
+    service.set_progress(1, 1, "p. 40")
+    status.set_progress(1, "p. 40")
+    service.set_target(1, BookState.READING, "Ch 3")
+    status.set_target("Ch 3", BookState.READING)
+    service.caught_up(1, 2)
+    status.caught_up(2)
+    service.add_note(1, DummyUser(1, "User1"), "note")
+    status.add_note(1)
+    service.add_quote(1, 2, "quote")
+    status.add_quote(2)
+    service.add_review(1, DummyUser(1, "User1"), "good", 4)
+    status.set_review(1, 4)
+    service.add_review(1, DummyUser(1, "User1"), "great", 5)
+    status.set_review(1, 5)
+
+    match service.get_status(1):
+        case Ok(embed):
+            assert status.to_embed().to_dict() == embed.to_dict()
+
+
+class DummyMessage:
+    def __init__(self, channel, id):
+        self.channel = channel
+        self.id = id
+
+    async def edit(self, embed):
+        self.channel.edits.append(embed)
+
+    async def pin(self):
+        pass
+
+
+class DummyChannel:
+    id = 1
+
+    def __init__(self):
+        self.edits = []
+
+    async def send(self, embed):
+        return DummyMessage(self, 99)
+
+    def get_partial_message(self, id):
+        return DummyMessage(self, id)
+
+
+class DummyBot:
+    def __init__(self, channel):
+        self.channel = channel
+
+    def get_channel(self, id):
+        return self.channel
+
+
+def test_status_board_coalesces_edits(service, monkeypatch):
+    monkeypatch.setattr(status_module, "STATUS_EDIT_DELAY", 0.01)
+    service.join_club(1, DummyUser(1, "User1"))
+    channel = DummyChannel()
+
+    async def run():
+        board = status_module.StatusBoard(DummyBot(channel), service)
+        assert isinstance(await board.enable(channel), Ok)
+        for page in range(10):
+            service.set_progress(1, 1, f"p. {page}")
+            await signal("read").send_async(
+                None, book_club_id=1, user_id=1, progress=f"p. {page}"
+            )
+        await asyncio.sleep(0.05)
+        board.close()
+
+    asyncio.run(run())
+    assert len(channel.edits) == 1
+    assert "p. 9" in channel.edits[0].fields[-1].value
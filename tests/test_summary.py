@@ -0,0 +1,122 @@
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from src.books.model import Book, BookClub, BookClubReader, Note, Quote, User
+from src.genai.cache import OutputCache
+from src.genai.llm import FakeModel, Usage
+from src.genai.scheduler import Scheduler
+from src.genai.summary import Summarizer, chunk, estimate_tokens
+from src.models import Base
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite:///:memory:", echo=False)
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(User(id=1, name="alice"))
+        session.add(BookClub(id=1, book=Book(title="Dune", author="Frank Herbert")))
+        session.add(BookClubReader(id=1, book_club_id=1, user_id=1))
+        session.add_all(
+            Note(book_club_reader_id=1, text=f"note {i}") for i in range(30)
+        )
+        session.add(Quote(book_club_reader_id=1, text="Fear is the mind-killer."))
+        session.commit()
+    return engine
+
+
+def add_note(engine, text):
+    with Session(engine) as session:
+        session.add(Note(book_club_reader_id=1, text=text))
+        session.commit()
+
+
+def test_chunks_stay_within_budget():
+    entries = [f"entry {i}" for i in range(100)]
+    chunks = list(chunk(entries, 20))
+    assert len(chunks) > 1
+    assert all(estimate_tokens(c) <= 20 + len(c.splitlines()) for c in chunks)
+    assert "\n".join(chunks).splitlines() == entries
+
+
+def test_only_changed_chunks_are_summarized_again(engine):
+    llm = FakeModel(["partial"])
+    summarizer = Summarizer(engine, llm, OutputCache(engine), chunk_tokens=40)
+
+    def reduce_prompt():
+        usage = Usage()
+        chunks = summarizer.chunks(1)
+        prompt = asyncio.run(
+            summarizer.reduce_prompt(chunks, "Dune", "Frank Herbert", usage)
+        )
+        return chunks, prompt, usage
+
+    chunks, prompt, usage = reduce_prompt()
+    assert "- alice quoted: Fear is the mind-killer." in chunks["quotes"][0]
+    calls = len(llm.prompts)
+    assert calls == len(chunks["notes"]) + len(chunks["quotes"]) > 2
+    assert usage.output_tokens == calls
+    assert prompt.count("\n\npartial") == calls
+
+    add_note(engine, "a new note")
+    reduce_prompt()
+    assert len(llm.prompts) == calls + 1
+    assert "a new note" in llm.prompts[-1]
+
+
+def test_map_calls_of_a_guild_overlap_within_the_total_limit(engine):
+    running, most = 0, 0
+
+    class CountingModel(FakeModel):
+        async def stream(self, prompt):
+            nonlocal running, most
+            running += 1
+            most = max(most, running)
+            try:
+                async for piece in super().stream(prompt):
+                    yield piece
+            finally:
+                running -= 1
+
+    llm = CountingModel(["partial"], delay=0.01)
+    scheduler = Scheduler(concurrency=3, guild_concurrency=1)
+    summarizer = Summarizer(
+        engine, llm, OutputCache(engine), chunk_tokens=40, scheduler=scheduler
+    )
+    asyncio.run(
+        summarizer.reduce_prompt(
+            summarizer.chunks(1), "Dune", "Frank Herbert", Usage(), guild_id=1
+        )
+    )
+    assert most == 3
+    assert scheduler.stats.guild(1).calls == len(llm.prompts) > 3
+
+
+def test_map_calls_leave_the_guild_slot_to_other_commands(engine):
+    llm = FakeModel(["partial"], delay=0.05)
+    scheduler = Scheduler(concurrency=3, guild_concurrency=1)
+    summarizer = Summarizer(
+        engine,
+        llm,
+        OutputCache(engine),
+        chunk_tokens=40,
+        concurrency=2,
+        scheduler=scheduler,
+    )
+
+    async def run():
+        summary = asyncio.create_task(
+            summarizer.reduce_prompt(
+                summarizer.chunks(1), "Dune", "Frank Herbert", Usage(), guild_id=1
+            )
+        )
+        await asyncio.sleep(0.01)
+        other = asyncio.create_task(scheduler.run(1, lambda: asyncio.sleep(0)))
+        await asyncio.sleep(0.01)
+        assert other.done() and not summary.done()
+        await summary
+
+    asyncio.run(run())
@@ -0,0 +1,46 @@
+import asyncio
+import time
+
+from src.metrics import Metrics
+from src.watchdog import Watchdog
+
+
+def blocking_call():
+    time.sleep(0.3)
+
+
+def test_stall_is_reported_with_the_stack_and_command():
+    metrics = Metrics()
+    watchdog = Watchdog(metrics, interval=0.02, threshold=0.1)
+
+    async def main():
+        watchdog.start()
+        await asyncio.sleep(0.05)
+        with metrics.command("read"):
+            blocking_call()
+        await asyncio.sleep(0.05)
+        await watchdog.stop()
+
+    asyncio.run(main())
+
+    [stall] = watchdog.stalls
+    assert stall.command == "read"
+    assert "blocking_call" in stall.stack
+    assert stall.blocked >= 0.1
+    assert watchdog.max_lag >= 0.25
+    samples = {sample.name: sample.value for sample in watchdog.samples()}
+    assert samples["loop_stalls"] == 1
+
+
+def test_no_stall_while_the_loop_is_free():
+    watchdog = Watchdog(interval=0.02, threshold=0.1)
+
+    async def main():
+        watchdog.start()
+        await asyncio.sleep(0.3)
+        await watchdog.stop()
+
+    asyncio.run(main())
+
+    assert not watchdog.stalls
+    assert watchdog.lag.count > 5